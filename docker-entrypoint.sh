@@ -1,29 +1,20 @@
 #!/bin/bash
 # Docker entrypoint script for VLE User Management System
-# Runs migrations and collectstatic before starting the application
+# Waits for the database, then migrates and collects static files only when
+# they changed (see startup.py) before starting the application
 
 set -e
 
-echo "Starting VLE User Management System..."
-
-# Wait for database to be ready (optional but recommended)
-echo "Waiting for database..."
-until python src/manage.py check --database default > /dev/null 2>&1; do
-  echo "Database is unavailable - sleeping"
-  sleep 2
-done
+# Read by gunicorn.conf.py to report total boot time
+export STARTUP_STARTED_AT="$(date +%s.%N)"
 
-echo "Database is up!"
-
-# Run migrations
-echo "Running database migrations..."
-python src/manage.py migrate --noinput
+echo "Starting VLE User Management System..."
 
-# Collect static files
-echo "Collecting static files..."
-python src/manage.py collectstatic --noinput
+# wait-db polls with psycopg2 (no Django boot); migrate and collectstatic
+# are skipped when their stamps match. Each step prints its timing.
+python startup.py wait-db migrate collectstatic
 
 echo "Starting application..."
 
-# Execute the main command (gunicorn)
-exec gunicorn --bind 0.0.0.0:${PORT:-8000} --chdir src config.wsgi:application
+# Execute the main command (gunicorn; SERVER_MODE=asgi switches to uvicorn workers)
+exec gunicorn --config gunicorn.conf.py
@@ -0,0 +1,61 @@
+# Gunicorn configuration for VLE User Management System
+# Decision: One config file for both deployment modes, selected by SERVER_MODE
+#   wsgi (default): threaded workers serving config.wsgi
+#   asgi: uvicorn workers serving config.asgi with the async read views
+
+import multiprocessing
+import os
+import time
+
+SERVER_MODE = os.environ.get('SERVER_MODE', 'wsgi').lower()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+chdir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+accesslog = '-'
+
+if SERVER_MODE == 'asgi':
+    # Decision: An event loop per worker multiplexes many slow requests,
+    # so fewer workers (and less memory) serve the same concurrency
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+    workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+    os.environ.setdefault('ASYNC_VIEWS', 'true')
+else:
+    wsgi_app = 'config.wsgi:application'
+    # Decision: Threads let a worker keep serving other endpoints while
+    # some of its requests wait on password hashing; 4 matches the
+    # default DB_POOL_MAX_SIZE so threads rarely wait for a connection
+    worker_class = 'gthread'
+    threads = int(os.environ.get('GUNICORN_THREADS', 4))
+    # Decision: Size the per-worker hashing executor (features.authentication.hashers)
+    # from the server: all workers together hash on about one thread per CPU,
+    # and at most half of a worker's threads may hold a hashing slot, so a
+    # login burst gets 503s instead of every thread
+    os.environ.setdefault(
+        'PASSWORD_HASHING_WORKERS', str(max(min(multiprocessing.cpu_count() // workers, threads // 2), 1))
+    )
+    os.environ.setdefault(
+        'PASSWORD_HASHING_QUEUE_SIZE',
+        str(max(threads // 2 - int(os.environ['PASSWORD_HASHING_WORKERS']), 0))
+    )
+
+# Decision: Workers write metrics snapshots here so /metrics, served by any
+# one worker, reports all of them (see src/core/metrics.py)
+METRICS_DIR = os.environ.setdefault('METRICS_DIR', '/tmp/ums-metrics')
+
+def on_starting(server):
+    """Drop snapshots left by a previous server, so counters restart with it"""
+    if METRICS_DIR and os.path.isdir(METRICS_DIR):
+        for name in os.listdir(METRICS_DIR):
+            if name.startswith('metrics-'):
+                os.remove(os.path.join(METRICS_DIR, name))
+
+def post_worker_init(worker):
+    """Log time from container start (docker-entrypoint.sh) until a worker has loaded the app"""
+    started_at = os.environ.get('STARTUP_STARTED_AT')
+    if started_at:
+        worker.log.info('Worker ready %.2fs after container start', time.time() - float(started_at))
\ No newline at end of file
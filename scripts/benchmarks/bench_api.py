@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+"""
+API load-test benchmark
+Decision: Seed a known data set, drive each endpoint at fixed concurrency
+levels against a real gunicorn server and save the numbers as JSON, so a
+change can be compared against a saved baseline run
+
+Scenarios: register, login, list, search, detail, bulk. Seeded users live
+on @loadtest.example.com (see `manage.py seed_users`); users created by the
+register scenario too, so `seed_users --reset` removes everything a run left.
+
+The database in DJANGO_SETTINGS_MODULE must be migrated. Without --url a
+gunicorn server is started with gunicorn.conf.py, the login throttle off and
+plain HTTP allowed (SECURE_SSL_REDIRECT=false). DJANGO_SETTINGS_MODULE
+defaults to the production settings.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=config.settings.production \\
+        python scripts/benchmarks/bench_api.py --users 10000 --concurrency 1 8 32 \\
+        --output results.json
+    python scripts/benchmarks/bench_api.py --baseline results.json --max-regression 10
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlsplit
+
+ROOT = Path(__file__).resolve().parents[2]
+
+SEED_DOMAIN = 'loadtest.example.com'
+SCENARIOS = ('register', 'login', 'list', 'search', 'detail', 'bulk')
+SEARCH_TERMS = ('smith', 'garcia', 'lee', 'mary', 'john', 'user12')
+# Share of the sampled users reserved for the bulk scenario, which
+# deactivates and reactivates them; the others stay active for login/detail
+BULK_SHARE = 0.2
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not start on port {port}')
+
+
+def seed(args):
+    subprocess.run(
+        [sys.executable, str(ROOT / 'src' / 'manage.py'), 'seed_users',
+         '--users', str(args.users), '--password', args.password],
+        check=True, cwd=ROOT
+    )
+
+
+def start_server(args):
+    port = free_port()
+    env = dict(
+        os.environ, SERVER_MODE=args.server_mode, PORT=str(port), WEB_CONCURRENCY=str(args.workers),
+        LOGIN_THROTTLE_ENABLED='false', SECURE_SSL_REDIRECT='false',
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', str(ROOT / 'gunicorn.conf.py'),
+         '--access-logfile', '/dev/null'],
+        cwd=ROOT, env=env
+    )
+    try:
+        wait_until_ready(port)
+    except RuntimeError:
+        server.kill()
+        raise
+    return server, f'http://127.0.0.1:{port}'
+
+
+def call(base_url, method, path, body=None, token=None):
+    """Setup request with urllib; returns the decoded JSON body"""
+    request = urllib.request.Request(
+        base_url + path, method=method,
+        data=json.dumps(body).encode() if body is not None else None,
+        headers={'Content-Type': 'application/json', **({'Authorization': f'Bearer {token}'} if token else {})},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())
+
+
+def prepare(base_url, args):
+    """Log in as a seeded user and sample seeded users for the scenarios"""
+    login = call(base_url, 'POST', '/api/v1/auth/login/', {
+        'email': f'user1@{SEED_DOMAIN}', 'password': args.password,
+    })
+    token = login['tokens']['access']
+
+    users, cursor = [], ''
+    while len(users) < args.sample and cursor is not None:
+        page = call(
+            base_url, 'GET',
+            f'/api/v1/users/?search={SEED_DOMAIN}&fields=id,email&page_size=100&cursor={cursor}',
+            token=token
+        )
+        users.extend(
+            user for user in page['users']
+            if user['email'].startswith('user') and user['email'] != f'user1@{SEED_DOMAIN}'
+        )
+        cursor = page['pagination']['next']
+    if len(users) < 10:
+        raise SystemExit('Too few seeded users; run with --users or `manage.py seed_users`')
+
+    bulk_count = max(int(len(users) * BULK_SHARE), 1)
+    return token, users[bulk_count:], [user['id'] for user in users[:bulk_count]]
+
+
+def build_request(method, path, token=None, body=None):
+    payload = json.dumps(body).encode() if body is not None else b''
+    headers = [f'{method} {path} HTTP/1.1', 'Host: 127.0.0.1', 'Connection: close']
+    if token:
+        headers.append(f'Authorization: Bearer {token}')
+    if body is not None:
+        headers += ['Content-Type: application/json', f'Content-Length: {len(payload)}']
+    return ('\r\n'.join(headers) + '\r\n\r\n').encode() + payload
+
+
+class Scenario:
+    """Request factory for one endpoint, seeded so runs send the same requests"""
+
+    def __init__(self, name, token, users, bulk_ids, args, run_id):
+        self.name = name
+        self.token = token
+        self.users = users
+        self.bulk_ids = bulk_ids
+        self.args = args
+        self.run_id = run_id
+        self.expected = 201 if name == 'register' else 200
+        # Registration emails stay unique across warm-up and measured runs
+        self._registrations = itertools.count(1)
+
+    def client(self, index, concurrency):
+        """Iterator of requests for one simulated client"""
+        rng = random.Random(f'{self.args.seed}:{self.name}:{concurrency}:{index}')
+        build = getattr(self, f'_{self.name}')
+        number = 0
+        while True:
+            number += 1
+            yield build(rng, index, number, concurrency)
+
+    def _register(self, rng, index, number, concurrency):
+        return build_request('POST', '/api/v1/auth/register/', body={
+            'email': f'reg-{self.run_id}-{next(self._registrations)}@{SEED_DOMAIN}',
+            'password': self.args.password,
+            'first_name': 'Load',
+            'last_name': 'Test',
+        })
+
+    def _login(self, rng, index, number, concurrency):
+        return build_request('POST', '/api/v1/auth/login/', body={
+            'email': rng.choice(self.users)['email'], 'password': self.args.password,
+        })
+
+    def _list(self, rng, index, number, concurrency):
+        return build_request('GET', '/api/v1/users/?page_size=20', self.token)
+
+    def _search(self, rng, index, number, concurrency):
+        return build_request('GET', f'/api/v1/users/?search={rng.choice(SEARCH_TERMS)}&page_size=20', self.token)
+
+    def _detail(self, rng, index, number, concurrency):
+        return build_request('GET', f"/api/v1/users/{rng.choice(self.users)['id']}/", self.token)
+
+    def _bulk(self, rng, index, number, concurrency):
+        # Each client owns a slice, deactivating then reactivating it, so
+        # every request changes rows and clients never contend on them
+        own = self.bulk_ids[index::concurrency] or self.bulk_ids
+        ids = own[:self.args.bulk_size]
+        operation = 'deactivate' if number % 2 else 'activate'
+        return build_request('POST', '/api/v1/users/bulk/', self.token, {
+            'user_ids': ids, 'operation': operation,
+        })
+
+
+async def fetch(host, port, request):
+    """One request on a fresh connection (sync workers close after each)"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        await reader.readexactly(length)
+        return status
+    finally:
+        writer.close()
+
+
+async def drive(base_url, scenario, concurrency, duration):
+    url = urlsplit(base_url)
+    host, port = url.hostname, url.port or 80
+    deadline = time.perf_counter() + duration
+    latencies, statuses = [], {}
+
+    async def client(index):
+        requests = scenario.client(index, concurrency)
+        while time.perf_counter() < deadline:
+            request = next(requests)
+            started = time.perf_counter()
+            try:
+                status = await fetch(host, port, request)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                status = 0
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == scenario.expected:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def run_scenario(base_url, scenario, concurrency, args):
+    if args.warmup:
+        asyncio.run(drive(base_url, scenario, concurrency, args.warmup))
+    latencies, statuses, elapsed = asyncio.run(drive(base_url, scenario, concurrency, args.duration))
+    return {
+        'scenario': scenario.name,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': sum(statuses.values()) - len(latencies),
+        'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        'rps': round(len(latencies) / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """
+    Print current against baseline per scenario and concurrency
+
+    Returns the rows that lost more than max_regression percent of
+    throughput or gained more than that in p95 latency.
+    """
+    previous = {(row['scenario'], row['concurrency']): row for row in baseline['results']}
+    print(f"\nBaseline {baseline['meta'].get('git_revision')} from {baseline['meta'].get('created_at')}")
+    print(f"{'scenario':<10} {'conc':>5} {'req/s':>9} {'Δ%':>7} {'p95 ms':>9} {'Δ%':>7} {'p99 ms':>9} {'Δ%':>7}")
+
+    def delta(current, old):
+        return (current - old) / old * 100 if old else 0.0
+
+    regressions = []
+    for row in results:
+        old = previous.get((row['scenario'], row['concurrency']))
+        if old is None:
+            print(f"{row['scenario']:<10} {row['concurrency']:>5} {'not in baseline':>25}")
+            continue
+        rps, p95, p99 = delta(row['rps'], old['rps']), delta(row['p95_ms'], old['p95_ms']), delta(row['p99_ms'], old['p99_ms'])
+        flag = ''
+        if max_regression is not None and (-rps > max_regression or p95 > max_regression):
+            regressions.append(row)
+            flag = '  REGRESSION'
+        print(
+            f"{row['scenario']:<10} {row['concurrency']:>5} {row['rps']:>9.1f} {rps:>+7.1f} "
+            f"{row['p95_ms']:>9.2f} {p95:>+7.1f} {row['p99_ms']:>9.2f} {p99:>+7.1f}{flag}"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--url', help='benchmark a running server instead of starting gunicorn')
+    parser.add_argument('--server-mode', default='wsgi', choices=['wsgi', 'asgi'])
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--users', type=int, default=10000, help='seeded users (0 to skip seeding)')
+    parser.add_argument('--password', default='loadtest-pass-123', help='password of the seeded users')
+    parser.add_argument('--sample', type=int, default=1000, help='seeded users to pick requests from')
+    parser.add_argument('--scenarios', nargs='+', default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 8, 32], help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario and level')
+    parser.add_argument('--warmup', type=float, default=2.0, help='unmeasured seconds before each run')
+    parser.add_argument('--bulk-size', type=int, default=100, help='user IDs per bulk request')
+    parser.add_argument('--seed', type=int, default=1, help='random seed for request selection')
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--baseline', help='JSON file from an earlier run to compare against')
+    parser.add_argument(
+        '--max-regression', type=float,
+        help='exit 1 when req/s drops or p95 rises by more than this percent against the baseline'
+    )
+    args = parser.parse_args()
+
+    # Measure the middleware and settings that serve real traffic
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.production')
+    if args.users:
+        seed(args)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        server, base_url = start_server(args)
+    try:
+        token, users, bulk_ids = prepare(base_url.rstrip('/'), args)
+        run_id = f'{int(time.time())}-{os.getpid()}'
+        results = []
+        print(f"{'scenario':<10} {'conc':>5} {'req/s':>9} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+        for name in args.scenarios:
+            scenario = Scenario(name, token, users, bulk_ids, args, run_id)
+            for concurrency in args.concurrency:
+                row = run_scenario(base_url, scenario, concurrency, args)
+                results.append(row)
+                print(
+                    f"{row['scenario']:<10} {row['concurrency']:>5} {row['rps']:>9.1f} {row['errors']:>7} "
+                    f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+                )
+    finally:
+        if server is not None:
+            server.send_signal(signal.SIGTERM)
+            server.wait(timeout=30)
+
+    report = {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'git_revision': git_revision(),
+            'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+            'url': args.url,
+            'server_mode': None if args.url else args.server_mode,
+            'workers': None if args.url else args.workers,
+            'users': args.users,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'cpus': os.cpu_count(),
+        },
+        'results': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+        print(f'\nSaved {args.output}')
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()), args.max_regression)
+        if regressions:
+            sys.exit(f'{len(regressions)} regression(s) above {args.max_regression}%')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+WSGI vs ASGI deployment benchmark
+Decision: Start gunicorn with gunicorn.conf.py in each SERVER_MODE, drive
+the same read endpoint at a fixed concurrency and report throughput,
+latency and resident memory per worker
+
+The database in DJANGO_SETTINGS_MODULE must be migrated; a benchmark user
+is created if missing. Memory is read from /proc, so run this on Linux.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=config.settings.production \\
+        python scripts/benchmarks/bench_asgi_wsgi.py --workers 2 --concurrency 64 --duration 15
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT / 'src'))
+
+
+def issue_token():
+    """Create the benchmark user and return an access token for it"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+    import django
+    django.setup()
+
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    User = get_user_model()
+    user = User.objects.filter(email='bench@example.com').first()
+    if user is None:
+        user = User.objects.create_user(
+            email='bench@example.com', username='bench@example.com', password='benchpass123'
+        )
+    return str(RefreshToken.for_user(user).access_token)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def worker_rss_mb(master_pid):
+    """Resident memory of each gunicorn worker, in MB"""
+    children = Path(f'/proc/{master_pid}/task/{master_pid}/children').read_text().split()
+    sizes = []
+    for pid in children:
+        for line in Path(f'/proc/{pid}/status').read_text().splitlines():
+            if line.startswith('VmRSS:'):
+                sizes.append(int(line.split()[1]) / 1024)
+    return sizes
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+async def fetch(port, request):
+    """One request on a fresh connection (sync workers close after each)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        status = int((await reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        await reader.readexactly(length)
+        return status
+    finally:
+        writer.close()
+
+
+async def drive(port, path, token, concurrency, duration):
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+        f'Authorization: Bearer {token}\r\nConnection: close\r\n\r\n'
+    ).encode()
+    deadline = time.perf_counter() + duration
+    latencies, errors = [], 0
+
+    async def client():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await fetch(port, request)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                status = 0
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not start on port {port}')
+
+
+def run_mode(mode, token, args):
+    port = free_port()
+    env = dict(os.environ, SERVER_MODE=mode, PORT=str(port), WEB_CONCURRENCY=str(args.workers))
+    env.pop('ASYNC_VIEWS', None)
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', str(ROOT / 'gunicorn.conf.py'),
+         '--access-logfile', '/dev/null'],
+        cwd=ROOT, env=env
+    )
+    try:
+        wait_until_ready(port)
+        # Warm up imports, connections and caches before measuring
+        asyncio.run(drive(port, args.path, token, args.workers, 2))
+        latencies, errors = asyncio.run(
+            drive(port, args.path, token, args.concurrency, args.duration)
+        )
+        rss = worker_rss_mb(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+    return {
+        'mode': mode,
+        'rps': len(latencies) / args.duration,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'rss_mb': statistics.mean(rss) if rss else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers per mode')
+    parser.add_argument('--concurrency', type=int, default=64, help='concurrent clients')
+    parser.add_argument('--duration', type=float, default=15.0, help='seconds per mode')
+    parser.add_argument('--path', default='/api/v1/users/?page_size=20', help='endpoint to request')
+    parser.add_argument('--modes', nargs='+', default=['wsgi', 'asgi'], choices=['wsgi', 'asgi'])
+    args = parser.parse_args()
+
+    token = issue_token()
+
+    print(f"{'mode':<6} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p99 ms':>8} {'MB/worker':>10}")
+    for mode in args.modes:
+        row = run_mode(mode, token, args)
+        print(
+            f"{row['mode']:<6} {row['rps']:>8.1f} {row['errors']:>7} {row['p50_ms']:>8.2f} "
+            f"{row['p99_ms']:>8.2f} {row['rss_mb']:>10.1f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Password hashing back-pressure benchmark
+Decision: Simulate one threaded worker serving a login burst next to
+ordinary API traffic, with and without the bounded hashing executor
+
+Usage:
+    python scripts/benchmarks/bench_password_hashing.py --logins 16 --others 4 --duration 10
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+import django
+from django.conf import settings
+
+
+def configure(workers, queue_size, queue_timeout):
+    settings.configure(
+        PASSWORD_HASHERS=['features.authentication.hashers.BoundedPBKDF2PasswordHasher'],
+        PASSWORD_HASHING_WORKERS=workers,
+        PASSWORD_HASHING_QUEUE_SIZE=queue_size,
+        PASSWORD_HASHING_QUEUE_TIMEOUT=queue_timeout,
+    )
+    django.setup()
+
+
+def light_request():
+    """Stand-in for a cheap endpoint: ~1 ms of Python work"""
+    rows = [{'id': i, 'email': f'user{i}@example.com'} for i in range(200)]
+    return sum(len(row['email']) for row in rows)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(int(round(pct / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+
+def run_scenario(bounded, args):
+    from django.contrib.auth.hashers import PBKDF2PasswordHasher
+    from features.authentication.hashers import BoundedPBKDF2PasswordHasher, HashingCapacityExceeded
+
+    hasher = BoundedPBKDF2PasswordHasher() if bounded else PBKDF2PasswordHasher()
+    encoded = hasher.encode('benchmark-password', hasher.salt())
+    deadline = time.perf_counter() + args.duration
+    results = {'logins': 0, 'rejected': 0, 'other_latencies': []}
+    lock = threading.Lock()
+
+    def login_client():
+        while time.perf_counter() < deadline:
+            try:
+                hasher.verify('benchmark-password', encoded)
+                with lock:
+                    results['logins'] += 1
+            except HashingCapacityExceeded:
+                with lock:
+                    results['rejected'] += 1
+                time.sleep(0.05)  # client backs off on 503
+
+    def other_client():
+        latencies = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            light_request()
+            latencies.append(time.perf_counter() - started)
+        with lock:
+            results['other_latencies'].extend(latencies)
+
+    threads = [threading.Thread(target=login_client) for _ in range(args.logins)]
+    threads += [threading.Thread(target=other_client) for _ in range(args.others)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    latencies = results['other_latencies']
+    return {
+        'mode': 'bounded' if bounded else 'unbounded',
+        'logins_per_sec': results['logins'] / args.duration,
+        'rejected_per_sec': results['rejected'] / args.duration,
+        'other_requests_per_sec': len(latencies) / args.duration,
+        'other_p50_ms': percentile(latencies, 50) * 1000,
+        'other_p99_ms': percentile(latencies, 99) * 1000,
+        'other_mean_ms': (statistics.mean(latencies) * 1000) if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--logins', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--others', type=int, default=4, help='concurrent light-request clients')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per scenario')
+    parser.add_argument('--workers', type=int, default=0, help='hashing workers (0 = CPU count)')
+    parser.add_argument('--queue-size', type=int, default=8)
+    parser.add_argument('--queue-timeout', type=float, default=0.25)
+    args = parser.parse_args()
+
+    configure(args.workers, args.queue_size, args.queue_timeout)
+
+    print(f"{'mode':<10} {'logins/s':>9} {'503/s':>8} {'other/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for bounded in (False, True):
+        row = run_scenario(bounded, args)
+        print(
+            f"{row['mode']:<10} {row['logins_per_sec']:>9.1f} {row['rejected_per_sec']:>8.1f} "
+            f"{row['other_requests_per_sec']:>9.1f} {row['other_p50_ms']:>8.2f} {row['other_p99_ms']:>8.2f}"
+        )
+
+    from features.authentication.hashers import get_hashing_executor
+    print('\nexecutor stats:', get_hashing_executor().stats())
+
+
+if __name__ == '__main__':
+    main()
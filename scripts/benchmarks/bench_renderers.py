@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+JSON renderer benchmark
+Decision: Render the same user_list payloads with DRF's JSONRenderer and
+ORJSONRenderer, check the bytes are identical, and report time per page
+
+Usage:
+    python scripts/benchmarks/bench_renderers.py --rows 100 --repeat 500
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+import django
+from django.conf import settings
+
+
+def configure():
+    """Project base settings on an in-memory database"""
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('DB_PASSWORD', 'benchmark')
+    from config.settings import base
+
+    values = {name: getattr(base, name) for name in dir(base) if name.isupper()}
+    values['INSTALLED_APPS'] = [
+        app for app in base.INSTALLED_APPS if importlib.util.find_spec(app) is not None
+    ]
+    values['DATABASES'] = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+    settings.configure(**values)
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(count):
+    from features.authentication.models import User
+    User.objects.bulk_create([
+        User(email=f'user{i}@example.com', username=f'user{i}@example.com',
+             first_name=f'Fïrst{i}', last_name=f'Last{i}')
+        for i in range(count)
+    ])
+
+
+def us_per_page(fn, repeat):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100, help='users per page')
+    parser.add_argument('--repeat', type=int, default=500, help='pages rendered per scenario')
+    args = parser.parse_args()
+
+    configure()
+    seed(args.rows)
+
+    from rest_framework.renderers import JSONRenderer
+    from api.renderers import ORJSONRenderer
+    from api.v1.users.serializers import UserListSerializer, user_list_rows
+    from api.v1.users.views import user_list_payload
+    from features.authentication.models import User
+
+    queryset = User.objects.order_by('-date_joined', '-id')
+    pagination = {
+        'total_count': args.rows, 'count_type': 'exact', 'page_count': 1,
+        'current_page': 1, 'has_next': False, 'has_previous': False,
+    }
+    payloads = [
+        ('RowSerializer page', user_list_payload(
+            user_list_rows.serialize(queryset.values(*user_list_rows.get_fields())), pagination, None)),
+        ('ModelSerializer page', user_list_payload(
+            UserListSerializer(queryset.select_related('profile'), many=True).data, pagination, None)),
+        # Raw .values() rows leave datetimes to the encoder's default hook
+        ('raw values() page', user_list_payload(
+            list(queryset.values(*user_list_rows.get_fields())), pagination, None)),
+    ]
+
+    stdlib, fast = JSONRenderer(), ORJSONRenderer()
+    print(f"{'payload':<22} {'JSONRenderer us':>16} {'ORJSONRenderer us':>18} {'speedup':>8} {'bytes':>8}")
+    for name, payload in payloads:
+        body = stdlib.render(payload)
+        assert fast.render(payload) == body, f'{name}: renderers disagree'
+        slow_us = us_per_page(lambda: stdlib.render(payload), args.repeat)
+        fast_us = us_per_page(lambda: fast.render(payload), args.repeat)
+        print(f'{name:<22} {slow_us:>16.1f} {fast_us:>18.1f} {slow_us / fast_us:>7.1f}x {len(body):>8}')
+
+
+if __name__ == '__main__':
+    main()
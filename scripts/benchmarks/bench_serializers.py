@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+User list serialization benchmark
+Decision: Compare per-row cost of UserListSerializer over model instances
+with the RowSerializer fast path over .values() rows, both with and
+without the database fetch, on an in-memory SQLite database
+
+Usage:
+    python scripts/benchmarks/bench_serializers.py --rows 100 --repeat 200
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'src'))
+
+import django
+from django.conf import settings
+
+
+def configure():
+    """Project base settings on an in-memory database"""
+    os.environ.setdefault('SECRET_KEY', 'benchmark')
+    os.environ.setdefault('DB_PASSWORD', 'benchmark')
+    from config.settings import base
+
+    values = {name: getattr(base, name) for name in dir(base) if name.isupper()}
+    values['INSTALLED_APPS'] = [
+        app for app in base.INSTALLED_APPS if importlib.util.find_spec(app) is not None
+    ]
+    values['DATABASES'] = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+    values['PASSWORD_HASHERS'] = ['django.contrib.auth.hashers.MD5PasswordHasher']
+    settings.configure(**values)
+    django.setup()
+
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(count):
+    from features.authentication.models import User
+    User.objects.bulk_create([
+        User(email=f'user{i}@example.com', username=f'user{i}@example.com',
+             first_name=f'First{i}', last_name=f'Last{i}')
+        for i in range(count)
+    ])
+
+
+def per_row_us(fn, rows, repeat):
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / (repeat * rows) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=100, help='rows per page')
+    parser.add_argument('--repeat', type=int, default=200, help='pages serialized per scenario')
+    args = parser.parse_args()
+
+    configure()
+    seed(args.rows)
+
+    from api.v1.users.serializers import UserListSerializer, user_list_rows
+    from features.authentication.models import User
+
+    queryset = User.objects.order_by('-date_joined', '-id')
+    instances = list(queryset.select_related('profile'))
+    rows = list(queryset.values(*user_list_rows.get_fields()))
+    assert user_list_rows.serialize(rows) == UserListSerializer(instances, many=True).data
+
+    scenarios = [
+        ('serialize only: ModelSerializer', lambda: UserListSerializer(instances, many=True).data),
+        ('serialize only: RowSerializer', lambda: user_list_rows.serialize(rows)),
+        ('fetch + serialize: ModelSerializer',
+         lambda: UserListSerializer(list(queryset.select_related('profile')), many=True).data),
+        ('fetch + serialize: RowSerializer',
+         lambda: user_list_rows.serialize(queryset.values(*user_list_rows.get_fields()))),
+    ]
+
+    print(f"{'scenario':<38} {'us/row':>8}")
+    for name, fn in scenarios:
+        print(f'{name:<38} {per_row_us(fn, args.rows, args.repeat):>8.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,28 @@
+# API parsers
+# Decision: orjson parser paired with ORJSONRenderer, enabled by USE_ORJSON
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from .renderers import ORJSONRenderer
+
+class ORJSONParser(JSONParser):
+    """
+    JSON parser backed by orjson
+    
+    orjson only reads UTF-8 and always rejects NaN/Infinity, so other
+    encodings and non-strict JSON settings use JSONParser.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if not self.strict or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
\ No newline at end of file
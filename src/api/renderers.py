@@ -0,0 +1,83 @@
+# API renderers
+# Decision: orjson renderer as an opt-in drop-in for DRF's JSONRenderer;
+# the cases where orjson is known to write different bytes go to the
+# stdlib path
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Datetimes and dataclasses go through DRF's encoder for identical formatting
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    | orjson.OPT_NON_STR_KEYS
+)
+
+def _has_unmatched_float(value) -> bool:
+    """
+    True if value holds a float orjson writes differently from json.dumps
+    
+    Inside 1e-4 <= |x| < 1e16 both print the shortest repr the same way;
+    outside it orjson drops the exponent's '+' (1e16) or writes decimals
+    (0.00001), and it turns NaN/Infinity into null where JSONRenderer
+    raises under STRICT_JSON.
+    """
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if value and not 1e-4 <= abs(value) < 1e16:
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+    return False
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson
+    
+    Design Decision: Same bytes as JSONRenderer for what the API renders
+    (serializer output of JSON types, datetimes, decimals, UUIDs, lazy
+    strings), not just equivalent JSON
+    - Compact separators and raw UTF-8 match DRF's defaults
+      (COMPACT_JSON, UNICODE_JSON)
+    - Types orjson does not handle natively (datetimes, decimals, lazy
+      strings, querysets) use DRF's JSONEncoder.default
+    - U+2028/U+2029 are escaped like DRF does
+    - Indented output (browsable API, `; indent=`), non-default JSON
+      settings, values orjson rejects (e.g. integers over 64 bits) and
+      floats it formats differently (NaN/Infinity, exponents) fall back
+      to JSONRenderer
+    - Not guaranteed outside that set, e.g. for enums, which orjson
+      serializes natively and JSONEncoder rejects
+    """
+    _encode = staticmethod(JSONEncoder().default)
+
+    @classmethod
+    def _default(cls, obj):
+        value = cls._encode(obj)
+        if _has_unmatched_float(value):
+            # orjson turns exceptions raised here into JSONEncodeError
+            raise TypeError('float formatted differently by orjson')
+        return value
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact or _has_unmatched_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=self._default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Keep the output a strict JavaScript subset, as JSONRenderer does
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
\ No newline at end of file
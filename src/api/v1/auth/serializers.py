@@ -17,10 +17,17 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ('email', 'password', 'first_name', 'last_name', 'phone')
+        # validate_email replaces the model's case-sensitive UniqueValidator
         extra_kwargs = {
-            'email': {'required': True},
+            'email': {'required': True, 'validators': []},
         }
 
+    def validate_email(self, value):
+        """Ensure no account uses this email in any letter case"""
+        if User.objects.with_email(value).exists():
+            raise serializers.ValidationError('A user with this email already exists.')
+        return value
+
     def create(self, validated_data):
         # Use service layer for business logic
         from features.authentication.services import AuthenticationService
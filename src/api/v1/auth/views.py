@@ -5,10 +5,57 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
+from core.query_stats import query_budget
+from features.authentication.hashers import HashingCapacityExceeded
 from features.authentication.services import AuthenticationService
+from features.authentication.throttling import get_login_throttle
 from .serializers import UserRegistrationSerializer, LoginSerializer, UserSerializer
 
+def _hashing_busy_response():
+    """
+    Back-pressure response when the password hashing executor is full
+    
+    Design Decision: Fail fast with 503 + Retry-After
+    - Keeps request threads free for the rest of the API
+    - Clients can retry once the login burst has drained
+    """
+    return Response(
+        {'error': 'Server is busy, please retry shortly'},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={'Retry-After': '1'}
+    )
+
+def _throttled_response(retry_after):
+    """
+    Rejection for clients or accounts over the login limits
+    
+    Design Decision: 429 + Retry-After, same body for IP and account limits
+    - Does not reveal whether the email belongs to an account
+    """
+    return Response(
+        {'error': 'Too many login attempts, please retry later'},
+        status=status.HTTP_429_TOO_MANY_REQUESTS,
+        headers={'Retry-After': str(retry_after)}
+    )
+
+def _issue_tokens(user):
+    """
+    Refresh and access token pair for user
+    
+    Design Decision: Import simplejwt tokens on first use
+    - Keeps the token machinery out of the URLconf import at worker boot
+    """
+    from rest_framework_simplejwt.tokens import RefreshToken
+    
+    refresh = RefreshToken.for_user(user)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+# Email check, user and profile INSERTs, and the verification email's
+# outbox row when notifications are installed
+@query_budget(4)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def register(request):
@@ -21,21 +68,19 @@ def register(request):
     """
     serializer = UserRegistrationSerializer(data=request.data)
     if serializer.is_valid():
-        user = serializer.save()
-        
-        # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        try:
+            user = serializer.save()
+        except HashingCapacityExceeded:
+            return _hashing_busy_response()
         
         return Response({
             'user': UserSerializer(user).data,
-            'tokens': {
-                'refresh': str(refresh),
-                'access': str(refresh.access_token),
-            }
+            'tokens': _issue_tokens(user)
         }, status=status.HTTP_201_CREATED)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(2)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login(request):
@@ -43,25 +88,40 @@ def login(request):
     User login endpoint
     
     Returns JWT tokens on successful authentication
+    
+    Throttled per client IP and per account before any password is
+    hashed (see features.authentication.throttling).
     """
+    throttle = get_login_throttle()
+    retry_after = throttle.check_ip(request)
+    if retry_after:
+        return _throttled_response(retry_after)
+    
     serializer = LoginSerializer(data=request.data)
     if serializer.is_valid():
+        email = serializer.validated_data['email']
+        retry_after = throttle.check_account(email)
+        if retry_after:
+            return _throttled_response(retry_after)
+        
         service = AuthenticationService()
-        user = service.authenticate_user(
-            email=serializer.validated_data['email'],
-            password=serializer.validated_data['password']
-        )
+        try:
+            user = service.authenticate_user(
+                email=email,
+                password=serializer.validated_data['password']
+            )
+        except HashingCapacityExceeded:
+            throttle.release_account(email)
+            return _hashing_busy_response()
         
         if user:
-            refresh = RefreshToken.for_user(user)
+            throttle.record_success(email)
             return Response({
                 'user': UserSerializer(user).data,
-                'tokens': {
-                    'refresh': str(refresh),
-                    'access': str(refresh.access_token),
-                }
+                'tokens': _issue_tokens(user)
             })
         else:
+            # The attempt reserved by check_account stays as a failure
             return Response(
                 {'error': 'Invalid credentials'},
                 status=status.HTTP_401_UNAUTHORIZED
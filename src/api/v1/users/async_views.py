@@ -0,0 +1,130 @@
+# Async user management API views
+# Decision: Serve the read paths natively under ASGI so a slow query parks
+# a coroutine instead of tying up a whole worker thread
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from core.query_stats import query_budget
+from features.user_management.services import UserManagementService, InvalidCursor
+from .serializers import UserDetailSerializer, USER_DETAIL_FIELDS, EXPANDABLE_FIELDS
+from .views import (
+    parse_user_list_params, parse_fieldset, user_list_query, user_list_payload,
+    conditional_response, is_conditional, set_validators
+)
+
+def _json_response(data, status_code=status.HTTP_200_OK, headers=None):
+    """Render with the configured JSON renderer so bodies match the sync views byte for byte"""
+    return HttpResponse(
+        api_settings.DEFAULT_RENDERER_CLASSES[0]().render(data),
+        content_type='application/json',
+        status=status_code,
+        headers=headers
+    )
+
+def _error_response(exc, request, authenticator=None):
+    """Mirror DRF's exception handler for authentication errors"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    header = authenticator.authenticate_header(request) if authenticator else None
+    if header:
+        return _json_response(data, status.HTTP_401_UNAUTHORIZED, {'WWW-Authenticate': header})
+    return _json_response(data, exc.status_code)
+
+async def _check_request(request, allowed_methods=('GET',)):
+    """
+    Apply the checks @api_view and IsAuthenticated perform for sync views
+    
+    Design Decision: Reuse the configured DRF authenticators
+    - Token validation and the user cache behave exactly as in sync views
+    - Authenticators are sync code, so they run via sync_to_async
+    
+    Returns:
+        An error response, or None when the request may proceed
+    """
+    if request.method not in allowed_methods:
+        return _json_response(
+            {'detail': f'Method "{request.method}" not allowed.'},
+            status.HTTP_405_METHOD_NOT_ALLOWED,
+            {'Allow': ', '.join(allowed_methods)}
+        )
+    
+    drf_request = Request(request)
+    authenticators = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    for authenticator in authenticators:
+        try:
+            result = await sync_to_async(authenticator.authenticate)(drf_request)
+        except exceptions.APIException as exc:
+            return _error_response(exc, drf_request, authenticator)
+        if result is not None:
+            request.user, request.auth = result
+            return None
+    
+    return _error_response(
+        exceptions.NotAuthenticated(),
+        drf_request,
+        authenticators[0] if authenticators else None
+    )
+
+@query_budget(3)
+async def user_list(request):
+    """Async variant of views.user_list"""
+    error = await _check_request(request)
+    if error:
+        return error
+    
+    params, fieldset, message = parse_user_list_params(request)
+    if message:
+        return _json_response({'error': message}, status.HTTP_400_BAD_REQUEST)
+    
+    service = UserManagementService()
+    validators = await service.aget_user_list_validators(
+        {**params, 'fieldset': fieldset.variant}
+    )
+    not_modified = validators and conditional_response(request, *validators)
+    if not_modified:
+        return not_modified
+    
+    query, serialize = user_list_query(fieldset)
+    try:
+        result = await service.aget_user_list(**query, **params)
+    except InvalidCursor:
+        return _json_response({'error': 'Invalid cursor'}, status.HTTP_400_BAD_REQUEST)
+    
+    # Every serialized column was loaded, so serializing never queries
+    response = _json_response(
+        user_list_payload(serialize(result['users']), result, params['cursor'])
+    )
+    return set_validators(response, *validators) if validators else response
+
+@query_budget(3)
+async def user_detail(request, user_id):
+    """Async variant of views.user_detail"""
+    error = await _check_request(request)
+    if error:
+        return error
+    
+    fieldset, message = parse_fieldset(request, USER_DETAIL_FIELDS, default_expand=EXPANDABLE_FIELDS)
+    if message:
+        return _json_response({'error': message}, status.HTTP_400_BAD_REQUEST)
+    
+    service = UserManagementService()
+    if is_conditional(request):
+        validators = await service.aget_user_validators(
+            user_id, fieldset.with_profile, fieldset.variant
+        )
+        not_modified = validators and conditional_response(request, *validators)
+        if not_modified:
+            return not_modified
+    
+    user = await service.aget_user_by_id(
+        user_id, only=fieldset.model_fields(), with_profile=fieldset.with_profile
+    )
+    
+    if not user:
+        return _json_response({'error': 'User not found'}, status.HTTP_404_NOT_FOUND)
+    
+    serializer = UserDetailSerializer(user, fields=fieldset.serializer_fields)
+    validators = service.get_validators_for_user(user, fieldset.with_profile, fieldset.variant)
+    return set_validators(_json_response(serializer.data), *validators)
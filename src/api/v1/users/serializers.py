@@ -1,8 +1,13 @@
 # User management API serializers
 
-from rest_framework import serializers
+from typing import NamedTuple
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 from features.authentication.models import User
-from features.user_management.models import UserProfile
+from features.user_management.models import BulkOperationJob, UserProfile
+from features.user_management.services import BULK_OPERATIONS
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """User profile serializer"""
@@ -11,7 +16,22 @@ class UserProfileSerializer(serializers.ModelSerializer):
         model = UserProfile
         fields = ('bio', 'avatar', 'date_of_birth', 'location', 'website', 'is_public', 'show_email')
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Serializer mixin that keeps only the fields passed as `fields=`
+    
+    Design Decision: Drop fields after construction
+    - Nested serializers and field options stay declared in one place
+    - Works with many=True, the child receives the same `fields`
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+class UserDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Detailed user serializer with profile information
     
@@ -37,16 +57,166 @@ class UserListSerializer(serializers.ModelSerializer):
         model = User
         fields = ('id', 'email', 'first_name', 'last_name', 'is_active', 'date_joined')
 
+def _iso_datetime(value, tz):
+    """DRF's ISO 8601 datetime output (DateTimeField.to_representation)"""
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+class RowSerializer:
+    """
+    Read-only fast path for a flat ModelSerializer over .values() rows
+    
+    Design Decision: Compile the serializer's fields once, at import time
+    - Rows are plain dicts, so no model instances are built per row
+    - Fields whose DRF representation is the database value are copied,
+      datetimes use the same ISO 8601 formatting DRF applies, anything
+      else falls back to the DRF field's own to_representation
+    - The output has the same keys, order and values as the serializer
+    """
+    PASSTHROUGH_FIELDS = (
+        serializers.BooleanField, serializers.CharField,
+        serializers.EmailField, serializers.IntegerField,
+    )
+
+    def __init__(self, serializer_class, field_names: tuple = None):
+        self.serializer_class = serializer_class
+        self.field_names = field_names
+        self._subsets = {}
+        self._fields = ()
+        self._datetime_fields = ()
+        self._converted_fields = ()
+        self._compiled = False
+
+    def _compile(self):
+        # Deferred to first use, after the app registry and settings are ready
+        datetime_fields = []
+        converted_fields = []
+        fields = self.serializer_class().fields
+        if self.field_names is not None:
+            fields = {name: field for name, field in fields.items() if name in self.field_names}
+        for name, field in fields.items():
+            if isinstance(field, serializers.BaseSerializer) or field.source != name:
+                raise ValueError(f'{self.serializer_class.__name__}.{name} is not a flat model field')
+            if type(field) in self.PASSTHROUGH_FIELDS:
+                continue
+            if self._is_iso_datetime(field):
+                datetime_fields.append(name)
+            else:
+                converted_fields.append((name, field.to_representation))
+        
+        self._fields = tuple(fields)
+        self._datetime_fields = tuple(datetime_fields)
+        self._converted_fields = tuple(converted_fields)
+        self._compiled = True
+
+    @staticmethod
+    def _is_iso_datetime(field) -> bool:
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        return (
+            type(field) is serializers.DateTimeField
+            and settings.USE_TZ
+            and not hasattr(field, 'timezone')
+            and output_format is not None
+            and output_format.lower() == ISO_8601
+        )
+
+    def only(self, field_names) -> 'RowSerializer':
+        """RowSerializer for a subset of the fields, in the serializer's order"""
+        field_names = tuple(field_names)
+        subset = self._subsets.get(field_names)
+        if subset is None:
+            subset = self._subsets[field_names] = RowSerializer(self.serializer_class, field_names)
+        return subset
+
+    def get_fields(self) -> tuple:
+        """Field names to pass to QuerySet.values()"""
+        if not self._compiled:
+            self._compile()
+        return self._fields
+
+    def serialize(self, rows) -> list:
+        """Serialize .values() rows exactly like serializer_class(many=True).data"""
+        if not self._compiled:
+            self._compile()
+        
+        names = self._fields
+        datetime_fields = self._datetime_fields
+        converted_fields = self._converted_fields
+        tz = timezone.get_current_timezone()
+        
+        data = []
+        for row in rows:
+            item = {name: row[name] for name in names}
+            for name in datetime_fields:
+                value = item[name]
+                if value is not None:
+                    item[name] = _iso_datetime(value, tz)
+            for name, convert in converted_fields:
+                value = item[name]
+                if value is not None:
+                    item[name] = convert(value)
+            data.append(item)
+        return data
+
+# Fast path used by the user list views
+user_list_rows = RowSerializer(UserListSerializer)
+
+# Sparse fieldsets (?fields=, ?expand=)
+USER_LIST_FIELDS = UserListSerializer.Meta.fields
+USER_DETAIL_FIELDS = tuple(name for name in UserDetailSerializer.Meta.fields if name != 'profile')
+EXPANDABLE_FIELDS = ('profile',)
+PROFILE_MODEL_FIELDS = (*UserProfileSerializer.Meta.fields, 'updated_at')
+
+class Fieldset(NamedTuple):
+    """
+    Fields and expansions a client asked for
+    
+    Design Decision: One value drives the query and the serializer
+    - model_fields() lists the columns to load, so unrequested columns
+      are never fetched and the profile is joined only when expanded
+    - Names keep the serializer's order, so equal requests produce
+      identical bodies and ETags
+    """
+    fields: tuple
+    expand: tuple = ()
+
+    @property
+    def with_profile(self) -> bool:
+        return 'profile' in self.expand
+
+    @property
+    def serializer_fields(self) -> tuple:
+        return self.fields + self.expand
+
+    @property
+    def variant(self) -> str:
+        """Stable name of this representation, used in ETags"""
+        return f"fields={','.join(self.fields)};expand={','.join(self.expand)}"
+
+    def model_fields(self) -> tuple:
+        """Columns for QuerySet.only(); updated_at feeds the ETag"""
+        names = ('id', *self.fields, 'updated_at')
+        if self.with_profile:
+            names += tuple(f'profile__{name}' for name in PROFILE_MODEL_FIELDS)
+        return tuple(dict.fromkeys(names))
+
 class UserUpdateSerializer(serializers.ModelSerializer):
     """User update serializer with validation"""
     
     class Meta:
         model = User
         fields = ('first_name', 'last_name', 'email', 'is_active')
+        # validate_email replaces the model's UniqueValidator, which would
+        # run a second, identical query
+        extra_kwargs = {'email': {'validators': []}}
         
     def validate_email(self, value):
-        """Ensure email uniqueness"""
-        if User.objects.filter(email=value).exclude(id=self.instance.id if self.instance else None).exists():
+        """Ensure email uniqueness ignoring case; an unchanged email needs no query"""
+        if self.instance is not None and value == self.instance.email:
+            return value
+        if User.objects.with_email(value).exclude(id=self.instance.id if self.instance else None).exists():
             raise serializers.ValidationError("A user with this email already exists.")
         return value
 
@@ -54,6 +224,40 @@ class BulkOperationSerializer(serializers.Serializer):
     """Bulk operations serializer"""
     user_ids = serializers.ListField(
         child=serializers.IntegerField(),
-        allow_empty=False
+        allow_empty=False,
+        max_length=settings.USER_BULK_MAX_IDS
+    )
+    operation = serializers.ChoiceField(choices=list(BULK_OPERATIONS))
+    # Requests above USER_BULK_SYNC_LIMIT always run as a background job
+    run_async = serializers.BooleanField(default=False)
+
+class BatchLookupSerializer(serializers.Serializer):
+    """Batch user lookup serializer (IDs and/or emails)"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        max_length=settings.USER_BATCH_LOOKUP_MAX
+    )
+    emails = serializers.ListField(
+        child=serializers.EmailField(),
+        required=False,
+        max_length=settings.USER_BATCH_LOOKUP_MAX
     )
-    operation = serializers.ChoiceField(choices=['activate', 'deactivate'])
\ No newline at end of file
+    
+    def validate(self, attrs):
+        total = len(attrs.get('ids', [])) + len(attrs.get('emails', []))
+        if not total:
+            raise serializers.ValidationError('Provide ids or emails.')
+        if total > settings.USER_BATCH_LOOKUP_MAX:
+            raise serializers.ValidationError(
+                f'Ensure ids and emails have no more than {settings.USER_BATCH_LOOKUP_MAX} elements in total.'
+            )
+        return attrs
+
+class BulkOperationJobSerializer(serializers.ModelSerializer):
+    """Bulk operation job status serializer"""
+    
+    class Meta:
+        model = BulkOperationJob
+        fields = ('id', 'operation', 'status', 'total_requested', 'processed_count',
+                  'result', 'error', 'created_at', 'updated_at', 'finished_at')
\ No newline at end of file
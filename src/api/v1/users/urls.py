@@ -1,12 +1,20 @@
 # User management API URLs
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Decision: ASGI deployments serve the read paths with async views
+read_views = async_views if settings.ASYNC_VIEWS else views
 
 urlpatterns = [
-    path('', views.user_list, name='user-list'),
-    path('<int:user_id>/', views.user_detail, name='user-detail'),
+    path('', read_views.user_list, name='user-list'),
+    path('<int:user_id>/', read_views.user_detail, name='user-detail'),
+    path('batch/', views.user_batch, name='user-batch'),
     path('<int:user_id>/update/', views.user_update, name='user-update'),
     path('<int:user_id>/deactivate/', views.user_deactivate, name='user-deactivate'),
     path('bulk/', views.bulk_operations, name='user-bulk-operations'),
+    path('bulk/jobs/<int:job_id>/', views.bulk_job_detail, name='user-bulk-job'),
+    path('import/', views.user_import, name='user-import'),
+    path('export/', views.user_export, name='user-export'),
 ]
\ No newline at end of file
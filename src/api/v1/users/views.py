@@ -1,15 +1,34 @@
 # User management API views
 
+import codecs
+import json
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from features.user_management.services import UserManagementService
+from core.db_routers import pin_to_primary
+from core.query_stats import query_budget
+from features.user_management.exports import iter_export, EXPORT_FORMATS, CONTENT_TYPES
+from features.user_management.imports import (
+    UserImportService, read_rows, FORMAT_CSV, FORMAT_NDJSON
+)
+from features.user_management.services import (
+    UserManagementService, InvalidCursor, COUNT_MODES, start_bulk_job
+)
 from .serializers import (
-    UserListSerializer, UserDetailSerializer, 
-    UserUpdateSerializer, BulkOperationSerializer
+    UserDetailSerializer, UserUpdateSerializer,
+    BulkOperationSerializer, BulkOperationJobSerializer, BatchLookupSerializer, user_list_rows,
+    Fieldset, USER_LIST_FIELDS, USER_DETAIL_FIELDS, EXPANDABLE_FIELDS
 )
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_list(request):
@@ -19,37 +38,206 @@ def user_list(request):
     Design Decision: Function-based view for simple list operation
     - Clear and concise
     - Easy to add custom logic
+    
+    Passing `cursor` (empty for the first page) switches to keyset
+    pagination, which keeps deep pages as cheap as the first one.
+    `count` selects how `total_count` is produced: 'exact' (default for
+    page mode), 'estimate' or 'none' (default for cursor mode).
+    `fields` and `expand=profile` select a sparse fieldset.
     """
     service = UserManagementService()
     
-    # Get query parameters
-    search = request.GET.get('search', '')
-    page = int(request.GET.get('page', 1))
-    page_size = int(request.GET.get('page_size', 20))
+    params, fieldset, error = parse_user_list_params(request)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Get users from service
-    result = service.get_user_list(search=search, page=page, page_size=page_size)
+    # Answer polling clients before running the list query at all
+    validators = service.get_user_list_validators({**params, 'fieldset': fieldset.variant})
+    not_modified = validators and conditional_response(request, *validators)
+    if not_modified:
+        return not_modified
     
-    # Serialize users
-    serializer = UserListSerializer(result['users'], many=True)
+    # Get users from service, fetching only the requested columns
+    query, serialize = user_list_query(fieldset)
+    try:
+        result = service.get_user_list(**query, **params)
+    except InvalidCursor:
+        return Response(
+            {'error': 'Invalid cursor'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    return Response({
-        'users': serializer.data,
+    users = serialize(result['users'])
+    response = Response(user_list_payload(users, result, params['cursor']))
+    return set_validators(response, *validators) if validators else response
+
+def parse_user_list_params(request):
+    """
+    Read user list query parameters
+    
+    Shared with the async views so both serve the same contract.
+    
+    Returns:
+        Tuple of (service kwargs, Fieldset, error message or None)
+    """
+    params = {
+        'search': request.GET.get('search', ''),
+        'page': int(request.GET.get('page', 1)),
+        'page_size': request.GET.get('page_size', '20'),
+        'cursor': request.GET.get('cursor'),
+        'count': request.GET.get('count') or None,
+    }
+    
+    # Zero or negative sizes break cursor pages and the offset page count
+    try:
+        params['page_size'] = int(params['page_size'])
+    except ValueError:
+        params['page_size'] = 0
+    if params['page_size'] < 1:
+        return params, None, 'page_size must be a positive integer'
+    
+    if params['count'] and params['count'] not in COUNT_MODES:
+        return params, None, f"count must be one of: {', '.join(COUNT_MODES)}"
+    
+    fieldset, error = parse_fieldset(request, USER_LIST_FIELDS)
+    return params, fieldset, error
+
+def parse_fieldset(request, allowed_fields, default_expand=()):
+    """
+    Read the `fields` and `expand` sparse fieldset parameters
+    
+    Without either parameter the endpoint's default representation is
+    used: every field plus the `default_expand` relations.
+    
+    Returns:
+        Tuple of (Fieldset, error message or None)
+    """
+    raw_fields = request.GET.get('fields')
+    raw_expand = request.GET.get('expand')
+    if raw_fields is None and raw_expand is None:
+        return Fieldset(allowed_fields, default_expand), None
+    
+    requested = {name.strip() for name in (raw_fields or '').split(',') if name.strip()}
+    expand = {name.strip() for name in (raw_expand or '').split(',') if name.strip()}
+    
+    unknown = sorted(requested - set(allowed_fields))
+    if unknown:
+        return None, f"Unknown fields: {', '.join(unknown)}. fields accepts: {', '.join(allowed_fields)}"
+    unknown = sorted(expand - set(EXPANDABLE_FIELDS))
+    if unknown:
+        return None, f"Unknown expand: {', '.join(unknown)}. expand accepts: {', '.join(EXPANDABLE_FIELDS)}"
+    
+    # Keep the serializer's order so equal requests render identically
+    fields = tuple(name for name in allowed_fields if name in requested) or tuple(allowed_fields)
+    return Fieldset(fields, tuple(name for name in EXPANDABLE_FIELDS if name in expand)), None
+
+def user_list_query(fieldset):
+    """
+    Service kwargs and serializer function for a user list fieldset
+    
+    Design Decision: Pick the cheapest query that covers the fieldset
+    - Without expansions, .values() rows go through the RowSerializer fast path
+    - Expanding the profile needs model instances; only the requested
+      user and profile columns are loaded
+    
+    Returns:
+        Tuple of (get_user_list kwargs, function mapping users to data)
+    """
+    if fieldset.with_profile:
+        def serialize(users):
+            return UserDetailSerializer(users, many=True, fields=fieldset.serializer_fields).data
+        return {'only': fieldset.model_fields()}, serialize
+    
+    rows = user_list_rows.only(fieldset.fields)
+    return {'values': rows.get_fields()}, rows.serialize
+
+def conditional_response(request, etag, last_modified):
+    """
+    Return a 304/412 response when the client's validators still match
+    
+    Design Decision: Evaluate preconditions inside the view
+    - Runs after authentication, so validators never leak to anonymous clients
+    - Skips the main query and serialization entirely on a match
+    """
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+def is_conditional(request):
+    return any(
+        header in request.META
+        for header in ('HTTP_IF_NONE_MATCH', 'HTTP_IF_MODIFIED_SINCE', 'HTTP_IF_MATCH', 'HTTP_IF_UNMODIFIED_SINCE')
+    )
+
+def set_validators(response, etag, last_modified):
+    """Attach ETag/Last-Modified (when given) and require clients to revalidate"""
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def user_list_payload(users, result, cursor):
+    """Build the user list response body from serialized users"""
+    if cursor is not None:
+        return {
+            'users': users,
+            'pagination': {
+                'next': result['next_cursor'],
+                'previous': result['previous_cursor'],
+                'total_count': result['total_count'],
+                'count_type': result['count_type'],
+                'has_next': result['has_next'],
+                'has_previous': result['has_previous']
+            }
+        }
+    
+    return {
+        'users': users,
         'pagination': {
             'total_count': result['total_count'],
+            'count_type': result['count_type'],
             'page_count': result['page_count'],
             'current_page': result['current_page'],
             'has_next': result['has_next'],
             'has_previous': result['has_previous']
         }
-    })
+    }
 
+@query_budget(3)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_detail(request, user_id):
-    """Get detailed user information"""
+    """
+    Get detailed user information
+    
+    Design Decision: Validators come from user and profile updated_at, so
+    an unchanged user is answered with 304 from a timestamp-only query
+    
+    The profile is included unless `fields` or `expand` asks for a
+    sparse fieldset; it is then joined only with `expand=profile`.
+    """
     service = UserManagementService()
-    user = service.get_user_by_id(user_id)
+    
+    fieldset, error = parse_fieldset(request, USER_DETAIL_FIELDS, default_expand=EXPANDABLE_FIELDS)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    
+    # Only conditional requests pay for the timestamp query
+    if is_conditional(request):
+        validators = service.get_user_validators(user_id, fieldset.with_profile, fieldset.variant)
+        not_modified = validators and conditional_response(request, *validators)
+        if not_modified:
+            return not_modified
+    
+    user = service.get_user_by_id(
+        user_id, only=fieldset.model_fields(), with_profile=fieldset.with_profile
+    )
     
     if not user:
         return Response(
@@ -57,9 +245,48 @@ def user_detail(request, user_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    serializer = UserDetailSerializer(user)
-    return Response(serializer.data)
+    serializer = UserDetailSerializer(user, fields=fieldset.serializer_fields)
+    validators = service.get_validators_for_user(user, fieldset.with_profile, fieldset.variant)
+    return set_validators(Response(serializer.data), *validators)
 
+@query_budget(2)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def user_batch(request):
+    """
+    Get many users by ID and/or email in one request
+    
+    Design Decision: POST body instead of a long query string
+    - Up to USER_BATCH_LOOKUP_MAX IDs/emails, answered from one query
+    - Users come back in request order, as user_detail would render them;
+      IDs and emails that matched nobody are listed separately
+    - `fields` and `expand` query parameters work as on user_detail
+    """
+    fieldset, error = parse_fieldset(request, USER_DETAIL_FIELDS, default_expand=EXPANDABLE_FIELDS)
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = BatchLookupSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    service = UserManagementService()
+    result = service.get_users_in_batch(
+        user_ids=serializer.validated_data.get('ids', []),
+        emails=serializer.validated_data.get('emails', []),
+        only=fieldset.model_fields(),
+        with_profile=fieldset.with_profile
+    )
+    
+    return Response({
+        'users': UserDetailSerializer(
+            result['users'], many=True, fields=fieldset.serializer_fields
+        ).data,
+        'missing_ids': result['missing_ids'],
+        'missing_emails': result['missing_emails'],
+    })
+
+@query_budget(4)
 @api_view(['PUT', 'PATCH'])
 @permission_classes([IsAuthenticated])
 def user_update(request, user_id):
@@ -70,6 +297,8 @@ def user_update(request, user_id):
     - PUT for complete updates
     - PATCH for partial updates
     """
+    # Validate against the primary's copy of the row, not a replica's
+    pin_to_primary()
     service = UserManagementService()
     user = service.get_user_by_id(user_id)
     
@@ -81,11 +310,12 @@ def user_update(request, user_id):
     
     serializer = UserUpdateSerializer(user, data=request.data, partial=True)
     if serializer.is_valid():
-        updated_user = service.update_user(user_id, **serializer.validated_data)
+        updated_user = service.apply_user_update(user, **serializer.validated_data)
         return Response(UserDetailSerializer(updated_user).data)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+@query_budget(3)
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def user_deactivate(request, user_id):
@@ -104,6 +334,7 @@ def user_deactivate(request, user_id):
             status=status.HTTP_404_NOT_FOUND
         )
 
+@query_budget(5)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def bulk_operations(request):
@@ -117,15 +348,105 @@ def bulk_operations(request):
     serializer = BulkOperationSerializer(data=request.data)
     if serializer.is_valid():
         service = UserManagementService()
-        result = service.bulk_operation(
-            user_ids=serializer.validated_data['user_ids'],
-            operation=serializer.validated_data['operation']
-        )
+        user_ids = serializer.validated_data['user_ids']
+        operation = serializer.validated_data['operation']
+        
+        if serializer.validated_data['run_async'] or len(user_ids) > settings.USER_BULK_SYNC_LIMIT:
+            job = service.create_bulk_job(user_ids, operation, created_by=request.user)
+            transaction.on_commit(lambda: start_bulk_job(job.id))
+            return Response(
+                {
+                    'message': 'Operation accepted',
+                    'job': BulkOperationJobSerializer(job).data,
+                    'status_url': reverse('user-bulk-job', args=[job.id]),
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        result = service.bulk_operation(user_ids=user_ids, operation=operation)
         
         return Response({
             'message': f'Operation completed successfully',
             'affected_users': result['success_count'],
-            'total_requested': result['total_requested']
+            'total_requested': result['total_requested'],
+            'changed_ids': result['changed_ids'],
+            'unchanged_ids': result['unchanged_ids'],
+            'missing_ids': result['missing_ids'],
         })
     
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bulk_job_detail(request, job_id):
+    """Get the status and per-ID results of a background bulk operation"""
+    service = UserManagementService()
+    job = service.get_bulk_job(job_id)
+    
+    if not job:
+        return Response(
+            {'error': 'Job not found'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    return Response(BulkOperationJobSerializer(job).data)
+
+# Content types accepted by the import endpoint
+IMPORT_CONTENT_TYPES = {
+    'text/csv': FORMAT_CSV,
+    'application/x-ndjson': FORMAT_NDJSON,
+    'application/jsonl': FORMAT_NDJSON,
+}
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def user_import(request):
+    """
+    Bulk import users from a CSV or NDJSON request body
+    
+    Design Decision: Stream both directions
+    - The body is read line by line instead of parsed into request.data
+    - Rejected rows are written back as NDJSON while the import runs,
+      followed by a summary line
+    """
+    content_type = request.content_type.split(';')[0].strip().lower()
+    file_format = IMPORT_CONTENT_TYPES.get(content_type)
+    if file_format is None:
+        return Response(
+            {'error': f"Content-Type must be one of: {', '.join(IMPORT_CONTENT_TYPES)}"},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+    
+    lines = codecs.iterdecode(request.stream or [], 'utf-8-sig')
+    results = UserImportService().import_rows(read_rows(lines, file_format))
+    
+    return StreamingHttpResponse(
+        (json.dumps(result, cls=DjangoJSONEncoder) + '\n' for result in results),
+        content_type='application/x-ndjson'
+    )
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_export(request):
+    """
+    Stream all users matching `search` as NDJSON (default) or CSV
+    
+    Design Decision: `export_format` instead of `format`
+    - DRF reserves `?format=` for renderer selection
+    """
+    file_format = request.GET.get('export_format', EXPORT_FORMATS[0])
+    if file_format not in EXPORT_FORMATS:
+        return Response(
+            {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    service = UserManagementService()
+    rows = service.export_users(search=request.GET.get('search', ''))
+    
+    response = StreamingHttpResponse(
+        iter_export(rows, file_format),
+        content_type=CONTENT_TYPES[file_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="users.{file_format}"'
+    return response
@@ -0,0 +1,12 @@
+# ASGI config for VLE User Management System
+# Decision: ASGI entry point for uvicorn workers; async views run on the
+# event loop while sync views keep working through Django's thread adapter
+
+import os
+from django.core.asgi import get_asgi_application
+
+# Set default settings module
+# Decision: Use development settings as default, override in production
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.development')
+
+application = get_asgi_application()
\ No newline at end of file
@@ -1,4 +1,5 @@
 import environ
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths
@@ -31,7 +32,12 @@ DJANGO_APPS = [
 THIRD_PARTY_APPS = [
     'rest_framework',
     'corsheaders',
-    'django_extensions',
+]
+
+# Decision: Project-wide infrastructure (management commands, tooling)
+# that is not a product feature
+CORE_APPS = [
+    'core',
 ]
 
 FEATURE_APPS = [
@@ -46,8 +52,6 @@ FEATURE_APPS = [
     'features.reporting',
 ]
 
-INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + FEATURE_APPS
-
 # Feature flags (our key innovation)
 ENABLED_FEATURES = {
     'authentication': True,
@@ -61,30 +65,122 @@ ENABLED_FEATURES = {
     'reporting': env.bool('ENABLE_REPORTING', False),
 }
 
+def get_feature_apps(enabled_features):
+    """
+    Feature apps to install for the given flags
+    
+    Design Decision: Install enabled features only
+    - Disabled features cost no imports, models or checks at boot
+    - Features whose package is not part of this build are skipped
+    - Settings modules that change ENABLED_FEATURES rebuild INSTALLED_APPS
+    """
+    return [
+        app for app in FEATURE_APPS
+        if enabled_features.get(app.rsplit('.', 1)[-1], False) and find_spec(app) is not None
+    ]
+
+INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CORE_APPS + get_feature_apps(ENABLED_FEATURES)
+
+# Connection pooling
+# Decision: Sizes apply per worker process, so WEB_CONCURRENCY x
+# DB_POOL_MAX_SIZE must stay below the server's max_connections
+DATABASE_POOL_ENABLED = env.bool('DB_POOL_ENABLED', default=True)
+DATABASE_POOL = {
+    'min_size': env.int('DB_POOL_MIN_SIZE', default=1),
+    'max_size': env.int('DB_POOL_MAX_SIZE', default=4),
+    'timeout': env.float('DB_POOL_TIMEOUT', default=5.0),
+    'max_idle': env.float('DB_POOL_MAX_IDLE', default=600.0),
+    'max_lifetime': env.float('DB_POOL_MAX_LIFETIME', default=3600.0),
+    'check_after': env.float('DB_POOL_CHECK_AFTER', default=30.0),
+}
+
+def pooled(database):
+    """Serve a PostgreSQL DATABASES entry from the connection pool"""
+    if not DATABASE_POOL_ENABLED or database['ENGINE'] != 'django.db.backends.postgresql':
+        return database
+    return {
+        **database,
+        'ENGINE': 'core.db_backends.postgresql_pool',
+        # Closing at the end of each request returns the connection to the pool
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {**database.get('OPTIONS', {}), 'pool': DATABASE_POOL},
+    }
+
 # Database
 DATABASES = {
-    'default': {
+    'default': pooled({
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': env('DB_NAME', default='userdb'),
         'USER': env('DB_USER', default='postgres'),
         'PASSWORD': env('DB_PASSWORD'),
         'HOST': env('DB_HOST', default='localhost'),
         'PORT': env('DB_PORT', default='5432'),
-    }
+    })
 }
 
+# Read replicas
+# Decision: Each URL in DATABASE_REPLICA_URLS becomes a replica_<n> alias;
+# the router serves opted-in reads from them and writes from default
+DATABASE_REPLICA_URLS = env.list('DATABASE_REPLICA_URLS', default=[])
+for index, url in enumerate(DATABASE_REPLICA_URLS, 1):
+    # Tests read the primary's test database through the replica alias
+    DATABASES[f'replica_{index}'] = {**pooled(env.db_url_config(url)), 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = [f'replica_{index}' for index in range(1, len(DATABASE_REPLICA_URLS) + 1)]
+DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+
+# Clients that wrote read from the primary for this long
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=5)
+REPLICA_PIN_COOKIE = 'db_primary_pin'
+
+# Query count/DB time response headers (always on with DEBUG)
+QUERY_STATS_HEADERS = env.bool('QUERY_STATS_HEADERS', default=False)
+
+# Metrics
+# Decision: /metrics serves Prometheus text; under gunicorn each worker
+# writes snapshots to METRICS_DIR so a scrape sees every worker
+METRICS_ENABLED = env.bool('METRICS_ENABLED', default=True)
+METRICS_TOKEN = env('METRICS_TOKEN', default='')  # required as a Bearer token when set
+METRICS_REQUIRE_TOKEN = env.bool('METRICS_REQUIRE_TOKEN', default=False)  # 404 until METRICS_TOKEN is set
+METRICS_DIR = env('METRICS_DIR', default='')
+METRICS_FLUSH_INTERVAL = env.float('METRICS_FLUSH_INTERVAL', default=10.0)  # seconds
+
+def instrumented_caches(caches):
+    """Count hits and misses of every CACHES entry (see core.cache)"""
+    if not METRICS_ENABLED:
+        return caches
+    return {
+        alias: config if config['BACKEND'] == 'core.cache.instrumented_cache' else {
+            **config,
+            'BACKEND': 'core.cache.instrumented_cache',
+            'INSTRUMENTED_BACKEND': config['BACKEND'],
+            'METRICS_ALIAS': alias,
+        }
+        for alias, config in caches.items()
+    }
+
+# Cache
+# Decision: Per-process memory cache unless a deployment configures Redis
+CACHES = instrumented_caches({
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+})
+
 # Custom user model
 # Decision: Use custom user model from the start for flexibility
-AUTH_USER_MODEL = 'features.authentication.User'
+AUTH_USER_MODEL = 'authentication.User'
 
 # Middleware configuration
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
+    'core.middleware.QueryInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.DatabaseRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -145,18 +241,91 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashing
+# Decision: Hash on a bounded executor; requests over capacity get a 503
+PASSWORD_HASHERS = [
+    'features.authentication.hashers.BoundedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASHING_WORKERS = env.int('PASSWORD_HASHING_WORKERS', default=0)  # 0 = CPU count
+PASSWORD_HASHING_QUEUE_SIZE = env.int('PASSWORD_HASHING_QUEUE_SIZE', default=8)
+PASSWORD_HASHING_QUEUE_TIMEOUT = env.float('PASSWORD_HASHING_QUEUE_TIMEOUT', default=0.25)
+
+# Login throttling
+# Decision: Limits live in the cache, so every worker enforces one budget
+# only with Redis; with the local-memory cache each worker counts separately
+LOGIN_THROTTLE_ENABLED = env.bool('LOGIN_THROTTLE_ENABLED', default=True)
+LOGIN_THROTTLE_CACHE_ALIAS = 'default'
+LOGIN_THROTTLE_IP_LIMIT = env.int('LOGIN_THROTTLE_IP_LIMIT', default=20)  # attempts per window
+LOGIN_THROTTLE_IP_WINDOW = env.int('LOGIN_THROTTLE_IP_WINDOW', default=60)  # seconds
+LOGIN_LOCKOUT_THRESHOLD = env.int('LOGIN_LOCKOUT_THRESHOLD', default=5)  # failures per window
+LOGIN_LOCKOUT_WINDOW = env.int('LOGIN_LOCKOUT_WINDOW', default=900)  # seconds
+
 # REST Framework
+# Decision: orjson renderer/parser are opt-in (requires the orjson package)
+USE_ORJSON = env.bool('USE_ORJSON', default=False)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'features.authentication.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.ORJSONRenderer' if USE_ORJSON else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.ORJSONParser' if USE_ORJSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
 }
 
+# Authenticated user cache
+# Decision: Local entries expire quickly so other workers notice deactivations
+# (a process-local AUTH_USER_CACHE_ALIAS backend is only used as the local tier)
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_SIZE = env.int('AUTH_USER_CACHE_SIZE', default=10000)
+AUTH_USER_CACHE_LOCAL_TTL = env.int('AUTH_USER_CACHE_LOCAL_TTL', default=5)
+AUTH_USER_CACHE_TTL = env.int('AUTH_USER_CACHE_TTL', default=300)
+
+# User management
+# Decision: Estimated list counts may be this many seconds stale
+USER_LIST_COUNT_CACHE_TIMEOUT = env.int('USER_LIST_COUNT_CACHE_TIMEOUT', default=60)
+# Decision: Rows validated and inserted per transaction during bulk imports
+USER_IMPORT_CHUNK_SIZE = env.int('USER_IMPORT_CHUNK_SIZE', default=500)
+# Decision: Rows fetched per database round-trip while streaming exports
+USER_EXPORT_CHUNK_SIZE = env.int('USER_EXPORT_CHUNK_SIZE', default=2000)
+# Decision: Bulk operations commit one transaction per batch of this many IDs
+USER_BULK_BATCH_SIZE = env.int('USER_BULK_BATCH_SIZE', default=1000)
+# Decision: Larger bulk requests run as background jobs instead of inline
+USER_BULK_SYNC_LIMIT = env.int('USER_BULK_SYNC_LIMIT', default=5000)
+USER_BULK_MAX_IDS = env.int('USER_BULK_MAX_IDS', default=500000)
+# Decision: Running jobs whose runner has not checked in (after each batch)
+# for this long lost their process; keep it well above one batch's duration
+USER_BULK_JOB_STALE_AFTER = env.int('USER_BULK_JOB_STALE_AFTER', default=600)  # seconds
+# Decision: Batch lookups are answered inline, so keep them page-sized
+USER_BATCH_LOOKUP_MAX = env.int('USER_BATCH_LOOKUP_MAX', default=100)
+# Decision: Route user list/detail to the async views (enable under ASGI)
+ASYNC_VIEWS = env.bool('ASYNC_VIEWS', default=False)
+
+# Notifications outbox
+# Decision: Emails are queued in the database and sent by `manage.py run_outbox`
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=50)
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=8)
+OUTBOX_RETRY_BASE_DELAY = env.int('OUTBOX_RETRY_BASE_DELAY', default=30)
+OUTBOX_RETRY_MAX_DELAY = env.int('OUTBOX_RETRY_MAX_DELAY', default=3600)
+OUTBOX_POLL_INTERVAL = env.float('OUTBOX_POLL_INTERVAL', default=2.0)
+# Decision: Links in emails point at the frontend that consumes the tokens
+FRONTEND_URL = env('FRONTEND_URL', default='http://localhost:3000')
+
 # JWT Settings
 from datetime import timedelta
 SIMPLE_JWT = {
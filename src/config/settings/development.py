@@ -12,12 +12,16 @@ ALLOWED_HOSTS = ['localhost', '127.0.0.1']
 # Decision: Add debugging tools only in development to avoid performance impact
 INTERNAL_IPS = ['127.0.0.1']
 
+# Feature flags for development
+# Decision: Enable all features in development for testing purposes
+ENABLED_FEATURES = {key: True for key in ENABLED_FEATURES.keys()}
+INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CORE_APPS + get_feature_apps(ENABLED_FEATURES)
+
+# Decision: django_extensions is a development dependency only
+INSTALLED_APPS += ['django_extensions']
+
 if 'django_debug_toolbar' not in INSTALLED_APPS:
     INSTALLED_APPS += ['django_debug_toolbar']
 
 if 'debug_toolbar.middleware.DebugToolbarMiddleware' not in MIDDLEWARE:
-    MIDDLEWARE = ['debug_toolbar.middleware.DebugToolbarMiddleware'] + MIDDLEWARE
-
-# Feature flags for development
-# Decision: Enable all features in development for testing purposes
-ENABLED_FEATURES = {key: True for key in ENABLED_FEATURES.keys()}
\ No newline at end of file
+    MIDDLEWARE = ['debug_toolbar.middleware.DebugToolbarMiddleware'] + MIDDLEWARE
\ No newline at end of file
@@ -27,19 +27,25 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 
 # Use HTTPS in production
+# Decision: SECURE_SSL_REDIRECT=false lets local runs of these settings
+# (benchmarks against 127.0.0.1) speak plain HTTP instead of getting 301s
 if not DEBUG:
-    SECURE_SSL_REDIRECT = True
+    SECURE_SSL_REDIRECT = env.bool('SECURE_SSL_REDIRECT', default=True)
     SESSION_COOKIE_SECURE = True
     CSRF_COOKIE_SECURE = True
 
 # Database configuration for Railway
 # Railway provides DATABASE_URL automatically
 if 'DATABASE_URL' in os.environ:
-    DATABASES['default'] = dj_database_url.parse(
+    DATABASES['default'] = pooled(dj_database_url.parse(
         env('DATABASE_URL'),
         conn_max_age=600,
         conn_health_checks=True,
-    )
+    ))
+
+# Metrics expose traffic, worker and login-throttle details, so the
+# public host only serves /metrics to scrapers holding METRICS_TOKEN
+METRICS_REQUIRE_TOKEN = env.bool('METRICS_REQUIRE_TOKEN', default=True)
 
 # Static files configuration for Railway
 STATIC_URL = '/static/'
@@ -90,16 +96,17 @@ if env('EMAIL_HOST', default=''):
     EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
     EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
     EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
+    EMAIL_TIMEOUT = env.int('EMAIL_TIMEOUT', default=10)
     DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@example.com')
 
 # Cache configuration (Redis on Railway)
 if env('REDIS_URL', default=''):
-    CACHES = {
+    CACHES = instrumented_caches({
         'default': {
             'BACKEND': 'django.core.cache.backends.redis.RedisCache',
             'LOCATION': env('REDIS_URL'),
         }
-    }
+    })
 
 # Feature flags can be overridden per deployment
 ENABLED_FEATURES.update({
@@ -110,4 +117,5 @@ ENABLED_FEATURES.update({
     'two_factor_auth': env.bool('ENABLE_2FA', False),
     'session_management': env.bool('ENABLE_SESSIONS', False),
     'reporting': env.bool('ENABLE_REPORTING', False),
-})
\ No newline at end of file
+})
+INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + CORE_APPS + get_feature_apps(ENABLED_FEATURES)
\ No newline at end of file
@@ -4,11 +4,13 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
+from core.views import metrics
 
 # Core URL patterns
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/v1/', include('api.v1.urls')),
+    path('metrics', metrics, name='metrics'),
 ]
 
 # Development-specific URLs
@@ -0,0 +1,2 @@
+# Core infrastructure package
+# Decision: Cross-cutting tooling shared by every feature lives outside features/
\ No newline at end of file
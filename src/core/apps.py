@@ -0,0 +1,13 @@
+# Core app configuration
+
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+    verbose_name = 'Core'
+
+    def ready(self):
+        from .query_stats import install_query_recorder
+        connection_created.connect(install_query_recorder, dispatch_uid='core.query_stats')
\ No newline at end of file
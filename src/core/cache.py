@@ -0,0 +1,74 @@
+# Cache instrumentation
+# Decision: Wrap the configured backend class instead of proxying the
+# instance, so backend-specific methods and isinstance checks still work
+
+from functools import lru_cache
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.module_loading import import_string
+from .metrics import cache_requests
+
+_MISSING = object()
+
+# Entries in these backends are invisible to other worker processes
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_process_local(alias: str) -> bool:
+    """
+    Whether caches[alias] only lives in the current process
+
+    Data that every worker must agree on (invalidations, versions, pins)
+    cannot be kept in such a cache once gunicorn runs several workers.
+    """
+    return isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+class InstrumentedCacheMixin:
+    """Count hits and misses of get() and get_many() per cache alias"""
+
+    metrics_alias = 'default'
+    native_get_many = True
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        if value is _MISSING:
+            cache_requests.inc(self.metrics_alias, 'miss')
+            return default
+        cache_requests.inc(self.metrics_alias, 'hit')
+        return value
+
+    def get_many(self, keys, version=None):
+        if not self.native_get_many:
+            # BaseCache.get_many() calls get() per key, which already counts
+            return super().get_many(keys, version=version)
+        keys = list(keys)
+        found = super().get_many(keys, version=version)
+        if found:
+            cache_requests.inc(self.metrics_alias, 'hit', amount=len(found))
+        if len(found) < len(keys):
+            cache_requests.inc(self.metrics_alias, 'miss', amount=len(keys) - len(found))
+        return found
+
+
+@lru_cache(maxsize=None)
+def _instrumented_class(backend_class):
+    return type(f'Instrumented{backend_class.__name__}', (InstrumentedCacheMixin, backend_class), {
+        'native_get_many': backend_class.get_many is not BaseCache.get_many,
+    })
+
+
+def instrumented_cache(location, params):
+    """
+    CACHES BACKEND that builds params['INSTRUMENTED_BACKEND'] with hit/miss counting
+
+    Settings apply it with config.settings.base.instrumented_caches().
+    """
+    params = dict(params)
+    backend_class = import_string(params.pop('INSTRUMENTED_BACKEND'))
+    alias = params.pop('METRICS_ALIAS', 'default')
+    cache = _instrumented_class(backend_class)(location, params)
+    cache.metrics_alias = alias
+    return cache
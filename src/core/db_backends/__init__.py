@@ -0,0 +1,2 @@
+# Custom database backends
+# Decision: Backends are referenced by dotted path from DATABASES ENGINE
\ No newline at end of file
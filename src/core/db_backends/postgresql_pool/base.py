@@ -0,0 +1,57 @@
+# Pooled PostgreSQL backend
+# Decision: Django's PostgreSQL backend with connections borrowed from a
+# per-process pool (see pool.py) instead of opened and closed per request
+
+from django.db.backends.postgresql import base
+from django.db.backends.base.base import NO_DB_ALIAS
+from .creation import DatabaseCreation
+from .pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    PostgreSQL backend that returns connections to a pool on close
+
+    Design Decision: Pool below Django's connection handling
+    - Django still closes the connection at the end of every request
+      (CONN_MAX_AGE = 0); closing hands it back to the pool, so each
+      request pays for a checkout instead of a new session
+    - Pool sizes come from OPTIONS['pool'] and apply per worker process
+    - Connections used to create or drop the test database bypass the pool
+    """
+
+    creation_class = DatabaseCreation
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop('pool', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        if self.alias == NO_DB_ALIAS:
+            return super().get_new_connection(conn_params)
+
+        options = self.settings_dict['OPTIONS']
+        # A new database name (e.g. the test database) gets its own pool
+        key = (
+            self.alias, options.get('isolation_level'),
+            tuple(sorted((name, repr(value)) for name, value in conn_params.items())),
+        )
+        self._pool = get_pool(
+            key, self.alias, lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+            options.get('pool', {})
+        )
+        connection = self._pool.getconn()
+        self.isolation_level = base.IsolationLevel(
+            options.get('isolation_level', base.IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        pool = getattr(self, '_pool', None)
+        if pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
@@ -0,0 +1,12 @@
+# Test database creation for the pooled backend
+
+from django.db.backends.postgresql.creation import DatabaseCreation as BaseDatabaseCreation
+from .pool import close_pools
+
+
+class DatabaseCreation(BaseDatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # DROP DATABASE fails while pooled sessions are still connected to it
+        close_pools(self.connection.alias)
+        super()._destroy_test_db(test_database_name, verbosity)
@@ -0,0 +1,279 @@
+# PostgreSQL connection pool
+# Decision: A small per-process pool of psycopg2 connections, so requests
+# skip the TCP/TLS handshake and authentication of a fresh connection
+
+import os
+import threading
+import time
+from collections import deque
+import psycopg2
+from psycopg2 import extensions
+
+DEFAULT_POOL_OPTIONS = {
+    'min_size': 1,
+    'max_size': 4,
+    'timeout': 5.0,
+    'max_idle': 600.0,
+    'max_lifetime': 3600.0,
+    'check_after': 30.0,
+}
+
+
+class PooledConnection:
+    __slots__ = ('connection', 'created_at', 'returned_at')
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.created_at = self.returned_at = time.monotonic()
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of open connections for one database
+
+    Design Decision: Bounded pool with health checks on checkout
+    - At most max_size connections per worker process; callers wait up to
+      `timeout` seconds for a free one instead of opening more
+    - Connections idle longer than check_after are pinged before reuse,
+      so a restarted server or a dropped socket costs one retry, not an error
+    - Connections are replaced after max_lifetime, and idle ones above
+      min_size are closed after max_idle, so server memory is released
+    - The most recently returned connection is reused first, which keeps
+      the rest idle long enough to be trimmed
+    """
+
+    def __init__(self, connect, min_size=1, max_size=4, timeout=5.0,
+                 max_idle=600.0, max_lifetime=3600.0, check_after=30.0):
+        if max_size < 1 or min_size > max_size:
+            raise ValueError('Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1')
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self._idle = deque()
+        self._in_use = {}
+        self._opening = 0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._counters = dict.fromkeys(
+            ('requests', 'waits', 'timeouts', 'opened', 'closed', 'failed_checks'), 0
+        )
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self._idle) + len(self._in_use) + self._opening
+
+    def getconn(self):
+        """Check out a healthy connection, opening one if the pool has room"""
+        deadline = time.monotonic() + self.timeout
+        with self._condition:
+            self._counters['requests'] += 1
+
+        while True:
+            with self._condition:
+                item = self._take_idle_or_reserve(deadline)
+
+            if item is None:
+                return self._open()
+            if self._is_healthy(item):
+                with self._condition:
+                    self._in_use[id(item.connection)] = item
+                return item.connection
+            self._discard(item, failed_check=True)
+
+    def putconn(self, connection):
+        """Return a connection; broken, busy or expired ones are closed instead"""
+        with self._condition:
+            item = self._in_use.pop(id(connection), None)
+        if item is None:
+            connection.close()
+            return
+
+        reusable = not self._closed and self._reset(connection)
+        if reusable and time.monotonic() - item.created_at < self.max_lifetime:
+            with self._condition:
+                item.returned_at = time.monotonic()
+                self._idle.append(item)
+                self._trim_idle()
+                self._condition.notify()
+        else:
+            self._discard(item)
+
+    def close(self):
+        """Close idle connections; checked-out ones are closed when returned"""
+        with self._condition:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._condition.notify_all()
+        for item in idle:
+            self._discard(item)
+
+    def stats(self) -> dict:
+        """Pool size, saturation and wait-time counters for this process"""
+        with self._condition:
+            in_use = len(self._in_use) + self._opening
+            requests = self._counters['requests']
+            return {
+                'max_size': self.max_size,
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'saturation': round(in_use / self.max_size, 3),
+                **self._counters,
+                'wait_ms_total': round(self._wait_total * 1000, 3),
+                'wait_ms_avg': round(self._wait_total * 1000 / requests, 3) if requests else 0.0,
+                'wait_ms_max': round(self._wait_max * 1000, 3),
+            }
+
+    def _take_idle_or_reserve(self, deadline):
+        """
+        Idle connection to reuse, or None after reserving a slot to open one
+
+        Caller holds the condition.
+        """
+        waited = False
+        while True:
+            if self._closed:
+                raise psycopg2.OperationalError('connection pool is closed')
+            if self._idle:
+                return self._idle.pop()
+            if self.size < self.max_size:
+                self._opening += 1
+                return None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._counters['timeouts'] += 1
+                raise psycopg2.OperationalError(
+                    f'connection pool exhausted: {self.max_size} connections in use '
+                    f'for {self.timeout:g}s'
+                )
+            if not waited:
+                self._counters['waits'] += 1
+                waited = True
+            started = time.monotonic()
+            self._condition.wait(remaining)
+            elapsed = time.monotonic() - started
+            self._wait_total += elapsed
+            self._wait_max = max(self._wait_max, elapsed)
+
+    def _open(self):
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._condition:
+                self._opening -= 1
+                self._condition.notify()
+            raise
+
+        item = PooledConnection(connection)
+        with self._condition:
+            self._opening -= 1
+            self._counters['opened'] += 1
+            self._in_use[id(connection)] = item
+        return connection
+
+    def _is_healthy(self, item) -> bool:
+        connection = item.connection
+        if connection.closed or time.monotonic() - item.created_at >= self.max_lifetime:
+            return False
+        if time.monotonic() - item.returned_at < self.check_after:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if not connection.autocommit:
+                connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @staticmethod
+    def _reset(connection) -> bool:
+        """Leave the connection idle outside a transaction, or report it unusable"""
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status in (extensions.TRANSACTION_STATUS_INTRANS, extensions.TRANSACTION_STATUS_INERROR):
+            try:
+                connection.rollback()
+                return True
+            except psycopg2.Error:
+                return False
+        return False
+
+    def _trim_idle(self):
+        """Close the oldest idle connections above min_size; caller holds the condition"""
+        now = time.monotonic()
+        while len(self._idle) > self.min_size and now - self._idle[0].returned_at >= self.max_idle:
+            item = self._idle.popleft()
+            self._counters['closed'] += 1
+            try:
+                item.connection.close()
+            except psycopg2.Error:
+                pass
+
+    def _discard(self, item, failed_check=False):
+        try:
+            item.connection.close()
+        except psycopg2.Error:
+            pass
+        with self._condition:
+            self._in_use.pop(id(item.connection), None)
+            self._counters['closed'] += 1
+            if failed_check:
+                self._counters['failed_checks'] += 1
+            self._condition.notify()
+
+
+# One pool per database alias and connection parameters, per process
+_pools = {}
+_pools_lock = threading.Lock()
+# Pools inherited from the parent; kept referenced so their sockets are
+# never closed (and the parent's sessions terminated) by the child
+_inherited = []
+
+
+def get_pool(key, alias, connect, options) -> ConnectionPool:
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = ConnectionPool(connect, **{**DEFAULT_POOL_OPTIONS, **options})
+                pool.alias = alias
+                _pools[key] = pool
+    return pool
+
+
+def pool_stats() -> dict:
+    """Stats for every pool in this process, keyed by database alias"""
+    return {pool.alias: pool.stats() for pool in list(_pools.values())}
+
+
+def close_pools(alias: str = None):
+    """Close the idle connections of every pool, or of one alias's pools"""
+    with _pools_lock:
+        keys = [key for key, pool in _pools.items() if alias is None or pool.alias == alias]
+        pools = [_pools.pop(key) for key in keys]
+    for pool in pools:
+        pool.close()
+
+
+def _forget_pools_after_fork():
+    # Connections opened before a fork share their socket with the parent
+    global _pools_lock
+    _inherited.append(list(_pools.values()))
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_pools_after_fork)
@@ -0,0 +1,167 @@
+# Database routing
+# Decision: Send request reads that opt in to read replicas and keep
+# everything else, including every write, on the primary
+
+import contextvars
+import random
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Optional
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import LazyObject
+
+PRIMARY = DEFAULT_DB_ALIAS
+
+
+class RoutingState:
+    """Per-request routing decisions, shared by every query the request runs"""
+
+    __slots__ = ('request', 'wrote', 'pinned', 'replica')
+
+    def __init__(self, request=None):
+        self.request = request
+        self.wrote = False
+        self.pinned = None  # unknown until the first replica read
+        self.replica = None
+
+
+_state = contextvars.ContextVar('db_routing_state', default=None)
+_replica_reads = contextvars.ContextVar('db_replica_reads', default=False)
+
+
+def begin_request(request) -> contextvars.Token:
+    return _state.set(RoutingState(request))
+
+
+def end_request(token: contextvars.Token) -> RoutingState:
+    state = _state.get()
+    _state.reset(token)
+    return state
+
+
+def pin_to_primary():
+    """Read from the primary for the rest of this request and the pin window after it"""
+    state = _state.get()
+    if state is not None:
+        state.wrote = state.pinned = True
+
+
+def read_from_primary():
+    """Read from the primary for the rest of this request, without pinning the client"""
+    state = _state.get()
+    if state is not None:
+        state.pinned = True
+
+
+@contextmanager
+def _replica_scope():
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_reads(func):
+    """
+    Allow the queries func runs to be served by a read replica
+
+    Design Decision: Opt-in per service method
+    - Only reads that tolerate replication lag move off the primary;
+      authentication, login and write paths keep reading the primary
+    - Reads outside a request (commands, background threads) always
+      use the primary, since there is no client to pin after a write
+    """
+    if iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _replica_scope():
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with _replica_scope():
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _pin_key(user_id) -> str:
+    return f'db:pin:user:{user_id}'
+
+
+def _request_user(request):
+    """The authenticated user, without triggering a lazy session lookup"""
+    user = request.__dict__.get('user')
+    if user is None or isinstance(user, LazyObject) or not user.is_authenticated:
+        return None
+    return user
+
+
+def _is_pinned(state: RoutingState) -> bool:
+    if state.pinned is None:
+        request = state.request
+        user = _request_user(request)
+        state.pinned = (
+            request.COOKIES.get(settings.REPLICA_PIN_COOKIE) is not None
+            or (user is not None and cache.get(_pin_key(user.pk)) is not None)
+        )
+    return state.pinned
+
+
+def record_pin(request, response, state: RoutingState):
+    """
+    Keep the client on the primary for REPLICA_PIN_SECONDS after a write
+
+    Design Decision: Cookie plus cache entry
+    - The cookie covers clients without an account yet, e.g. registration
+    - The cache entry, keyed by user, covers API clients that drop cookies
+    """
+    if not state.wrote or not settings.DATABASE_REPLICAS:
+        return
+    seconds = settings.REPLICA_PIN_SECONDS
+    response.set_cookie(
+        settings.REPLICA_PIN_COOKIE, str(int(time.time()) + seconds), max_age=seconds,
+        secure=settings.SESSION_COOKIE_SECURE, httponly=True, samesite='Lax'
+    )
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.pk), 1, seconds)
+
+
+class PrimaryReplicaRouter:
+    """
+    Route opted-in request reads to a replica with read-your-writes pinning
+
+    Design Decision: Pin to the primary instead of tracking replication lag
+    - Any write in a request moves the rest of that request to the primary
+    - Clients that wrote within REPLICA_PIN_SECONDS keep reading the primary,
+      so they always see their own changes
+    - One replica is chosen per request, so paginated reads are consistent
+    - Reads inside a transaction on the primary stay on the primary
+    """
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        state = _state.get()
+        if state is None or not _replica_reads.get() or not settings.DATABASE_REPLICAS:
+            return None
+        if _is_pinned(state) or connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        if state.replica is None:
+            state.replica = random.choice(settings.DATABASE_REPLICAS)
+        return state.replica
+
+    def db_for_write(self, model, **hints) -> str:
+        pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        # Replicas hold the same rows as the primary
+        databases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
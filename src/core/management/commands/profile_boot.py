@@ -0,0 +1,96 @@
+# Boot profiling command
+# Decision: Profile a fresh interpreter with -X importtime, because by the
+# time a management command runs this process has already booted Django
+
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in the child interpreter; prints phase timings as JSON
+BOOT_SCRIPT = '''
+import json, sys, time
+marks = [('start', time.perf_counter())]
+import django
+from django.conf import settings
+settings.INSTALLED_APPS
+marks.append(('settings', time.perf_counter()))
+django.setup()
+marks.append(('apps', time.perf_counter()))
+from django.urls import get_resolver
+get_resolver().url_patterns
+marks.append(('urls', time.perf_counter()))
+if sys.argv[1] == 'asgi':
+    from django.core.asgi import get_asgi_application as get_application
+else:
+    from django.core.wsgi import get_wsgi_application as get_application
+get_application()
+marks.append(('application', time.perf_counter()))
+print(json.dumps([(name, (end - start) * 1000) for (_, start), (name, end) in zip(marks, marks[1:])]))
+'''
+
+
+def parse_importtime(output: str) -> list:
+    """(module, self_ms, cumulative_ms) rows from -X importtime output"""
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        rows.append((fields[2].strip(), int(fields[0]) / 1000, int(fields[1]) / 1000))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Report where worker boot time goes: boot phases and the slowest imports'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--app', choices=('wsgi', 'asgi'), default='wsgi',
+                            help='Application entry point to load (default: wsgi)')
+        parser.add_argument('--limit', type=int, default=25, help='Rows to show (default: 25)')
+        parser.add_argument('--sort', choices=('cumulative', 'self'), default='cumulative',
+                            help='Order modules by time including or excluding their imports')
+        parser.add_argument('--group', choices=('module', 'package'), default='module',
+                            help='Report single modules or sum self time per top-level package')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT, options['app']],
+            capture_output=True, text=True, cwd=settings.BASE_DIR, env=env
+        )
+        if process.returncode != 0:
+            raise CommandError(f'Boot failed:\n{process.stderr[-2000:]}')
+
+        phases = json.loads(process.stdout.strip().splitlines()[-1])
+        imports = parse_importtime(process.stderr)
+
+        self.stdout.write(f"{'phase':<14} {'ms':>9}")
+        for name, elapsed in phases:
+            self.stdout.write(f'{name:<14} {elapsed:>9.1f}')
+        self.stdout.write(f"{'total':<14} {sum(elapsed for _, elapsed in phases):>9.1f}")
+        self.stdout.write(
+            f'\n{len(imports)} modules imported, {sum(row[1] for row in imports):.1f} ms of import time\n'
+        )
+
+        if options['group'] == 'package':
+            totals = defaultdict(lambda: [0.0, 0])
+            for module, self_ms, _ in imports:
+                totals[module.split('.')[0]][0] += self_ms
+                totals[module.split('.')[0]][1] += 1
+            ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+            self.stdout.write(f"{'package':<48} {'self ms':>9} {'modules':>8}")
+            for package, (self_ms, count) in ranked[:options['limit']]:
+                self.stdout.write(f'{package:<48} {self_ms:>9.1f} {count:>8}')
+            return
+
+        column = 2 if options['sort'] == 'cumulative' else 1
+        ranked = sorted(imports, key=lambda row: row[column], reverse=True)
+        self.stdout.write(f"{'module':<56} {'self ms':>9} {'cumul ms':>9}")
+        for module, self_ms, cumulative_ms in ranked[:options['limit']]:
+            self.stdout.write(f'{module:<56} {self_ms:>9.1f} {cumulative_ms:>9.1f}')
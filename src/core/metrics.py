@@ -0,0 +1,378 @@
+# Metrics
+# Decision: Prometheus text format from plain per-thread shards, so
+# recording a request never takes a lock; gunicorn workers share their
+# numbers through snapshot files in METRICS_DIR
+
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Seconds; covers cached reads (ms) up to password hashing and slow exports
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric:
+    """
+    Labelled metric whose values live in one shard per thread
+
+    Design Decision: Shard per thread instead of a lock per update
+    - A thread only ever writes its own shard, so updates are plain list
+      arithmetic with no lock and no contention between request threads
+    - A label set gets a fixed-size value list the first time a thread
+      sees it; later updates reuse it
+    - Scrapes sum the shards; a value read mid-update is at most one
+      observation behind
+    - Shards of finished threads are kept, so counters never go backwards
+    """
+
+    kind = ''
+    size = 1
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    def _values(self, labels: tuple) -> list:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._local.shard = {}
+            with self._shards_lock:
+                self._shards.append(shard)
+        values = shard.get(labels)
+        if values is None:
+            values = shard[labels] = [0] * self.size
+        return values
+
+    def samples(self) -> Dict[tuple, list]:
+        """Values summed over every thread's shard, keyed by label values"""
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged = {}
+        for shard in shards:
+            for labels, values in list(shard.items()):
+                total = merged.get(labels)
+                if total is None:
+                    merged[labels] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        total[index] += value
+        return merged
+
+    def reset(self):
+        with self._shards_lock:
+            for shard in self._shards:
+                shard.clear()
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels, amount=1):
+        self._values(labels)[0] += amount
+
+
+class Gauge(Metric):
+    """Gauge built from increments, so per-thread shards still add up"""
+
+    kind = 'gauge'
+
+    def inc(self, *labels, amount=1):
+        self._values(labels)[0] += amount
+
+    def dec(self, *labels, amount=1):
+        self._values(labels)[0] -= amount
+
+
+class Histogram(Metric):
+    """Bucket counts (not cumulative) followed by the sum of observations"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # One slot per bucket, one for +Inf, one for the sum
+        self.size = len(self.buckets) + 2
+
+    def observe(self, value: float, *labels):
+        values = self._values(labels)
+        values[bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+
+class Registry:
+    """
+    Metrics of this process plus collectors read at scrape time
+
+    Collectors return (name, kind, documentation, [(labels dict, value)])
+    tuples for numbers that already live elsewhere, e.g. a stats() dict.
+    """
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], list]):
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def snapshot(self) -> dict:
+        """JSON-serializable state of this process; every sample value is a list"""
+        families = []
+        for metric in self.metrics:
+            families.append({
+                'name': metric.name, 'kind': metric.kind, 'help': metric.documentation,
+                'buckets': list(getattr(metric, 'buckets', ())),
+                'samples': [
+                    [dict(zip(metric.labelnames, labels)), values]
+                    for labels, values in metric.samples().items()
+                ],
+            })
+        for collector in self.collectors:
+            for name, kind, documentation, samples in collector():
+                families.append({
+                    'name': name, 'kind': kind, 'help': documentation,
+                    'samples': [[labels, [value]] for labels, value in samples],
+                })
+        return {'pid': os.getpid(), 'families': families}
+
+
+registry = Registry()
+
+http_requests_in_flight = registry.register(Gauge(
+    'http_requests_in_flight', 'Requests being served'
+))
+http_request_duration = registry.register(Histogram(
+    'http_request_duration_seconds', 'Request latency by view and status', ('view', 'status')
+))
+db_queries = registry.register(Counter(
+    'db_queries_total', 'Database queries by view', ('view',)
+))
+db_request_duration = registry.register(Histogram(
+    'db_request_duration_seconds', 'Database time per request by view', ('view',)
+))
+cache_requests = registry.register(Counter(
+    'cache_requests_total', 'Cache lookups by cache alias and result (hit/miss)', ('cache', 'result')
+))
+password_hash_duration = registry.register(Histogram(
+    'password_hash_duration_seconds', 'Password hashing time per request, queueing included, by view',
+    ('view',), buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)
+))
+
+_hash_time = ContextVar('password_hash_time', default=None)
+
+
+@contextmanager
+def track_password_hashing():
+    """Collect the hashing time of this request; yields a one-item list of seconds"""
+    total = [0.0]
+    token = _hash_time.set(total)
+    try:
+        yield total
+    finally:
+        _hash_time.reset(token)
+
+
+def observe_password_hash(seconds: float):
+    """Called by the hashing executor in the requesting thread"""
+    total = _hash_time.get()
+    if total is not None:
+        total[0] += seconds
+
+
+# Exposition
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float) and value.is_integer():
+        return f'{value:.1f}'
+    return repr(value)
+
+
+def merge_snapshots(snapshots: List[dict], live_pids: Optional[set] = None) -> list:
+    """
+    Sum the same series across processes
+
+    Counters and histograms of exited workers are kept so totals never
+    drop; gauges only count processes in live_pids (all when None).
+    """
+    families = {}
+    for snapshot in snapshots:
+        live = live_pids is None or snapshot['pid'] in live_pids
+        for family in snapshot['families']:
+            if family['kind'] == 'gauge' and not live:
+                continue
+            merged = families.setdefault(family['name'], {**family, 'samples': {}})
+            for labels, values in family['samples']:
+                key = tuple(sorted(labels.items()))
+                total = merged['samples'].get(key)
+                if total is None:
+                    merged['samples'][key] = (labels, list(values))
+                else:
+                    for index, value in enumerate(values):
+                        total[1][index] += value
+    return list(families.values())
+
+
+def render(families: list) -> str:
+    """Prometheus text exposition format 0.0.4"""
+    lines = []
+    for family in sorted(families, key=lambda item: item['name']):
+        name = family['name']
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['kind']}")
+        for labels, values in family['samples'].values():
+            if family['kind'] != 'histogram':
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(values[0])}')
+                continue
+            cumulative = 0
+            bounds = [_format_value(float(bound)) for bound in family['buckets']] + ['+Inf']
+            for bound, count in zip(bounds, values[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels({**labels, "le": bound})} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(float(values[-1]))}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+# Multiprocess snapshots
+
+def _snapshot_path(directory: str, pid: int) -> Path:
+    return Path(directory) / f'metrics-{pid}.json'
+
+
+def write_snapshot(directory: str):
+    """Atomically replace this process's snapshot file"""
+    path = _snapshot_path(directory, os.getpid())
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(registry.snapshot()))
+    os.replace(temporary, path)
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def collect(directory: str = None) -> str:
+    """This process's metrics, merged with every worker's snapshot when directory is set"""
+    if not directory:
+        return render(merge_snapshots([registry.snapshot()]))
+
+    write_snapshot(directory)
+    snapshots = []
+    for path in Path(directory).glob('metrics-*.json'):
+        try:
+            snapshots.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue  # removed or being replaced
+    live = {snapshot['pid'] for snapshot in snapshots if _is_alive(snapshot['pid'])}
+    return render(merge_snapshots(snapshots, live))
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def start_snapshot_writer(directory: str, interval: float):
+    """Write this process's snapshot every interval seconds from a daemon thread"""
+    global _writer
+    if not directory or (_writer is not None and _writer.is_alive()):
+        return
+    with _writer_lock:
+        if _writer is not None and _writer.is_alive():
+            return
+        Path(directory).mkdir(parents=True, exist_ok=True)
+
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    write_snapshot(directory)
+                except OSError:
+                    pass
+
+        _writer = threading.Thread(target=run, name='metrics-snapshot', daemon=True)
+        _writer.start()
+
+
+# Collectors for numbers kept elsewhere; features register their own
+# (see features.authentication.metrics)
+
+def _resident_memory_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            # ru_maxrss is the peak, in KiB on Linux
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        except (ImportError, ValueError):
+            return None
+
+
+def process_collector() -> list:
+    memory = _resident_memory_bytes()
+    if memory is None:
+        return []
+    return [(
+        'process_resident_memory_bytes', 'gauge', 'Resident memory of each worker process',
+        [({'pid': str(os.getpid())}, memory)],
+    )]
+
+
+def database_pool_collector() -> list:
+    from core.db_backends.postgresql_pool.pool import pool_stats
+
+    stats = pool_stats()
+    if not stats:
+        return []
+    return [
+        ('db_pool_connections', 'gauge', 'Pooled connections by alias and state', [
+            ({'alias': alias, 'state': state}, pool[state])
+            for alias, pool in stats.items() for state in ('in_use', 'idle')
+        ]),
+        ('db_pool_max_connections', 'gauge', 'Pool max_size per worker, summed', [
+            ({'alias': alias}, pool['max_size']) for alias, pool in stats.items()
+        ]),
+        ('db_pool_wait_seconds_total', 'counter', 'Time spent waiting for a pooled connection', [
+            ({'alias': alias}, pool['wait_ms_total'] / 1000) for alias, pool in stats.items()
+        ]),
+        ('db_pool_timeouts_total', 'counter', 'Checkouts that gave up waiting', [
+            ({'alias': alias}, pool['timeouts']) for alias, pool in stats.items()
+        ]),
+    ]
+
+
+registry.add_collector(process_collector)
+registry.add_collector(database_pool_collector)
@@ -0,0 +1,175 @@
+# Core middleware
+# Decision: Request-scoped infrastructure that every feature relies on
+
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from . import metrics
+from .db_routers import begin_request, end_request, record_pin
+from .query_stats import record_queries, view_query_stats
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Scope database routing decisions to one request
+
+    Design Decision: Context variable instead of thread-local
+    - Works for sync and async views; ORM calls made through
+      sync_to_async see the same request state
+    - After a write, the response pins the client to the primary
+      (see core.db_routers.PrimaryReplicaRouter)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = begin_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            state = end_request(token)
+        record_pin(request, response, state)
+        return response
+
+    async def __acall__(self, request):
+        token = begin_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            state = end_request(token)
+        record_pin(request, response, state)
+        return response
+
+
+def _header_safe(sql: str, limit: int = 200) -> str:
+    return ' '.join(sql.split())[:limit].encode('ascii', 'replace').decode()
+
+
+def _view_name(request) -> str:
+    match = getattr(request, 'resolver_match', None)
+    return match.view_name if match else '<unresolved>'
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Record query count, DB time and the slowest statement per request
+
+    Design Decision: Aggregate per resolved view name
+    - Every request is added to core.query_stats.view_query_stats,
+      including whether it went over the view's declared query budget
+    - With DEBUG or QUERY_STATS_HEADERS the numbers are also sent as
+      response headers, so a regression shows up in the browser's
+      network tab
+    - The recorder is attached to the response as `query_stats` for
+      tests (see core.testing.QueryBudgetMixin)
+    - Queries run while a streaming response is consumed are not counted
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    async def __acall__(self, request):
+        with record_queries() as recorder:
+            response = await self.get_response(request)
+        return self.finish(request, response, recorder)
+
+    def finish(self, request, response, recorder):
+        match = getattr(request, 'resolver_match', None)
+        view_name = _view_name(request)
+        budget = getattr(match.func, 'query_budget', None) if match else None
+        view_query_stats.add(view_name, recorder, budget)
+        response.query_stats = recorder
+
+        if settings.DEBUG or settings.QUERY_STATS_HEADERS:
+            response['X-DB-Query-Count'] = str(recorder.count)
+            response['Server-Timing'] = f'db;dur={recorder.duration_ms:.2f};desc="{recorder.count} queries"'
+            if budget is not None:
+                response['X-DB-Query-Budget'] = str(budget)
+            if recorder.slowest_sql:
+                response['X-DB-Slowest-Query'] = (
+                    f'{recorder.slowest_ms:.2f}ms {_header_safe(recorder.slowest_sql)}'
+                )
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Feed the /metrics histograms and gauges (see core.metrics)
+
+    Design Decision: Outermost middleware
+    - Latency covers every other middleware, not only the view
+    - Reads the query counts QueryInstrumentationMiddleware attached to
+      the response, so the database is only instrumented once
+    - Views are labelled by route name, never by path, so the number of
+      series stays fixed however many user IDs are requested
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        metrics.start_snapshot_writer(settings.METRICS_DIR, settings.METRICS_FLUSH_INTERVAL)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics.http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with metrics.track_password_hashing() as hashing:
+                response = self.get_response(request)
+        finally:
+            metrics.http_requests_in_flight.dec()
+        self.observe(request, response, time.perf_counter() - started, hashing[0])
+        return response
+
+    async def __acall__(self, request):
+        metrics.http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with metrics.track_password_hashing() as hashing:
+                response = await self.get_response(request)
+        finally:
+            metrics.http_requests_in_flight.dec()
+        self.observe(request, response, time.perf_counter() - started, hashing[0])
+        return response
+
+    @staticmethod
+    def observe(request, response, duration, hashing):
+        view = _view_name(request)
+        metrics.http_request_duration.observe(duration, view, str(response.status_code))
+        recorder = getattr(response, 'query_stats', None)
+        if recorder is not None:
+            metrics.db_queries.inc(view, amount=recorder.count)
+            metrics.db_request_duration.observe(recorder.duration, view)
+        if hashing:
+            metrics.password_hash_duration.observe(hashing, view)
@@ -0,0 +1,138 @@
+# Query instrumentation
+# Decision: One execute wrapper per database connection feeds whichever
+# request is active in the current context, so sync and async views and
+# every database alias are covered without per-request setup
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+# Statements kept per request for failure messages and debug headers
+MAX_STATEMENTS = 50
+
+_recorder = ContextVar('query_recorder', default=None)
+
+# Issued by transaction.atomic only when it is nested in another
+# transaction (TestCase, ATOMIC_REQUESTS); not counted so a view's count,
+# and its budget, is the same in tests and in production
+SAVEPOINT_SQL = ('SAVEPOINT ', 'RELEASE SAVEPOINT ', 'ROLLBACK TO SAVEPOINT ')
+
+
+class QueryRecorder:
+    """Query count, total time and slowest statement for one request"""
+
+    __slots__ = ('count', 'duration', 'slowest_sql', 'slowest_duration', 'statements')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+        self.statements = []
+
+    def record(self, sql: str, duration: float):
+        self.count += 1
+        self.duration += duration
+        if duration >= self.slowest_duration:
+            self.slowest_sql, self.slowest_duration = sql, duration
+        if len(self.statements) < MAX_STATEMENTS:
+            self.statements.append((sql, duration))
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    @property
+    def slowest_ms(self) -> float:
+        return self.slowest_duration * 1000
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper; a context variable lookup when no request is recording"""
+    recorder = _recorder.get()
+    if recorder is None or (isinstance(sql, str) and sql.startswith(SAVEPOINT_SQL)):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    """connection_created receiver: wrap each connection once"""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def record_queries():
+    """Record the queries run in this context (and in sync_to_async calls it makes)"""
+    recorder = QueryRecorder()
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _recorder.reset(token)
+
+
+def query_budget(max_queries: int):
+    """
+    Declare how many queries a view may run per request
+
+    Design Decision: Budget lives next to the view it constrains
+    - Tests enforce it with QueryBudgetMixin.assertWithinQueryBudget
+    - Production aggregates count requests over budget per view
+
+    Apply it above @api_view so the attribute lands on the routed view.
+    """
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+class ViewQueryStats:
+    """
+    Per-view query aggregates for this process
+
+    Design Decision: Fixed-size aggregates keyed by view name
+    - Memory grows with the number of views, not with traffic
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def add(self, view_name: str, recorder: QueryRecorder, budget: Optional[int] = None):
+        with self._lock:
+            view = self._views.get(view_name)
+            if view is None:
+                view = self._views[view_name] = {
+                    'requests': 0, 'queries': 0, 'queries_max': 0,
+                    'db_ms': 0.0, 'db_ms_max': 0.0,
+                    'slowest_ms': 0.0, 'slowest_sql': None,
+                    'budget': budget, 'over_budget': 0,
+                }
+            view['requests'] += 1
+            view['queries'] += recorder.count
+            view['queries_max'] = max(view['queries_max'], recorder.count)
+            view['db_ms'] += recorder.duration_ms
+            view['db_ms_max'] = max(view['db_ms_max'], recorder.duration_ms)
+            if recorder.slowest_ms >= view['slowest_ms']:
+                view['slowest_ms'], view['slowest_sql'] = recorder.slowest_ms, recorder.slowest_sql
+            if budget is not None and recorder.count > budget:
+                view['over_budget'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {name: dict(view) for name, view in self._views.items()}
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+view_query_stats = ViewQueryStats()
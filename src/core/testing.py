@@ -0,0 +1,59 @@
+# Test helpers
+# Decision: Shared assertions for feature test suites
+
+import tempfile
+from contextlib import contextmanager
+from django.conf import settings
+from django.core.cache import caches
+from django.test import override_settings
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that checks endpoints against their query budgets
+
+    Design Decision: Assert on what the middleware recorded
+    - Counts every query the request ran, on every database alias,
+      including authentication and permission checks (savepoints of
+      nested atomic blocks excepted, see core.query_stats)
+    - The budget comes from the view's @query_budget unless given
+    """
+
+    def assertWithinQueryBudget(self, response, budget: int = None):
+        recorder = getattr(response, 'query_stats', None)
+        if recorder is None:
+            self.fail('No query stats on the response; is QueryInstrumentationMiddleware installed?')
+        
+        match = response.resolver_match
+        view_name = match.view_name if match else '<unresolved>'
+        if budget is None:
+            budget = getattr(match.func, 'query_budget', None) if match else None
+        if budget is None:
+            self.fail(f'{view_name} declares no query budget; decorate it with @query_budget')
+        
+        if recorder.count > budget:
+            statements = '\n'.join(
+                f'{index}. {sql}' for index, (sql, _) in enumerate(recorder.statements, 1)
+            )
+            self.fail(
+                f'{view_name} ran {recorder.count} queries, over its budget of {budget}:\n{statements}'
+            )
+
+
+@contextmanager
+def shared_cache(*alias_settings: str):
+    """
+    Point the named *_CACHE_ALIAS settings at a cache other processes can read
+
+    Design Decision: A file-based cache stands in for Redis
+    - Features that need every worker to agree switch themselves off on
+      the default local-memory cache (see core.cache.is_process_local)
+    """
+    with tempfile.TemporaryDirectory() as directory, override_settings(
+        CACHES={
+            **settings.CACHES,
+            'shared': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory},
+        },
+        **{name: 'shared' for name in alias_settings},
+    ):
+        yield caches['shared']
\ No newline at end of file
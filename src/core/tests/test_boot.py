@@ -0,0 +1,223 @@
+# Boot time tests
+
+import importlib.util
+import os
+import tempfile
+from pathlib import Path
+from unittest import mock
+from django.conf import settings
+from django.test import SimpleTestCase
+from psycopg2.extensions import parse_dsn
+from config.settings.base import FEATURE_APPS, get_feature_apps
+from core.management.commands.profile_boot import parse_importtime
+
+
+def load_startup():
+    """Import the container's startup.py (it lives outside src) as a module"""
+    spec = importlib.util.spec_from_file_location('startup', settings.BASE_DIR.parent / 'startup.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+startup = load_startup()
+
+class FeatureAppsTests(SimpleTestCase):
+    """
+    Test that only enabled, present features are installed
+    """
+
+    def test_disabled_features_are_not_installed(self):
+        apps = get_feature_apps({'authentication': True, 'user_management': False})
+        
+        self.assertEqual(apps, ['features.authentication'])
+    
+    def test_missing_feature_packages_are_skipped(self):
+        apps = get_feature_apps({app.rsplit('.', 1)[-1]: True for app in FEATURE_APPS})
+        
+        self.assertIn('features.user_management', apps)
+        self.assertNotIn('features.reporting', apps)
+
+class ParseImporttimeTests(SimpleTestCase):
+    """
+    Test parsing of python -X importtime output
+    """
+
+    def test_rows_are_parsed_in_milliseconds(self):
+        output = (
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       120 |        120 |     _io\n'
+            'import time:      1500 |       4500 |   django.urls\n'
+            'unrelated stderr line\n'
+        )
+        
+        self.assertEqual(parse_importtime(output), [('_io', 0.12, 0.12), ('django.urls', 1.5, 4.5)])
+
+class StartupDsnTests(SimpleTestCase):
+    """
+    Test the libpq connection string startup.py builds without Django
+    """
+
+    def test_values_are_quoted_and_escaped(self):
+        env = {
+            'DB_NAME': 'user db', 'DB_USER': "o'brien", 'DB_PASSWORD': "p@ss' \\word=",
+            'DB_HOST': 'db.internal', 'DB_PORT': '6432',
+        }
+        with mock.patch.dict(os.environ, env, clear=True):
+            dsn = startup.database_dsn()
+        
+        self.assertEqual(parse_dsn(dsn), {
+            'dbname': 'user db', 'user': "o'brien", 'password': "p@ss' \\word=",
+            'host': 'db.internal', 'port': '6432',
+        })
+    
+    def test_database_url_is_used_only_for_postgresql(self):
+        with mock.patch.dict(os.environ, {'DATABASE_URL': 'postgres://u:p@db/app'}, clear=True):
+            self.assertEqual(startup.database_dsn(), 'postgres://u:p@db/app')
+        with mock.patch.dict(os.environ, {'DATABASE_URL': 'sqlite:///db.sqlite3'}, clear=True):
+            self.assertIsNone(startup.database_dsn())
+
+class StartupFingerprintTests(SimpleTestCase):
+    """
+    Test the migrate and collectstatic stamps change with their inputs only
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        root = Path(directory.name)
+        src = root / 'src'
+        self.files = {
+            'migration': src / 'app' / 'migrations' / '0001_initial.py',
+            'test_migration': src / 'app' / 'tests' / 'migrations' / '0001_initial.py',
+            'static': src / 'app' / 'static' / 'app.css',
+            'settings': src / 'config' / 'settings' / 'base.py',
+        }
+        for path in self.files.values():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text('original')
+        for name, value in (('ROOT', root), ('SRC', src)):
+            patcher = mock.patch.object(startup, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def fingerprints(self, **env):
+        with mock.patch.dict(os.environ, env):
+            return startup.migrations_fingerprint(), startup.static_fingerprint()
+    
+    def test_fingerprints_are_stable(self):
+        self.assertEqual(self.fingerprints(), self.fingerprints())
+    
+    def test_each_stamp_follows_its_own_inputs(self):
+        migrations, static = self.fingerprints()
+        
+        self.files['static'].write_text('changed')
+        changed = self.fingerprints()
+        self.assertEqual(changed[0], migrations)
+        self.assertNotEqual(changed[1], static)
+        
+        self.files['migration'].write_text('changed')
+        self.assertNotEqual(self.fingerprints()[0], migrations)
+        self.assertEqual(self.fingerprints()[1], changed[1])
+    
+    def test_settings_change_both_stamps(self):
+        before = self.fingerprints()
+        self.files['settings'].write_text('changed')
+        after = self.fingerprints()
+        
+        self.assertNotEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+    
+    def test_test_migrations_are_ignored(self):
+        before = self.fingerprints()
+        self.files['test_migration'].write_text('changed')
+        
+        self.assertEqual(self.fingerprints()[0], before[0])
+    
+    def test_feature_flags_change_the_migrations_stamp(self):
+        self.assertNotEqual(
+            self.fingerprints(ENABLE_NOTIFICATIONS='true')[0],
+            self.fingerprints(ENABLE_NOTIFICATIONS='false')[0]
+        )
+
+class StartupStampTests(SimpleTestCase):
+    """
+    Test migrate and collectstatic skip matching stamps unless forced
+
+    Design Decision: Mock psycopg2 and manage.py
+    - The stamp logic is checked without a PostgreSQL server
+    """
+
+    def setUp(self):
+        self.cursor = mock.MagicMock()
+        connection = mock.MagicMock()
+        connection.cursor.return_value.__enter__.return_value = self.cursor
+        for name, value in (
+            ('database_dsn', mock.Mock(return_value="dbname='app'")),
+            ('migrations_fingerprint', mock.Mock(return_value='new-stamp')),
+            ('static_fingerprint', mock.Mock(return_value='new-stamp')),
+            ('connect', mock.Mock(return_value=connection)),
+        ):
+            patcher = mock.patch.object(startup, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(startup.subprocess, 'run')
+        self.run = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ('FORCE_MIGRATE', 'FORCE_COLLECTSTATIC'):
+            os.environ.pop(name, None)
+    
+    def stored_stamp(self, value):
+        self.cursor.fetchone.return_value = (value,) if value else None
+    
+    def test_migrate_skips_a_matching_stamp(self):
+        self.stored_stamp('new-stamp')
+        
+        self.assertEqual(startup.migrate(), 'skipped (unchanged)')
+        self.run.assert_not_called()
+        self.assertEqual(
+            self.cursor.execute.call_args_list[0].args, ('SELECT pg_advisory_lock(%s)', [startup.MIGRATE_LOCK_ID])
+        )
+    
+    def test_migrate_runs_and_stamps_when_changed_or_missing(self):
+        for stored in ('old-stamp', None):
+            self.cursor.reset_mock()
+            self.run.reset_mock()
+            self.stored_stamp(stored)
+        
+            self.assertEqual(startup.migrate(), 'applied')
+            self.run.assert_called_once_with(startup.MANAGE + ['migrate', '--noinput'], check=True)
+            sql, params = self.cursor.execute.call_args.args
+            self.assertIn('ON CONFLICT (name) DO UPDATE', sql)
+            self.assertEqual(params, ['new-stamp'])
+    
+    def test_force_migrate_ignores_the_stamp(self):
+        self.stored_stamp('new-stamp')
+        os.environ['FORCE_MIGRATE'] = '1'
+        
+        self.assertEqual(startup.migrate(), 'applied')
+        self.run.assert_called_once()
+    
+    def test_migrate_without_postgresql_always_runs(self):
+        startup.database_dsn.return_value = None
+        
+        self.assertEqual(startup.migrate(), 'applied (no stamp outside PostgreSQL)')
+        startup.connect.assert_not_called()
+        self.run.assert_called_once()
+    
+    def test_collectstatic_follows_the_stamp_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            stamp = Path(directory) / '.collectstatic-hash'
+            with mock.patch.object(startup, 'STATIC_STAMP', stamp):
+                self.assertEqual(startup.collectstatic(), 'collected')
+                self.assertEqual(stamp.read_text(), 'new-stamp')
+        
+                self.assertEqual(startup.collectstatic(), 'skipped (unchanged)')
+                self.assertEqual(self.run.call_count, 1)
+        
+                os.environ['FORCE_COLLECTSTATIC'] = '1'
+                self.assertEqual(startup.collectstatic(), 'collected')
+                self.assertEqual(self.run.call_count, 2)
\ No newline at end of file
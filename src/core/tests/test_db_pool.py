@@ -0,0 +1,146 @@
+# Connection pool tests
+
+import threading
+from unittest import mock, skipUnless
+import psycopg2
+from psycopg2 import extensions
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+from core.db_backends.postgresql_pool import pool as pool_module
+from core.db_backends.postgresql_pool.pool import ConnectionPool
+
+class FakeConnection:
+    """Just enough of a psycopg2 connection for the pool"""
+
+    def __init__(self):
+        self.closed = 0
+        self.autocommit = True
+        self.info = mock.Mock(transaction_status=extensions.TRANSACTION_STATUS_IDLE)
+        self.rollbacks = 0
+        self.ping_error = None
+
+    def cursor(self):
+        cursor = mock.MagicMock()
+        cursor.__enter__.return_value.execute.side_effect = self.ping_error
+        return cursor
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = 1
+
+class ConnectionPoolTests(SimpleTestCase):
+    """
+    Test checkout, return and recycling with fake connections
+    
+    Design Decision: No database needed for pool behaviour
+    """
+
+    def make_pool(self, **options):
+        self.opened = []
+        
+        def connect():
+            self.opened.append(FakeConnection())
+            return self.opened[-1]
+        
+        return ConnectionPool(connect, **{'max_size': 2, 'timeout': 0.05, **options})
+
+    def test_returned_connection_is_reused(self):
+        pool = self.make_pool()
+        
+        first = pool.getconn()
+        pool.putconn(first)
+        
+        self.assertIs(pool.getconn(), first)
+        self.assertEqual(pool.stats()['opened'], 1)
+    
+    def test_exhausted_pool_times_out(self):
+        pool = self.make_pool()
+        pool.getconn()
+        pool.getconn()
+        
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.getconn()
+        
+        stats = pool.stats()
+        self.assertEqual((stats['waits'], stats['timeouts']), (1, 1))
+        self.assertEqual(stats['saturation'], 1.0)
+        self.assertGreater(stats['wait_ms_max'], 0)
+    
+    def test_waiter_gets_returned_connection(self):
+        pool = self.make_pool(max_size=1, timeout=5)
+        held = pool.getconn()
+        threading.Timer(0.05, pool.putconn, [held]).start()
+        
+        self.assertIs(pool.getconn(), held)
+        self.assertEqual(pool.stats()['waits'], 1)
+    
+    def test_broken_connection_is_not_reused(self):
+        pool = self.make_pool()
+        broken = pool.getconn()
+        broken.closed = 1
+        pool.putconn(broken)
+        
+        self.assertIsNot(pool.getconn(), broken)
+        self.assertEqual(pool.stats()['closed'], 1)
+    
+    def test_open_transaction_is_rolled_back_on_return(self):
+        pool = self.make_pool()
+        conn = pool.getconn()
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.putconn(conn)
+        
+        self.assertEqual(conn.rollbacks, 1)
+        self.assertIs(pool.getconn(), conn)
+    
+    def test_idle_connection_failing_health_check_is_replaced(self):
+        pool = self.make_pool(check_after=0)
+        stale = pool.getconn()
+        pool.putconn(stale)
+        stale.ping_error = psycopg2.OperationalError('server closed the connection')
+        
+        fresh = pool.getconn()
+        
+        self.assertIsNot(fresh, stale)
+        self.assertTrue(stale.closed)
+        self.assertEqual(pool.stats()['failed_checks'], 1)
+    
+    def test_connection_recycled_after_max_lifetime(self):
+        pool = self.make_pool(max_lifetime=0)
+        old = pool.getconn()
+        pool.putconn(old)
+        
+        self.assertTrue(old.closed)
+        self.assertIsNot(pool.getconn(), old)
+    
+    def test_pools_are_forgotten_after_fork(self):
+        with mock.patch.object(pool_module, '_pools', {}), \
+                mock.patch.object(pool_module, '_inherited', []):
+            pool_module.get_pool('key', 'default', FakeConnection, {})
+            
+            pool_module._forget_pools_after_fork()
+            
+            self.assertEqual(pool_module.pool_stats(), {})
+            self.assertEqual(len(pool_module._inherited), 1)
+
+@skipUnless(
+    connection.settings_dict['ENGINE'] == 'core.db_backends.postgresql_pool',
+    'needs the pooled PostgreSQL backend'
+)
+class PooledBackendTests(TransactionTestCase):
+    """
+    Test that Django's close hands the session back to the pool
+    """
+
+    def test_connection_is_reused_after_close(self):
+        connection.ensure_connection()
+        backend_pid = connection.connection.info.backend_pid
+        opened = pool_module.pool_stats()['default']['opened']
+        connection.close()
+        
+        connection.ensure_connection()
+        
+        self.assertEqual(connection.connection.info.backend_pid, backend_pid)
+        self.assertEqual(pool_module.pool_stats()['default']['opened'], opened)
\ No newline at end of file
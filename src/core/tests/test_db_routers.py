@@ -0,0 +1,182 @@
+# Database routing tests
+
+import time
+from unittest import mock, skipUnless
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.db_routers import PrimaryReplicaRouter, begin_request, end_request, read_from_primary, replica_reads
+from core.middleware import DatabaseRoutingMiddleware
+from features.user_management.services import UserManagementService
+
+User = get_user_model()
+
+@override_settings(DATABASE_REPLICAS=['replica_1', 'replica_2'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    """
+    Test routing decisions without touching a database
+    
+    Design Decision: Drive the router inside a fake request scope
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.request = RequestFactory().get('/api/v1/users/')
+
+    def begin(self):
+        self.addCleanup(end_request, begin_request(self.request))
+
+    def read(self):
+        return replica_reads(self.router.db_for_read)(User)
+
+    def test_opted_in_reads_use_one_replica_per_request(self):
+        self.begin()
+        replica = self.read()
+        
+        self.assertIn(replica, settings.DATABASE_REPLICAS)
+        self.assertEqual({self.read() for _ in range(10)}, {replica})
+    
+    def test_reads_not_opted_in_use_default_routing(self):
+        self.begin()
+        
+        self.assertIsNone(self.router.db_for_read(User))
+    
+    def test_reads_outside_a_request_use_default_routing(self):
+        self.assertIsNone(self.read())
+    
+    def test_writes_go_to_primary_and_pin_the_request(self):
+        self.begin()
+        self.assertIn(self.read(), settings.DATABASE_REPLICAS)
+        
+        self.assertEqual(self.router.db_for_write(User), 'default')
+        self.assertEqual(self.read(), 'default')
+    
+    def test_pin_cookie_keeps_reads_on_primary(self):
+        self.request.COOKIES[settings.REPLICA_PIN_COOKIE] = '1'
+        self.begin()
+        
+        self.assertEqual(self.read(), 'default')
+    
+    def test_pinned_user_reads_from_primary(self):
+        cache.set('db:pin:user:7', 1)
+        self.request.user = mock.Mock(pk=7, is_authenticated=True)
+        self.begin()
+        
+        self.assertEqual(self.read(), 'default')
+    
+    def test_read_from_primary_keeps_the_request_on_primary(self):
+        self.begin()
+        read_from_primary()
+        
+        self.assertEqual(self.read(), 'default')
+    
+    def test_lists_after_a_recent_write_are_read_from_primary(self):
+        """Test a replica cannot serve pre-write rows under the post-write ETag"""
+        self.begin()
+        UserManagementService()._build_list_validators(time.time_ns(), {})
+        
+        self.assertEqual(self.read(), 'default')
+    
+    def test_lists_long_after_a_write_use_replicas(self):
+        self.begin()
+        settled = time.time_ns() - (settings.REPLICA_PIN_SECONDS + 1) * 10 ** 9
+        UserManagementService()._build_list_validators(settled, {})
+        
+        self.assertIn(self.read(), settings.DATABASE_REPLICAS)
+    
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        self.begin()
+        
+        self.assertIsNone(self.read())
+
+@override_settings(DATABASE_REPLICAS=['replica_1'])
+class DatabaseRoutingMiddlewareTests(SimpleTestCase):
+    """
+    Test that a write pins the client for the next requests
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.user = mock.Mock(pk=7, is_authenticated=True)
+
+    def call(self, view):
+        def get_response(request):
+            view()
+            return HttpResponse()
+        
+        request = RequestFactory().get('/')
+        request.user = self.user
+        return DatabaseRoutingMiddleware(get_response)(request)
+
+    def test_write_sets_pin_cookie_and_cache_entry(self):
+        response = self.call(lambda: self.router.db_for_write(User))
+        
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+        self.assertTrue(cookie['httponly'])
+        self.assertIsNotNone(cache.get('db:pin:user:7'))
+    
+    def test_read_only_request_is_not_pinned(self):
+        response = self.call(lambda: replica_reads(self.router.db_for_read)(User))
+        
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        self.assertIsNone(cache.get('db:pin:user:7'))
+    
+    def test_reading_from_primary_does_not_pin_the_client(self):
+        response = self.call(read_from_primary)
+        
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+        self.assertIsNone(cache.get('db:pin:user:7'))
+
+def separate_replicas():
+    """Replica aliases that have their own test database"""
+    return [
+        alias for alias in settings.DATABASE_REPLICAS
+        if not settings.DATABASES[alias].get('TEST', {}).get('MIRROR')
+    ]
+
+@skipUnless(separate_replicas(), 'needs a replica alias with its own test database')
+class ReplicaRoutingIntegrationTests(TransactionTestCase):
+    """
+    Test routing against a real second database
+    
+    Design Decision: The replica never receives the primary's rows
+    - A 404 proves a read went to the replica, a 200 that it went to
+      the primary
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='reader@example.com',
+            username='reader@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = f'/api/v1/users/{self.user.id}/'
+
+    def test_detail_is_read_from_replica(self):
+        response = self.client.get(self.url)
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
+    def test_client_reads_its_own_writes(self):
+        response = self.client.patch(f'{self.url}update/', {'first_name': 'Ada'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        # Another client without the cookie is pinned through the cache
+        other = APIClient()
+        other.force_authenticate(user=self.user)
+        for client in (self.client, other):
+            response = client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['first_name'], 'Ada')
\ No newline at end of file
@@ -0,0 +1,228 @@
+# Metrics tests
+
+import json
+import os
+import tempfile
+import threading
+import time
+from django.contrib.auth import get_user_model
+from django.core.cache import cache, caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from core import metrics
+from core.cache import InstrumentedCacheMixin
+from features.authentication.hashers import get_hashing_executor
+
+User = get_user_model()
+
+
+def sample(text: str, line_start: str) -> float:
+    """Value of the first exposition line starting with line_start, 0 if absent"""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(' ', 1)[1])
+    return 0.0
+
+
+class MetricTests(TestCase):
+    """
+    Test sharded recording, merging across processes and the text format
+    """
+    
+    def test_counter_sums_every_thread(self):
+        counter = metrics.Counter('test_total', 'Test', ('kind',))
+        
+        def work():
+            for _ in range(1000):
+                counter.inc('a')
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc('b', amount=5)
+        
+        self.assertEqual(counter.samples(), {('a',): [4000], ('b',): [5]})
+    
+    def test_series_are_allocated_once(self):
+        histogram = metrics.Histogram('test_seconds', 'Test', ('view',), buckets=(0.1, 1.0))
+        histogram.observe(0.05, 'x')
+        values = histogram._values(('x',))
+        
+        histogram.observe(0.5, 'x')
+        histogram.observe(5.0, 'x')
+        
+        self.assertIs(histogram._values(('x',)), values)
+        self.assertEqual(values[:3], [1, 1, 1])
+        self.assertAlmostEqual(values[3], 5.55)
+    
+    def test_histogram_rendering_is_cumulative(self):
+        registry = metrics.Registry()
+        histogram = registry.register(metrics.Histogram('test_seconds', 'Test', ('view',), buckets=(0.1, 1.0)))
+        histogram.observe(0.05, 'x')
+        histogram.observe(0.5, 'x')
+        histogram.observe(5.0, 'x')
+        
+        text = metrics.render(metrics.merge_snapshots([registry.snapshot()]))
+        
+        self.assertIn('# TYPE test_seconds histogram', text)
+        self.assertIn('test_seconds_bucket{view="x",le="0.1"} 1', text)
+        self.assertIn('test_seconds_bucket{view="x",le="1.0"} 2', text)
+        self.assertIn('test_seconds_bucket{view="x",le="+Inf"} 3', text)
+        self.assertIn('test_seconds_count{view="x"} 3', text)
+        self.assertIn('test_seconds_sum{view="x"} 5.55', text)
+    
+    def test_label_values_are_escaped(self):
+        registry = metrics.Registry()
+        counter = registry.register(metrics.Counter('test_total', 'Test', ('view',)))
+        counter.inc('a"b\\c\nd')
+        
+        text = metrics.render(metrics.merge_snapshots([registry.snapshot()]))
+        
+        self.assertIn('test_total{view="a\\"b\\\\c\\nd"} 1', text)
+    
+    def test_snapshots_merge_and_drop_gauges_of_exited_workers(self):
+        def snapshot(pid, requests, in_flight):
+            return {'pid': pid, 'families': [
+                {'name': 'requests_total', 'kind': 'counter', 'help': 'R', 'samples': [[{'view': 'x'}, [requests]]]},
+                {'name': 'in_flight', 'kind': 'gauge', 'help': 'F', 'samples': [[{}, [in_flight]]]},
+            ]}
+        
+        text = metrics.render(metrics.merge_snapshots(
+            [snapshot(1, 3, 2), snapshot(2, 4, 5)], live_pids={1}
+        ))
+        
+        self.assertIn('requests_total{view="x"} 7', text)
+        self.assertIn('in_flight 2', text)
+    
+    def test_collect_reads_every_worker_snapshot(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # A worker that has exited: its counters stay, its gauges go
+            exited = metrics.registry.snapshot()
+            exited['pid'] = 2 ** 22 + 1
+            with open(os.path.join(directory, f"metrics-{exited['pid']}.json"), 'w') as snapshot:
+                json.dump(exited, snapshot)
+            metrics.http_requests_in_flight.inc()
+            try:
+                own = metrics.collect()
+                merged = metrics.collect(directory)
+            finally:
+                metrics.http_requests_in_flight.dec()
+            
+            self.assertTrue(os.path.exists(os.path.join(directory, f'metrics-{os.getpid()}.json')))
+        
+        self.assertEqual(sample(merged, 'http_requests_in_flight '), sample(own, 'http_requests_in_flight '))
+        self.assertIn(f'process_resident_memory_bytes{{pid="{os.getpid()}"}}', merged)
+
+
+class MetricsEndpointTests(TestCase):
+    """
+    Test /metrics output for API traffic
+    """
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+    
+    def scrape(self, **headers):
+        response = self.client.get('/metrics', **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+        return response.content.decode()
+    
+    def test_requests_are_recorded_by_view_and_status(self):
+        before = self.scrape()
+        self.client.get('/api/v1/users/')
+        self.client.get('/api/v1/users/999999/')
+        after = self.scrape()
+        
+        for line in (
+            'http_request_duration_seconds_count{view="user-list",status="200"}',
+            'http_request_duration_seconds_count{view="user-detail",status="404"}',
+        ):
+            self.assertEqual(sample(after, line) - sample(before, line), 1)
+        queries = 'db_queries_total{view="user-list"}'
+        self.assertGreaterEqual(sample(after, queries) - sample(before, queries), 1)
+        self.assertIn('db_request_duration_seconds_bucket{view="user-list",le="0.005"}', after)
+        # Only the scrape itself is in flight
+        self.assertEqual(sample(after, 'http_requests_in_flight '), 1)
+    
+    def test_cache_hits_and_misses_are_counted(self):
+        self.assertIsInstance(caches['default'], InstrumentedCacheMixin)
+        before = metrics.cache_requests.samples()
+        cache.set('present', None)
+        cache.get('present')
+        cache.get('absent')
+        cache.get_many(['present', 'absent', 'missing'])
+        after = metrics.cache_requests.samples()
+        
+        for result, expected in (('hit', 2), ('miss', 3)):
+            key = ('default', result)
+            self.assertEqual(after[key][0] - before.get(key, [0])[0], expected)
+        self.assertIn('cache_requests_total{cache="default",result="hit"}', self.scrape())
+    
+    def test_authentication_collectors_are_registered(self):
+        text = self.scrape()
+        
+        self.assertIn('password_hashing_tasks{state="queued"}', text)
+        self.assertIn('login_throttle_checks_total{limiter="ip",result="allowed"}', text)
+    
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_token_is_required_when_configured(self):
+        self.client.credentials()
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 401)
+        
+        self.scrape(HTTP_AUTHORIZATION='Bearer scrape-secret')
+    
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_endpoint_is_not_found(self):
+        response = self.client.get('/metrics')
+        
+        self.assertEqual(response.status_code, 404)
+    
+    @override_settings(METRICS_REQUIRE_TOKEN=True, METRICS_TOKEN='')
+    def test_endpoint_is_not_found_until_a_required_token_is_set(self):
+        response = self.client.get('/metrics')
+        
+        self.assertEqual(response.status_code, 404)
+        with override_settings(METRICS_TOKEN='scrape-secret'):
+            self.client.credentials()
+            self.scrape(HTTP_AUTHORIZATION='Bearer scrape-secret')
+
+
+class PasswordHashMetricsTests(TestCase):
+    """
+    Test hashing time is attributed to the request that waited for it
+    """
+    
+    def test_executor_time_is_added_to_the_current_request(self):
+        with metrics.track_password_hashing() as hashing:
+            get_hashing_executor().run(time.sleep, 0.02)
+            get_hashing_executor().run(time.sleep, 0.02)
+        
+        self.assertGreaterEqual(hashing[0], 0.04)
+    
+    def test_hashing_outside_a_request_is_ignored(self):
+        get_hashing_executor().run(time.sleep, 0)
+    
+    @override_settings(PASSWORD_HASHERS=['features.authentication.hashers.BoundedPBKDF2PasswordHasher'])
+    def test_login_hash_time_is_recorded(self):
+        User.objects.create_user(email='user@example.com', username='user@example.com', password='userpass123')
+        client = APIClient()
+        line = 'password_hash_duration_seconds_count{view="auth-login"}'
+        before = sample(client.get('/metrics').content.decode(), line)
+        
+        response = client.post('/api/v1/auth/login/', {'email': 'user@example.com', 'password': 'userpass123'})
+        
+        self.assertEqual(response.status_code, 200)
+        after = sample(client.get('/metrics').content.decode(), line)
+        self.assertEqual(after - before, 1)
\ No newline at end of file
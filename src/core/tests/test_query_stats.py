@@ -0,0 +1,92 @@
+# Query instrumentation tests
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.query_stats import QueryRecorder, view_query_stats
+from core.testing import QueryBudgetMixin
+
+User = get_user_model()
+
+class QueryInstrumentationMiddlewareTests(TestCase):
+    """
+    Test per-request recording, headers and per-view aggregates
+    """
+
+    def setUp(self):
+        cache.clear()
+        view_query_stats.reset()
+        self.user = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_request_queries_are_recorded(self):
+        response = self.client.get(f'/api/v1/users/{self.user.id}/')
+        
+        recorder = response.query_stats
+        self.assertGreaterEqual(recorder.count, 1)
+        self.assertIn('auth_user', recorder.slowest_sql)
+        self.assertEqual(len(recorder.statements), recorder.count)
+    
+    def test_headers_only_when_enabled(self):
+        response = self.client.get('/api/v1/users/')
+        self.assertNotIn('X-DB-Query-Count', response)
+        
+        with override_settings(QUERY_STATS_HEADERS=True):
+            response = self.client.get('/api/v1/users/')
+        
+        self.assertEqual(response['X-DB-Query-Count'], str(response.query_stats.count))
+        self.assertEqual(response['X-DB-Query-Budget'], '3')
+        self.assertTrue(response['Server-Timing'].startswith('db;dur='))
+        self.assertIn('SELECT', response['X-DB-Slowest-Query'])
+    
+    def test_views_are_aggregated_by_name(self):
+        self.client.get('/api/v1/users/')
+        self.client.get('/api/v1/users/')
+        
+        stats = view_query_stats.stats()['user-list']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['budget'], 3)
+        self.assertEqual(stats['over_budget'], 0)
+        self.assertGreaterEqual(stats['queries'], stats['queries_max'])
+    
+    def test_over_budget_requests_are_counted(self):
+        recorder = QueryRecorder()
+        for _ in range(4):
+            recorder.record('SELECT 1', 0.001)
+        
+        view_query_stats.add('user-list', recorder, budget=3)
+        
+        self.assertEqual(view_query_stats.stats()['user-list']['over_budget'], 1)
+
+class QueryBudgetMixinTests(QueryBudgetMixin, TestCase):
+    """
+    Test that the helper fails over budget and without a declared budget
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_fails_over_budget(self):
+        response = self.client.get('/api/v1/users/')
+        
+        with self.assertRaisesMessage(AssertionError, 'over its budget of 0'):
+            self.assertWithinQueryBudget(response, budget=0)
+    
+    def test_fails_without_declared_budget(self):
+        response = self.client.get('/api/v1/users/export/')
+        
+        with self.assertRaisesMessage(AssertionError, 'declares no query budget'):
+            self.assertWithinQueryBudget(response)
\ No newline at end of file
@@ -0,0 +1,30 @@
+# Core views
+# Decision: Plain Django views; DRF authentication and renderers would
+# add per-scrape work and the scraper has no user account
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from .metrics import collect
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint
+
+    Design Decision: Bearer token instead of user authentication
+    - Set METRICS_TOKEN when the endpoint is reachable from outside the
+      private network; without it the endpoint is open
+    - With METRICS_REQUIRE_TOKEN (the production default) the endpoint
+      does not exist until a token is configured
+    """
+    token = settings.METRICS_TOKEN
+    if not settings.METRICS_ENABLED or (settings.METRICS_REQUIRE_TOKEN and not token):
+        raise Http404
+    if token and not constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponse('Unauthorized\n', status=401, content_type='text/plain')
+    return HttpResponse(collect(settings.METRICS_DIR), content_type=CONTENT_TYPE)
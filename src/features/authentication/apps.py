@@ -14,6 +14,10 @@ class AuthenticationConfig(AppConfig):
         # Decision: Lazy import to avoid circular imports
         if self.is_enabled():
             from . import signals
+            from core.metrics import registry
+            from .metrics import login_throttle_collector, password_hashing_collector
+            registry.add_collector(password_hashing_collector)
+            registry.add_collector(login_throttle_collector)
 
     def is_enabled(self):
         """Check if authentication feature is enabled"""
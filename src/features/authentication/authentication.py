@@ -0,0 +1,44 @@
+# Authentication classes for the API
+# Decision: Extend simplejwt instead of replacing it so token validation
+# rules stay exactly the same
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .cache import user_cache
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that rebuilds request.user from the user cache
+
+    Design Decision: Only the user lookup is cached
+    - Tokens are still fully validated on every request
+    - Cache entries are dropped on User save/delete (see signals.py)
+    - Inactive users are never cached, so they always hit the database
+    """
+
+    def get_user(self, validated_token):
+        # Revocation checks compare against the password hash, which is
+        # deliberately kept out of the cache
+        if api_settings.CHECK_REVOKE_TOKEN or api_settings.USER_ID_FIELD != 'id':
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = user_cache.get(user_id)
+        if user is None:
+            user = super().get_user(validated_token)
+            user_cache.set(user)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
@@ -0,0 +1,162 @@
+# Authenticated user cache
+# Decision: Keep user snapshots in a per-process LRU backed by the shared
+# Django cache so JWT requests do not need a SELECT to rebuild request.user
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from core.cache import is_process_local
+from .models import User
+
+# Password hashes never leave the database; the field stays deferred
+SNAPSHOT_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields
+    if field.attname != 'password'
+)
+
+
+class UserSnapshotCache:
+    """
+    Two-tier cache of user field snapshots keyed by user id
+
+    Design Decision: Local LRU in front of the shared cache
+    - Local hits cost no network round-trip at all
+    - The shared cache (Redis in production) is warm for every worker
+    - Local entries expire after AUTH_USER_CACHE_LOCAL_TTL seconds, which
+      bounds how long other processes can serve a stale snapshot
+    - A process-local AUTH_USER_CACHE_ALIAS backend is not used as the
+      shared tier: invalidations would only reach the worker that wrote,
+      and the others would keep stale users for AUTH_USER_CACHE_TTL
+    """
+
+    key_prefix = 'auth:user:'
+
+    def __init__(self):
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared(self):
+        """The shared tier, or None when the configured backend is process-local"""
+        alias = settings.AUTH_USER_CACHE_ALIAS
+        return None if is_process_local(alias) else caches[alias]
+
+    def get(self, user_id) -> Optional[User]:
+        """Return a cached user instance or None on a miss"""
+        key = str(user_id)
+        snapshot = self._get_local(key)
+        if snapshot is None:
+            shared = self.shared
+            snapshot = shared.get(self.key_prefix + key) if shared is not None else None
+            if snapshot is None:
+                return None
+            self._set_local(key, snapshot)
+        # Same alias an uncached lookup reads from
+        return User.from_db(router.db_for_read(User), SNAPSHOT_FIELDS, snapshot)
+
+    def set(self, user: User):
+        """Store a snapshot of the given user in both tiers"""
+        key = str(user.pk)
+        snapshot = tuple(getattr(user, attname) for attname in SNAPSHOT_FIELDS)
+        shared = self.shared
+        if shared is not None:
+            shared.set(self.key_prefix + key, snapshot, settings.AUTH_USER_CACHE_TTL)
+        self._set_local(key, snapshot)
+
+    def invalidate(self, user_ids: Iterable):
+        """Drop the given users from both tiers"""
+        keys = [str(user_id) for user_id in user_ids]
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        shared = self.shared
+        if shared is not None:
+            shared.delete_many([self.key_prefix + key for key in keys])
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    def _get_local(self, key: str):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return snapshot
+
+    def _set_local(self, key: str, snapshot: tuple):
+        ttl = settings.AUTH_USER_CACHE_LOCAL_TTL
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._local[key] = (time.monotonic() + ttl, snapshot)
+            self._local.move_to_end(key)
+            while len(self._local) > settings.AUTH_USER_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+
+class CollectionVersion:
+    """
+    Version stamp for a whole collection, shared through the Django cache
+
+    Design Decision: Nanosecond timestamps instead of a counter
+    - A bump is a single cache.set, with no read-modify-write race
+    - If the key is evicted the next read starts a new version, which
+      only costs clients one full response
+    - Only usable when every worker shares the cache; with a
+      process-local backend a bump would reach a single worker
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+
+    @property
+    def shared(self):
+        return caches[settings.AUTH_USER_CACHE_ALIAS]
+
+    @property
+    def available(self) -> bool:
+        """Whether every worker sees the same version"""
+        return not is_process_local(settings.AUTH_USER_CACHE_ALIAS)
+
+    def get(self) -> int:
+        version = self.shared.get(self.key)
+        if version is None:
+            self.shared.add(self.key, time.time_ns(), None)
+            version = self.shared.get(self.key)
+        # Without a working cache every request gets a fresh version
+        return version or time.time_ns()
+
+    async def aget(self) -> int:
+        version = await self.shared.aget(self.key)
+        if version is None:
+            await self.shared.aadd(self.key, time.time_ns(), None)
+            version = await self.shared.aget(self.key)
+        return version or time.time_ns()
+
+    def bump(self):
+        """
+        Start a new version now and again once the transaction commits
+
+        The second bump stops readers that saw the new version before the
+        commit from pinning a validator to the old rows.
+        """
+        self._set()
+        transaction.on_commit(self._set)
+
+    def _set(self):
+        self.shared.set(self.key, time.time_ns(), None)
+
+
+user_cache = UserSnapshotCache()
+# Bumped by every write to the user table; validates cached user lists
+user_versions = CollectionVersion('auth:users:version')
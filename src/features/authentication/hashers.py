@@ -0,0 +1,176 @@
+# Password hashing
+# Decision: Run password hashing on a bounded executor so a login burst
+# cannot occupy every request thread with ~300 ms of PBKDF2 work
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from core.metrics import observe_password_hash
+
+_local = threading.local()
+
+
+class HashingCapacityExceeded(Exception):
+    """Raised when the hashing executor cannot admit more work"""
+
+
+class PasswordHashingExecutor:
+    """
+    Bounded executor for password hashing
+
+    Design Decision: Thread pool with an admission limit
+    - hashlib.pbkdf2_hmac and argon2 release the GIL, so threads give
+      real parallelism without the cost of pickling into a process pool
+    - At most max_workers hashes run at once; max_queue more may wait
+    - Anything beyond that is rejected after queue_timeout seconds so
+      the caller can answer 503 instead of piling up requests
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='password-hashing',
+            initializer=self._mark_worker_thread,
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._bulk_lock = threading.Lock()
+        self._admitted = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_seconds = 0.0
+        self._hash_seconds_max = 0.0
+        self._wait_seconds = 0.0
+
+    @staticmethod
+    def _mark_worker_thread():
+        _local.in_pool = True
+
+    def run(self, fn, *args, **kwargs):
+        """
+        Run fn on the pool and wait for its result
+
+        Raises:
+            HashingCapacityExceeded: if no slot frees up within queue_timeout
+        """
+        # Nested calls (e.g. verify() calling encode()) run inline
+        if getattr(_local, 'in_pool', False):
+            return fn(*args, **kwargs)
+
+        # Time spent queueing counts towards the request's hashing time
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            observe_password_hash(time.perf_counter() - started)
+            raise HashingCapacityExceeded('Password hashing capacity exceeded')
+
+        with self._lock:
+            self._admitted += 1
+        try:
+            future = self._pool.submit(self._call, fn, args, kwargs, time.perf_counter())
+            return future.result()
+        finally:
+            with self._lock:
+                self._admitted -= 1
+            self._slots.release()
+            observe_password_hash(time.perf_counter() - started)
+
+    def map(self, fn, items) -> list:
+        """
+        Apply fn to every item, waiting for capacity instead of rejecting
+
+        Design Decision: Bulk callers (imports) are throughput jobs, so
+        they submit at most max_workers items at a time and block rather
+        than fail, leaving the remaining slots for interactive logins
+        """
+        items = list(items)
+        results = []
+        for start in range(0, len(items), self.max_workers):
+            window = items[start:start + self.max_workers]
+            # One bulk caller collects slots at a time to avoid two
+            # callers each holding half a window and waiting forever
+            with self._bulk_lock:
+                for _ in window:
+                    self._slots.acquire()
+            with self._lock:
+                self._admitted += len(window)
+            try:
+                futures = [
+                    self._pool.submit(self._call, fn, (item,), {}, time.perf_counter())
+                    for item in window
+                ]
+                results.extend(future.result() for future in futures)
+            finally:
+                with self._lock:
+                    self._admitted -= len(window)
+                for _ in window:
+                    self._slots.release()
+        return results
+
+    def _call(self, fn, args, kwargs, enqueued_at):
+        started = time.perf_counter()
+        with self._lock:
+            self._running += 1
+            self._wait_seconds += started - enqueued_at
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._hash_seconds += elapsed
+                self._hash_seconds_max = max(self._hash_seconds_max, elapsed)
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth and latency counters"""
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'queued': max(self._admitted - self._running, 0),
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'hash_seconds_total': self._hash_seconds,
+                'hash_seconds_max': self._hash_seconds_max,
+                'wait_seconds_total': self._wait_seconds,
+            }
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor() -> PasswordHashingExecutor:
+    """Return the process-wide executor, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = PasswordHashingExecutor(
+                    max_workers=settings.PASSWORD_HASHING_WORKERS or os.cpu_count() or 2,
+                    max_queue=settings.PASSWORD_HASHING_QUEUE_SIZE,
+                    queue_timeout=settings.PASSWORD_HASHING_QUEUE_TIMEOUT,
+                )
+    return _executor
+
+
+class BoundedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2 hasher that runs on the bounded hashing executor
+
+    Keeps the 'pbkdf2_sha256' algorithm name, so existing hashes verify
+    unchanged. verify() and harden_runtime() both go through encode().
+    """
+
+    def encode(self, password, salt, iterations=None):
+        return get_hashing_executor().run(super().encode, password, salt, iterations)
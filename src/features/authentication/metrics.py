@@ -0,0 +1,29 @@
+# Authentication metrics
+# Decision: Expose the counters the hashing executor and login throttle
+# already keep, read at scrape time instead of updated per request
+
+from .hashers import get_hashing_executor
+from .throttling import get_login_throttle
+
+
+def password_hashing_collector() -> list:
+    stats = get_hashing_executor().stats()
+    return [
+        ('password_hashing_tasks', 'gauge', 'Hashing executor tasks by state', [
+            ({'state': 'running'}, stats['running']),
+            ({'state': 'queued'}, stats['queued']),
+        ]),
+        ('password_hashing_rejected_total', 'counter', 'Hashes refused because the executor was full', [
+            ({}, stats['rejected']),
+        ]),
+    ]
+
+
+def login_throttle_collector() -> list:
+    stats = get_login_throttle().stats()
+    return [(
+        'login_throttle_checks_total', 'counter', 'Login throttle checks by limiter and result', [
+            ({'limiter': limiter, 'result': result}, stats[limiter][result])
+            for limiter in ('ip', 'account') for result in ('allowed', 'rejected')
+        ],
+    )]
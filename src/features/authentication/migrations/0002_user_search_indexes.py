@@ -0,0 +1,39 @@
+# Trigram indexes backing user search on PostgreSQL
+# Decision: Index UPPER(column) so the same index serves icontains
+# (UPPER(col) LIKE UPPER(%term%)) and the pg_trgm similarity operator
+
+from django.db import migrations
+
+SEARCH_COLUMNS = ('email', 'first_name', 'last_name')
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for column in SEARCH_COLUMNS:
+        # CONCURRENTLY avoids locking auth_user against writes while building
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS auth_user_{column}_trgm_idx '
+            f'ON auth_user USING gin (UPPER("{column}") gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for column in SEARCH_COLUMNS:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS auth_user_{column}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,86 @@
+# Indexes for the user list, admin filters and case-insensitive email
+# Decision: Build them CONCURRENTLY on PostgreSQL so auth_user stays
+# writable while they are created; the model state matches User.Meta
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import Lower
+import features.authentication.models
+
+INDEXES = [
+    models.Index(fields=['-date_joined', '-id'], name='auth_user_joined_idx'),
+    models.Index(fields=['-date_joined', '-id'], condition=Q(is_active=True), name='auth_user_active_joined_idx'),
+    models.Index(fields=['-date_joined', '-id'], condition=Q(is_email_verified=True), name='auth_user_verified_joined_idx'),
+    models.Index(fields=['id'], condition=Q(is_staff=True), name='auth_user_staff_idx'),
+]
+EMAIL_LOWER = models.UniqueConstraint(Lower('email'), name='auth_user_email_lower_uniq')
+
+
+def check_case_duplicates(User):
+    duplicates = list(
+        User.objects.annotate(email_lower=Lower('email')).values('email_lower')
+        .annotate(accounts=Count('id')).filter(accounts__gt=1)
+        .values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise ValueError(
+            'Merge or rename accounts whose emails differ only in case before '
+            f'migrating: {", ".join(duplicates)}'
+        )
+
+
+def create_indexes(apps, schema_editor):
+    User = apps.get_model('authentication', 'User')
+    check_case_duplicates(User)
+    concurrently = schema_editor.connection.vendor == 'postgresql'
+    for index in INDEXES:
+        if concurrently:
+            schema_editor.add_index(User, index, concurrently=True)
+        else:
+            schema_editor.add_index(User, index)
+    if concurrently:
+        qn = schema_editor.quote_name
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY {qn(EMAIL_LOWER.name)} '
+            f'ON {qn(User._meta.db_table)} (LOWER({qn("email")}))'
+        )
+    else:
+        schema_editor.add_constraint(User, EMAIL_LOWER)
+
+
+def drop_indexes(apps, schema_editor):
+    User = apps.get_model('authentication', 'User')
+    if schema_editor.connection.vendor == 'postgresql':
+        for name in [index.name for index in INDEXES] + [EMAIL_LOWER.name]:
+            schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}')
+        return
+    for index in INDEXES:
+        schema_editor.remove_index(User, index)
+    schema_editor.remove_constraint(User, EMAIL_LOWER)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('authentication', '0002_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', features.authentication.models.UserManager()),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+            state_operations=[
+                *[migrations.AddIndex(model_name='user', index=index) for index in INDEXES],
+                migrations.AddConstraint(model_name='user', constraint=EMAIL_LOWER),
+            ],
+        ),
+    ]
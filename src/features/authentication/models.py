@@ -2,8 +2,67 @@
 # Decision: Custom user model with email as username for better UX
 # Following Django best practices for user authentication
 
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as DjangoUserManager
+from django.contrib.auth.hashers import make_password
 from django.db import models
+from django.db.models import Q, Value
+from django.db.models.functions import Lower
+
+class UserQuerySet(models.QuerySet):
+    """
+    User queries
+    
+    Design Decision: Compare emails as LOWER(email)
+    - Matches the functional unique index, so case-insensitive lookups
+      are index scans (email__iexact compiles to UPPER() and would not be)
+    """
+
+    def with_email(self, email: str):
+        """Users whose email equals email, ignoring case"""
+        return self.alias(email_lower=Lower('email')).filter(email_lower=Lower(Value(email)))
+
+    def with_emails(self, emails):
+        """Users whose email is one of emails, ignoring case"""
+        return self.alias(email_lower=Lower('email')).filter(
+            email_lower__in={email.lower() for email in emails}
+        )
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
+    """
+    User manager keyed by email
+    
+    Design Decision: Email is the natural key, matched case-insensitively
+    - Login (ModelBackend) and duplicate checks treat Foo@x.com and
+      foo@x.com as the same account
+    - The username defaults to the normalized email, as in registration
+    """
+
+    def get_by_natural_key(self, username):
+        return self.with_email(username).get()
+
+    def _create_user(self, email, password, **extra_fields):
+        if not email:
+            raise ValueError('The email address must be set')
+        email = self.normalize_email(email)
+        username = self.model.normalize_username(extra_fields.pop('username', None) or email)
+        user = self.model(email=email, username=username, **extra_fields)
+        user.password = make_password(password)
+        user.save(using=self._db)
+        return user
+
+    def create_user(self, email=None, password=None, **extra_fields):
+        extra_fields.setdefault('is_staff', False)
+        extra_fields.setdefault('is_superuser', False)
+        return self._create_user(email, password, **extra_fields)
+
+    def create_superuser(self, email=None, password=None, **extra_fields):
+        extra_fields.setdefault('is_staff', True)
+        extra_fields.setdefault('is_superuser', True)
+        if extra_fields.get('is_staff') is not True:
+            raise ValueError('Superuser must have is_staff=True.')
+        if extra_fields.get('is_superuser') is not True:
+            raise ValueError('Superuser must have is_superuser=True.')
+        return self._create_user(email, password, **extra_fields)
 
 class User(AbstractUser):
     """
@@ -25,5 +84,26 @@ class User(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']
 
+    objects = UserManager()
+
     class Meta:
-        db_table = 'auth_user'
\ No newline at end of file
+        db_table = 'auth_user'
+        # Decision: Indexes follow the queries that run (migration 0003)
+        # - Lists and the admin order by date_joined DESC, id DESC
+        # - Partial indexes keep the active, verified and staff subsets
+        #   ordered without indexing every row for each flag
+        indexes = [
+            models.Index(fields=['-date_joined', '-id'], name='auth_user_joined_idx'),
+            models.Index(
+                fields=['-date_joined', '-id'], condition=Q(is_active=True),
+                name='auth_user_active_joined_idx'
+            ),
+            models.Index(
+                fields=['-date_joined', '-id'], condition=Q(is_email_verified=True),
+                name='auth_user_verified_joined_idx'
+            ),
+            models.Index(fields=['id'], condition=Q(is_staff=True), name='auth_user_staff_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(Lower('email'), name='auth_user_email_lower_uniq'),
+        ]
\ No newline at end of file
@@ -1,10 +1,17 @@
 # Authentication services for business logic
 # Decision: Separate business logic from views for better testability and reusability
 
-from typing import Optional
+from typing import List, Optional
+from django.conf import settings
 from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.tokens import default_token_generator
 from django.core.mail import send_mail
+from django.db import transaction
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from .cache import user_versions
+from .hashers import get_hashing_executor
 from .models import User
 
 class AuthenticationService:
@@ -29,17 +36,68 @@ class AuthenticationService:
         Returns:
             Created User instance
         """
-        user = User.objects.create_user(
-            email=email,
-            username=email,  # Use email as username
-            password=password,
-            **extra_fields
+        # Decision: The user and its verification email commit together
+        with transaction.atomic():
+            user = User.objects.create_user(
+                email=email,
+                username=email,  # Use email as username
+                password=password,
+                **extra_fields
+            )
+            
+            # Send verification email
+            self._send_verification_email(user)
+        
+        return user
+
+    def build_user(self, email: str, **extra_fields) -> User:
+        """
+        Build an unsaved user following the registration rules
+        
+        Mirrors create_user(): normalized email doubling as the username.
+        """
+        email = User.objects.normalize_email(email)
+        return User(email=email, username=User.normalize_username(email), **extra_fields)
+
+    def register_users(self, registrations: List[dict], batch_size: int = 500) -> List[User]:
+        """
+        Register many users at once
+        
+        Design Decision: Same rules as register_user, batched I/O
+        - Passwords are hashed in parallel on the hashing executor
+        - Users are written with one bulk INSERT per batch
+        - Profiles are provisioned in bulk because bulk_create
+          does not send post_save
+        
+        Args:
+            registrations: Dicts with email, password and extra user fields
+            batch_size: Rows per INSERT statement
+            
+        Returns:
+            Created User instances (with primary keys)
+        """
+        users = []
+        for registration in registrations:
+            extra_fields = dict(registration)
+            email = extra_fields.pop('email')
+            extra_fields.pop('password')
+            users.append(self.build_user(email, **extra_fields))
+        
+        hashes = get_hashing_executor().map(
+            make_password, [registration['password'] for registration in registrations]
         )
+        for user, password_hash in zip(users, hashes):
+            user.password = password_hash
         
-        # Send verification email
-        self._send_verification_email(user)
+        from .signals import create_user_profiles
+        with transaction.atomic():
+            created = User.objects.bulk_create(users, batch_size=batch_size)
+            create_user_profiles(created)
+            self._queue_verification_emails(created)
+            # bulk_create skips post_save, so move the list version by hand
+            user_versions.bump()
         
-        return user
+        return created
 
     def authenticate_user(self, email: str, password: str) -> Optional[User]:
         """
@@ -65,14 +123,51 @@ class AuthenticationService:
             True if email was sent successfully
         """
         try:
-            user = User.objects.get(email=email)
-            token = default_token_generator.make_token(user)
-            # Implementation depends on notification feature
-            return True
+            user = User.objects.with_email(email).get()
         except User.DoesNotExist:
             return False
+        
+        service = self._get_notification_service()
+        if service:
+            from features.notifications.services import TEMPLATE_PASSWORD_RESET
+            service.enqueue(
+                TEMPLATE_PASSWORD_RESET, user.email, self._email_context(user, 'reset_url', 'reset-password')
+            )
+        return True
 
     def _send_verification_email(self, user: User):
-        """Send email verification - placeholder for notification feature"""
-        # Implementation depends on notification feature
-        pass
\ No newline at end of file
+        """Queue the verification email (delivered by `manage.py run_outbox`)"""
+        self._queue_verification_emails([user])
+
+    def _queue_verification_emails(self, users: List[User]):
+        """Queue verification emails for many users with one INSERT"""
+        service = self._get_notification_service()
+        if not service or not users:
+            return
+        
+        from features.notifications.services import TEMPLATE_EMAIL_VERIFICATION
+        service.enqueue_many(
+            (TEMPLATE_EMAIL_VERIFICATION, user.email, self._email_context(user, 'verify_url', 'verify-email'))
+            for user in users
+        )
+
+    def _get_notification_service(self):
+        """
+        Return the notification service when the feature is enabled
+        
+        Design Decision: Lazy import keeps authentication usable without
+        the notifications app installed
+        """
+        if not settings.ENABLED_FEATURES.get('notifications', False):
+            return None
+        from features.notifications.services import NotificationService
+        return NotificationService()
+
+    def _email_context(self, user: User, link_name: str, path: str) -> dict:
+        """Template context with a signed one-time link for the frontend"""
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        token = default_token_generator.make_token(user)
+        return {
+            'first_name': user.first_name,
+            link_name: f'{settings.FRONTEND_URL}/{path}/{uid}/{token}/',
+        }
\ No newline at end of file
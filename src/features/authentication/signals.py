@@ -1,25 +1,56 @@
 # Authentication signals
 # Decision: Use Django signals for loose coupling between features
 
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from .cache import user_cache, user_versions
 
 User = get_user_model()
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    """
+    Drop the cached snapshot whenever a user changes, and start a new
+    user list version
+    
+    Design Decision: Invalidate now and again after commit
+    - Immediate invalidation locks out deactivated users right away
+    - The on_commit pass removes snapshots re-cached by concurrent
+      requests that read the row before the transaction committed
+    """
+    user_cache.invalidate([instance.pk])
+    transaction.on_commit(lambda: user_cache.invalidate([instance.pk]))
+    user_versions.bump()
+
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     """
     Create user profile when user is created
     
     Design Decision: Only create profile if profile_management feature is enabled
+    - Updates return before any other work
+    - A single idempotent INSERT ... SELECT replaces get_or_create's
+      SELECT + INSERT
+    """
+    if created:
+        create_user_profiles([instance])
+
+def create_user_profiles(users):
+    """
+    Create missing profiles for the given users in one statement
+    
+    Design Decision: Same path for single and bulk registration
+    - bulk_create does not send post_save, so bulk paths call this directly
     """
     from django.conf import settings
     
-    if created and settings.ENABLED_FEATURES.get('profile_management', False):
+    if users and settings.ENABLED_FEATURES.get('profile_management', False):
         try:
             from features.user_management.models import UserProfile
-            UserProfile.objects.get_or_create(user=instance)
+            UserProfile.objects.provision_missing([user.pk for user in users])
         except ImportError:
             # Profile feature not available
             pass
\ No newline at end of file
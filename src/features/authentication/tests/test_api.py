@@ -6,10 +6,11 @@ from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from core.testing import QueryBudgetMixin
 
 User = get_user_model()
 
-class AuthenticationAPITests(TestCase):
+class AuthenticationAPITests(QueryBudgetMixin, TestCase):
     """
     Test authentication API endpoints
     
@@ -39,6 +40,7 @@ class AuthenticationAPITests(TestCase):
         self.assertEqual(response.data['user']['email'], 'newuser@example.com')
         self.assertIn('access', response.data['tokens'])
         self.assertIn('refresh', response.data['tokens'])
+        self.assertWithinQueryBudget(response)
 
     def test_user_registration_invalid_data(self):
         """Test registration with invalid data"""
@@ -72,6 +74,7 @@ class AuthenticationAPITests(TestCase):
         self.assertIn('user', response.data)
         self.assertIn('tokens', response.data)
         self.assertEqual(response.data['user']['email'], 'test@example.com')
+        self.assertWithinQueryBudget(response)
 
     def test_user_login_invalid_credentials(self):
         """Test login with invalid credentials"""
@@ -112,4 +115,23 @@ class AuthenticationAPITests(TestCase):
         response = self.client.post('/api/v1/auth/password-reset/', data)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('message', response.data)
\ No newline at end of file
+        self.assertIn('message', response.data)
+
+    def test_user_login_ignores_email_case(self):
+        """Test login matches the account whatever the letter case of the email"""
+        User.objects.create_user(email='Test@Example.com', password='testpass123')
+        
+        response = self.client.post('/api/v1/auth/login/', {'email': 'test@EXAMPLE.com', 'password': 'testpass123'})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['user']['email'], 'Test@example.com')
+        self.assertWithinQueryBudget(response)
+    
+    def test_user_registration_rejects_email_in_other_case(self):
+        """Test an email registered in another letter case is a duplicate"""
+        User.objects.create_user(email='test@example.com', password='testpass123')
+        
+        response = self.client.post('/api/v1/auth/register/', {'email': 'TEST@example.com', 'password': 'testpass123'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['email'], ['A user with this email already exists.'])
\ No newline at end of file
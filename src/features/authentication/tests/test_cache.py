@@ -0,0 +1,96 @@
+# Authenticated user cache tests
+
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.testing import shared_cache
+from ..cache import user_cache
+
+User = get_user_model()
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """
+    Test JWT authentication backed by the user snapshot cache
+    
+    Design Decision: Assert on query counts
+    - The point of the cache is one fewer round-trip per request
+    - Invalidation must lock deactivated users out immediately
+    """
+
+    def setUp(self):
+        user_cache.clear_local()
+        self.user = User.objects.create_user(
+            email='cached@example.com',
+            username='cached@example.com',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        refresh = RefreshToken.for_user(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_second_request_skips_user_query(self):
+        """Test authenticated requests reuse the cached user"""
+        url = f'/api/v1/users/{self.user.id}/'
+        
+        with self.assertNumQueries(2):  # auth lookup + detail
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        with self.assertNumQueries(1):  # detail only
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_shared_tier_serves_other_processes(self):
+        """Test a cold local tier falls back to the shared cache"""
+        with shared_cache('AUTH_USER_CACHE_ALIAS'):
+            self.client.get(f'/api/v1/users/{self.user.id}/')
+            user_cache.clear_local()
+            
+            cached = user_cache.get(self.user.id)
+        
+        self.assertIsNotNone(cached)
+        self.assertEqual(cached.email, 'cached@example.com')
+        self.assertNotIn('password', cached.__dict__)
+        self.assertEqual(cached._state.db, 'default')
+
+    def test_process_local_cache_is_not_a_shared_tier(self):
+        """Test the local-memory cache is skipped, since other workers never see its invalidations"""
+        self.client.get(f'/api/v1/users/{self.user.id}/')
+        user_cache.clear_local()
+        
+        self.assertIsNone(user_cache.shared)
+        self.assertIsNone(user_cache.get(self.user.id))
+
+    def test_shared_tier_invalidation(self):
+        """Test saving a user drops its shared entry, not just the local one"""
+        with shared_cache('AUTH_USER_CACHE_ALIAS'):
+            self.client.get(f'/api/v1/users/{self.user.id}/')
+            
+            self.user.is_active = False
+            self.user.save()
+            user_cache.clear_local()
+            
+            self.assertIsNone(user_cache.get(self.user.id))
+
+    def test_deactivated_user_locked_out_immediately(self):
+        """Test saving a user invalidates the cached snapshot"""
+        self.client.get(f'/api/v1/users/{self.user.id}/')
+        
+        self.user.is_active = False
+        self.user.save()
+        
+        response = self.client.get(f'/api/v1/users/{self.user.id}/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_bulk_deactivation_invalidates_cache(self):
+        """Test bulk updates also drop cached users"""
+        self.client.get(f'/api/v1/users/{self.user.id}/')
+        
+        from features.user_management.services import UserManagementService
+        UserManagementService().bulk_operation([self.user.id], 'deactivate')
+        
+        response = self.client.get(f'/api/v1/users/{self.user.id}/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
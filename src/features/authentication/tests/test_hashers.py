@@ -0,0 +1,138 @@
+# Password hashing executor tests
+
+import os
+import runpy
+import threading
+from unittest import mock
+from django.conf import settings
+from django.test import TestCase, SimpleTestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APIClient
+from ..hashers import (
+    BoundedPBKDF2PasswordHasher, HashingCapacityExceeded, PasswordHashingExecutor
+)
+
+User = get_user_model()
+
+class FastBoundedHasher(BoundedPBKDF2PasswordHasher):
+    """Cheap iteration count to keep the test suite fast"""
+    iterations = 1000
+
+class PasswordHashingExecutorTests(SimpleTestCase):
+    """
+    Test the bounded hashing executor
+    
+    Design Decision: Block workers on events instead of sleeping
+    - Deterministic saturation without timing flakiness
+    """
+
+    def test_rejects_when_full(self):
+        """Test work beyond workers + queue is rejected quickly"""
+        executor = PasswordHashingExecutor(max_workers=1, max_queue=0, queue_timeout=0.01)
+        started, release = threading.Event(), threading.Event()
+        
+        def slow_hash():
+            started.set()
+            release.wait(5)
+            return 'hash'
+        
+        worker = threading.Thread(target=executor.run, args=(slow_hash,))
+        worker.start()
+        started.wait(5)
+        
+        with self.assertRaises(HashingCapacityExceeded):
+            executor.run(lambda: 'other')
+        self.assertEqual(executor.stats()['rejected'], 1)
+        self.assertEqual(executor.stats()['running'], 1)
+        
+        release.set()
+        worker.join(5)
+        self.assertEqual(executor.run(lambda: 'next'), 'next')
+        self.assertEqual(executor.stats()['completed'], 2)
+
+    def test_map_preserves_order(self):
+        """Test bulk hashing returns results in input order"""
+        executor = PasswordHashingExecutor(max_workers=2, max_queue=0, queue_timeout=0.01)
+        
+        self.assertEqual(executor.map(lambda value: value * 2, range(5)), [0, 2, 4, 6, 8])
+
+    def test_hasher_round_trip(self):
+        """Test bounded hasher output verifies with the same algorithm"""
+        hasher = FastBoundedHasher()
+        encoded = hasher.encode('testpass123', hasher.salt())
+        
+        self.assertTrue(encoded.startswith('pbkdf2_sha256$1000$'))
+        self.assertTrue(hasher.verify('testpass123', encoded))
+        self.assertFalse(hasher.verify('wrongpass', encoded))
+
+class HashingBackPressureAPITests(TestCase):
+    """Test login and register answer 503 when hashing is saturated"""
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_login_returns_503_when_busy(self):
+        with mock.patch(
+            'features.authentication.services.AuthenticationService.authenticate_user',
+            side_effect=HashingCapacityExceeded
+        ):
+            response = self.client.post('/api/v1/auth/login/', {
+                'email': 'test@example.com',
+                'password': 'testpass123'
+            })
+        
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_register_returns_503_when_busy(self):
+        with mock.patch(
+            'features.authentication.services.AuthenticationService.register_user',
+            side_effect=HashingCapacityExceeded
+        ):
+            response = self.client.post('/api/v1/auth/register/', {
+                'email': 'new@example.com',
+                'password': 'testpass123'
+            })
+        
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertFalse(User.objects.filter(email='new@example.com').exists())
+
+class GunicornHashingConfigTests(SimpleTestCase):
+    """
+    Test the default WSGI server shape lets the hashing limit take effect
+    
+    Design Decision: Load gunicorn.conf.py itself
+    - A sync worker serves one request at a time, so its queue could
+      never fill and the 503 path would never fire
+    """
+
+    def load(self, **environ):
+        environ = {'SERVER_MODE': 'wsgi', 'METRICS_DIR': '', **environ}
+        with mock.patch.dict(os.environ, environ):
+            for name in ('PASSWORD_HASHING_WORKERS', 'PASSWORD_HASHING_QUEUE_SIZE'):
+                os.environ.pop(name, None)
+            config = runpy.run_path(str(settings.BASE_DIR.parent / 'gunicorn.conf.py'))
+            slots = int(os.environ['PASSWORD_HASHING_WORKERS']) + int(os.environ['PASSWORD_HASHING_QUEUE_SIZE'])
+        return config, slots
+
+    def test_workers_are_threaded(self):
+        config, _ = self.load()
+        
+        self.assertEqual(config['worker_class'], 'gthread')
+        self.assertGreater(config['threads'], 1)
+
+    def test_hashing_cannot_take_every_thread(self):
+        for cpus in (1, 8, 64):
+            for threads in ('2', '4', '16'):
+                with mock.patch('multiprocessing.cpu_count', return_value=cpus):
+                    config, slots = self.load(WEB_CONCURRENCY='1', GUNICORN_THREADS=threads)
+                
+                self.assertGreaterEqual(slots, 1)
+                self.assertLess(slots, config['threads'])
+
+    def test_explicit_settings_win(self):
+        with mock.patch.dict(os.environ, {'PASSWORD_HASHING_WORKERS': '3', 'PASSWORD_HASHING_QUEUE_SIZE': '5'}):
+            runpy.run_path(str(settings.BASE_DIR.parent / 'gunicorn.conf.py'))
+            
+            self.assertEqual(os.environ['PASSWORD_HASHING_QUEUE_SIZE'], '5')
\ No newline at end of file
@@ -0,0 +1,79 @@
+# User index tests
+# Decision: Assert on PostgreSQL query plans with sequential scans
+# disabled, so a query that no index can serve shows up as a Seq Scan
+# however small the test table is
+
+from datetime import timedelta
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+User = get_user_model()
+
+@skipUnless(connection.vendor == 'postgresql', 'EXPLAIN plans are PostgreSQL specific')
+class UserIndexPlanTests(TestCase):
+    """
+    Test the main user queries are index scans
+
+    Design Decision: Name the expected index where only one fits
+    - Guards against a query being rewritten so the index no longer applies
+    """
+
+    def setUp(self):
+        User.objects.create_user(email='user@example.com', password='testpass123')
+        with connection.cursor() as cursor:
+            # Lasts until the test's transaction is rolled back
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertIndexScan(self, queryset, index=None):
+        plan = queryset.explain()
+        self.assertNotIn('Seq Scan', plan, plan)
+        if index is not None:
+            self.assertIn(index, plan, plan)
+
+    def test_user_list_order(self):
+        """Test list pages read the (date_joined DESC, id DESC) index in order"""
+        queryset = User.objects.order_by('-date_joined', '-id')
+
+        self.assertIndexScan(queryset[:21], 'auth_user_joined_idx')
+        self.assertIndexScan(queryset[100:121], 'auth_user_joined_idx')
+
+    def test_user_list_cursor_page(self):
+        """Test keyset pages seek into the list index"""
+        joined = timezone.now() - timedelta(days=1)
+        queryset = User.objects.filter(
+            Q(date_joined__lt=joined) | Q(date_joined=joined, id__lt=1000)
+        ).order_by('-date_joined', '-id')
+
+        self.assertIndexScan(queryset[:21], 'auth_user_joined_idx')
+
+    def test_login_lookup(self):
+        """Test case-insensitive login uses the LOWER(email) unique index"""
+        self.assertIndexScan(User.objects.with_email('USER@example.com'), 'auth_user_email_lower_uniq')
+
+    def test_duplicate_checks(self):
+        """Test registration, update and import duplicate checks use the LOWER(email) index"""
+        self.assertIndexScan(
+            User.objects.with_email('user@example.com').exclude(id=1), 'auth_user_email_lower_uniq'
+        )
+        self.assertIndexScan(
+            User.objects.with_emails(['a@example.com', 'B@example.com']), 'auth_user_email_lower_uniq'
+        )
+
+    def test_admin_filters(self):
+        """Test the admin's flag filters with its date_joined ordering use the partial indexes"""
+        ordering = ('-date_joined', '-id')
+
+        self.assertIndexScan(User.objects.filter(is_active=True).order_by(*ordering)[:100])
+        self.assertIndexScan(
+            User.objects.filter(is_email_verified=True).order_by(*ordering)[:100],
+            'auth_user_verified_joined_idx'
+        )
+        self.assertIndexScan(User.objects.filter(is_staff=True), 'auth_user_staff_idx')
+
+    def test_bulk_operation_batch(self):
+        """Test bulk jobs find the users to change by primary key"""
+        self.assertIndexScan(User.objects.filter(id__in=[1, 2, 3]).exclude(is_active=False))
\ No newline at end of file
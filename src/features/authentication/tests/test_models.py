@@ -63,4 +63,26 @@ class UserModelTests(TestCase):
         )
         
         # Should use email for string representation
-        self.assertEqual(str(user), 'test@example.com')
\ No newline at end of file
+        self.assertEqual(str(user), 'test@example.com')
+
+    def test_email_uniqueness_ignores_case(self):
+        """Test the LOWER(email) unique index rejects emails differing only in case"""
+        User.objects.create_user(email='test@example.com', password='testpass123')
+        
+        with self.assertRaises(IntegrityError):
+            User.objects.create_user(email='Test@example.com', password='testpass123')
+
+    def test_create_user_defaults_username_to_email(self):
+        """Test the username follows the normalized email like registration"""
+        user = User.objects.create_user(email='test@EXAMPLE.com', password='testpass123')
+        
+        self.assertEqual(user.email, 'test@example.com')
+        self.assertEqual(user.username, 'test@example.com')
+
+    def test_natural_key_lookup_ignores_case(self):
+        """Test email lookups used by login and duplicate checks ignore case"""
+        user = User.objects.create_user(email='Test@example.com', password='testpass123')
+        
+        self.assertEqual(User.objects.get_by_natural_key('TEST@example.com'), user)
+        self.assertEqual(list(User.objects.with_emails(['test@EXAMPLE.com', 'other@example.com'])), [user])
+        self.assertFalse(User.objects.with_email('test@example.org').exists())
\ No newline at end of file
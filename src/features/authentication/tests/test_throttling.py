@@ -0,0 +1,177 @@
+# Login throttling tests
+
+import threading
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..hashers import HashingCapacityExceeded
+from ..throttling import SlidingWindowLimiter, get_login_throttle
+
+User = get_user_model()
+
+class SlidingWindowLimiterTests(TestCase):
+    """
+    Test the cache-backed sliding window
+    
+    Design Decision: Pass explicit timestamps instead of sleeping
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.limiter = SlidingWindowLimiter('test', limit=3, window=60)
+
+    def test_rejects_over_limit_with_retry_after(self):
+        """Test the limit applies within a window and Retry-After is positive"""
+        for _ in range(3):
+            self.assertIsNone(self.limiter.hit('client', now=600.0))
+        
+        retry_after = self.limiter.hit('client', now=610.0)
+        
+        self.assertGreater(retry_after, 0)
+        self.assertEqual(self.limiter.stats()['rejected'], 1)
+        self.assertIsNone(self.limiter.hit('other-client', now=610.0))
+
+    def test_previous_window_decays(self):
+        """Test attempts from the previous window count by their overlap"""
+        for _ in range(3):
+            self.limiter.hit('client', now=659.0)
+        
+        # 10% into the next window 90% of them still count: 2.7, then 3.7
+        self.assertIsNone(self.limiter.hit('client', now=666.0))
+        self.assertIsNotNone(self.limiter.hit('client', now=666.0))
+        # 80% into it only 20% do: 0.6 + 1
+        self.assertIsNone(self.limiter.hit('client', now=708.0))
+
+    def test_concurrent_hits_share_the_budget(self):
+        """Test attempts racing each other cannot all pass the limit"""
+        barrier = threading.Barrier(8)
+        results = []
+        
+        def attempt():
+            barrier.wait()
+            results.append(self.limiter.hit('client', now=600.0))
+        
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(results.count(None), 3)
+        # Rejected attempts are not counted, so the window is exactly full
+        self.assertEqual(self.limiter._counts('client', 600.0)[0], 3)
+
+    def test_release_gives_an_attempt_back(self):
+        """Test a released attempt no longer counts"""
+        for _ in range(3):
+            self.limiter.hit('client', now=600.0)
+        
+        self.limiter.release('client', now=600.0)
+        
+        self.assertIsNone(self.limiter.hit('client', now=600.0))
+        self.assertIsNotNone(self.limiter.hit('client', now=600.0))
+
+    def test_reset_clears_attempts(self):
+        """Test reset drops the identity's counters"""
+        for _ in range(3):
+            self.limiter.hit('client', now=600.0)
+        
+        self.limiter.reset('client', now=600.0)
+        
+        self.assertIsNone(self.limiter.hit('client', now=600.0))
+
+class LoginThrottleAPITests(TestCase):
+    """Test the login endpoint rejects throttled requests before hashing"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            username='test@example.com',
+            password='testpass123'
+        )
+
+    def login(self, password):
+        return self.client.post('/api/v1/auth/login/', {
+            'email': 'test@example.com',
+            'password': password
+        })
+
+    def test_account_locks_after_failures(self):
+        """Test repeated failures lock the account, even for the right password"""
+        for _ in range(5):
+            self.assertEqual(self.login('wrongpass').status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        with mock.patch(
+            'features.authentication.services.AuthenticationService.authenticate_user'
+        ) as authenticate:
+            response = self.login('testpass123')
+        
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        authenticate.assert_not_called()
+
+    def test_attempt_counts_before_hashing(self):
+        """Test an in-flight attempt already uses the account's budget"""
+        throttle = get_login_throttle()
+        in_flight = []
+        
+        def authenticate(**credentials):
+            in_flight.append(throttle.account.retry_after(throttle._account_key(credentials['email'])))
+            return None
+        
+        with mock.patch.object(throttle.account, 'limit', 1), mock.patch(
+            'features.authentication.services.AuthenticationService.authenticate_user', side_effect=authenticate
+        ):
+            self.assertEqual(self.login('wrongpass').status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(self.login('wrongpass').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        
+        self.assertEqual(len(in_flight), 1)
+        self.assertIsNotNone(in_flight[0])
+
+    def test_no_hashing_capacity_does_not_count_as_failure(self):
+        """Test a 503 gives the reserved attempt back"""
+        with mock.patch(
+            'features.authentication.services.AuthenticationService.authenticate_user',
+            side_effect=HashingCapacityExceeded
+        ):
+            for _ in range(6):
+                self.assertEqual(self.login('testpass123').status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        self.assertEqual(self.login('testpass123').status_code, status.HTTP_200_OK)
+
+    def test_success_clears_failures(self):
+        """Test a successful login resets the account's failure count"""
+        for _ in range(4):
+            self.login('wrongpass')
+        self.assertEqual(self.login('testpass123').status_code, status.HTTP_200_OK)
+        
+        for _ in range(4):
+            self.login('wrongpass')
+        self.assertEqual(self.login('testpass123').status_code, status.HTTP_200_OK)
+
+    def test_ip_limit(self):
+        """Test one client is limited across accounts"""
+        with mock.patch.object(get_login_throttle().ip, 'limit', 2):
+            responses = [
+                self.client.post('/api/v1/auth/login/', {
+                    'email': f'user{i}@example.com',
+                    'password': 'testpass123'
+                })
+                for i in range(3)
+            ]
+        
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [status.HTTP_401_UNAUTHORIZED, status.HTTP_401_UNAUTHORIZED, status.HTTP_429_TOO_MANY_REQUESTS]
+        )
+
+    @override_settings(LOGIN_THROTTLE_ENABLED=False)
+    def test_throttling_can_be_disabled(self):
+        """Test the kill switch lets every attempt through"""
+        for _ in range(6):
+            self.assertEqual(self.login('wrongpass').status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
@@ -0,0 +1,213 @@
+# Login throttling
+# Decision: Reject credential-stuffing traffic with cheap cache counters
+# before any password hash is computed
+
+import hashlib
+import math
+import threading
+import time
+from typing import Optional
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window rate limiter backed by the Django cache
+
+    Design Decision: Sliding window counter instead of a request log
+    - Two integer keys per identity (current and previous window), so
+      memory stays constant no matter how hard a client hammers us
+    - The previous window is weighted by how much of it still overlaps
+      the sliding window, which avoids the burst a fixed window allows
+      at every window boundary
+    - hit() increments first and decides on the value incr returned, so
+      concurrent attempts cannot all pass a check made before any of
+      them was counted; rejected attempts are taken back out
+    - The budget is only shared by every worker when the cache is
+      (Redis); with the local-memory cache each process counts on its
+      own, so the effective limit grows with the number of workers
+    """
+
+    def __init__(self, name: str, limit: int, window: int):
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._allowed = 0
+        self._rejected = 0
+
+    @property
+    def shared(self):
+        return caches[settings.LOGIN_THROTTLE_CACHE_ALIAS]
+
+    def retry_after(self, ident: str, now: float = None) -> Optional[int]:
+        """Seconds until ident may try again, or None if under the limit"""
+        now = time.time() if now is None else now
+        current, previous, elapsed = self._counts(ident, now)
+        return self._wait(current, previous, elapsed)
+
+    def hit(self, ident: str, now: float = None) -> Optional[int]:
+        """
+        Count one attempt for ident unless it is over the limit
+
+        Returns:
+            None when the attempt is allowed, otherwise Retry-After seconds
+        """
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        key = self._key(ident, bucket)
+        current = self._incr(key)
+        previous = self.shared.get(self._key(ident, bucket - 1), 0)
+        # Attempts before this one decide, as if checked then counted
+        wait = self._wait(current - 1, previous, now - bucket * self.window)
+        if wait is not None:
+            self._decr(key)
+        with self._lock:
+            if wait is None:
+                self._allowed += 1
+            else:
+                self._rejected += 1
+        return wait
+
+    def release(self, ident: str, now: float = None):
+        """Take back an attempt counted by hit() that should not count"""
+        now = time.time() if now is None else now
+        self._decr(self._key(ident, int(now // self.window)))
+
+    def reset(self, ident: str, now: float = None):
+        now = time.time() if now is None else now
+        bucket = int(now // self.window)
+        self.shared.delete_many([self._key(ident, bucket), self._key(ident, bucket - 1)])
+
+    def stats(self) -> dict:
+        """Per-process counters of allowed and rejected attempts"""
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'window_seconds': self.window,
+                'allowed': self._allowed,
+                'rejected': self._rejected,
+            }
+
+    def _wait(self, current: int, previous: int, elapsed: float) -> Optional[int]:
+        fraction = elapsed / self.window
+        if previous * (1 - fraction) + current < self.limit:
+            return None
+
+        if current < self.limit and previous:
+            # The previous window's share decays below the limit first
+            wait = self.window * (1 - fraction - (self.limit - current) / previous)
+        else:
+            # Wait for the next window, then for this window's share to decay
+            wait = self.window * (1 - fraction) + self.window * (1 - self.limit / max(current, 1))
+        return max(math.ceil(wait), 1)
+
+    def _incr(self, key: str) -> int:
+        # Keys outlive their window so they can serve as the previous one
+        self.shared.add(key, 0, self.window * 2)
+        try:
+            return self.shared.incr(key)
+        except ValueError:
+            # Expired between add and incr
+            self.shared.set(key, 1, self.window * 2)
+            return 1
+
+    def _decr(self, key: str):
+        try:
+            self.shared.decr(key)
+        except ValueError:
+            # Expired or reset in the meantime; nothing left to take back
+            pass
+
+    def _counts(self, ident: str, now: float) -> tuple:
+        bucket = int(now // self.window)
+        current_key = self._key(ident, bucket)
+        previous_key = self._key(ident, bucket - 1)
+        values = self.shared.get_many([current_key, previous_key])
+        return values.get(current_key, 0), values.get(previous_key, 0), now - bucket * self.window
+
+    def _key(self, ident: str, bucket: int) -> str:
+        return f'throttle:{self.name}:{ident}:{bucket}'
+
+
+class LoginThrottle:
+    """
+    Per-IP rate limit and per-account lockout for the login endpoint
+
+    Design Decision: Two limiters with different jobs
+    - The IP limiter counts every attempt and caps how fast one client
+      can make us hash passwords
+    - The account limiter counts failed attempts and locks the account
+      for new attempts once LOGIN_LOCKOUT_THRESHOLD is reached, which
+      stops distributed guessing against a single account
+    - Each account attempt is counted before its password is hashed and
+      stays counted if it fails, so parallel guesses share the budget
+    - A successful login clears the account's failures
+    - Accounts are keyed by a hash of the normalized email, so cache
+      keys carry no personal data
+    """
+
+    def __init__(self):
+        self.ip = SlidingWindowLimiter(
+            'login-ip', settings.LOGIN_THROTTLE_IP_LIMIT, settings.LOGIN_THROTTLE_IP_WINDOW
+        )
+        self.account = SlidingWindowLimiter(
+            'login-account', settings.LOGIN_LOCKOUT_THRESHOLD, settings.LOGIN_LOCKOUT_WINDOW
+        )
+
+    def check_ip(self, request) -> Optional[int]:
+        """Count an attempt from the client; Retry-After seconds when over the limit"""
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return None
+        return self.ip.hit(self.get_ident(request))
+
+    def check_account(self, email: str) -> Optional[int]:
+        """
+        Reserve an attempt against the account before hashing
+
+        The reservation is the failure count if the attempt fails;
+        record_success() clears it and release_account() gives it back.
+
+        Returns:
+            Retry-After seconds while the account is locked, otherwise None
+        """
+        if not settings.LOGIN_THROTTLE_ENABLED:
+            return None
+        return self.account.hit(self._account_key(email))
+
+    def release_account(self, email: str):
+        """Give back a reserved attempt that was never checked (e.g. no hashing capacity)"""
+        if settings.LOGIN_THROTTLE_ENABLED:
+            self.account.release(self._account_key(email))
+
+    def record_success(self, email: str):
+        if settings.LOGIN_THROTTLE_ENABLED:
+            self.account.reset(self._account_key(email))
+
+    def stats(self) -> dict:
+        return {'ip': self.ip.stats(), 'account': self.account.stats()}
+
+    @staticmethod
+    def get_ident(request) -> str:
+        """Client IP, honouring REST_FRAMEWORK['NUM_PROXIES'] like DRF throttles"""
+        return BaseThrottle().get_ident(request)
+
+    @staticmethod
+    def _account_key(email: str) -> str:
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
+_login_throttle = None
+_login_throttle_lock = threading.Lock()
+
+
+def get_login_throttle() -> LoginThrottle:
+    """Return the process-wide login throttle, creating it on first use"""
+    global _login_throttle
+    if _login_throttle is None:
+        with _login_throttle_lock:
+            if _login_throttle is None:
+                _login_throttle = LoginThrottle()
+    return _login_throttle
@@ -0,0 +1,2 @@
+# Notifications feature module
+# Decision: Deliver email outside the request cycle through a database outbox
\ No newline at end of file
@@ -0,0 +1,14 @@
+# Notifications admin configuration
+
+from django.contrib import admin
+from .models import OutboxMessage
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Outbox admin interface"""
+    
+    list_display = ('template', 'recipient', 'status', 'attempts', 'available_at', 'sent_at')
+    list_filter = ('status', 'template')
+    search_fields = ('recipient',)
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
\ No newline at end of file
@@ -0,0 +1,13 @@
+# Notifications app configuration
+
+from django.apps import AppConfig
+from django.conf import settings
+
+class NotificationsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'features.notifications'
+    verbose_name = 'Notifications'
+
+    def is_enabled(self):
+        """Check if notifications feature is enabled"""
+        return settings.ENABLED_FEATURES.get('notifications', False)
\ No newline at end of file
@@ -0,0 +1,47 @@
+# Outbox worker command
+# Decision: A plain long-running process, so it can run next to the web
+# workers (Procfile `worker:` entry, a second container, or supervisord)
+
+import signal
+import threading
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from features.notifications.worker import OutboxWorker
+
+class Command(BaseCommand):
+    help = 'Deliver queued notification emails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once no messages are due')
+        parser.add_argument('--batch-size', type=int, help='Messages claimed per transaction')
+        parser.add_argument(
+            '--poll-interval', type=float,
+            help='Seconds to wait when the queue is empty (default OUTBOX_POLL_INTERVAL)'
+        )
+
+    def handle(self, *args, **options):
+        poll_interval = options['poll_interval'] or settings.OUTBOX_POLL_INTERVAL
+        stopping = threading.Event()
+        
+        # Finish the current batch on SIGTERM/SIGINT instead of dying mid-send
+        previous_handlers = {
+            signum: signal.signal(signum, lambda *_: stopping.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        
+        worker = OutboxWorker(batch_size=options['batch_size'])
+        try:
+            while not stopping.is_set():
+                result = worker.run_batch()
+                if result['claimed']:
+                    self.stdout.write(
+                        f"Sent {result['sent']}, retrying {result['retried']}, failed {result['failed']}"
+                    )
+                    continue
+                if options['once']:
+                    break
+                stopping.wait(poll_interval)
+        finally:
+            worker.close()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
\ No newline at end of file
@@ -0,0 +1,45 @@
+# Notifications models
+# Decision: Transactional outbox - messages are rows written in the same
+# transaction as the change that caused them, and delivered by a worker
+
+from django.db import models
+from django.utils import timezone
+
+class OutboxMessage(models.Model):
+    """
+    Email waiting to be delivered by `manage.py run_outbox`
+    
+    Design Decision: Store the template name and context, not rendered mail
+    - The request path only inserts one small row
+    - Rendering and SMTP happen in the worker, off the request path
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    template = models.CharField(max_length=100)
+    recipient = models.EmailField()
+    context = models.JSONField(default=dict)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    # Decision: Retries are scheduled by pushing available_at forward
+    available_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"{self.template} to {self.recipient} ({self.status})"
+
+    class Meta:
+        db_table = 'notification_outbox'
+        indexes = [
+            # Decision: The worker's claim query scans pending rows by due time
+            models.Index(fields=['status', 'available_at'], name='outbox_status_due_idx'),
+        ]
\ No newline at end of file
@@ -0,0 +1,51 @@
+# Notifications services
+# Decision: Callers only enqueue; rendering and delivery belong to the worker
+
+from typing import Iterable, List
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.template.loader import render_to_string
+from .models import OutboxMessage
+
+# Email templates (notifications/email/<name>_subject.txt and _body.txt)
+TEMPLATE_EMAIL_VERIFICATION = 'email_verification'
+TEMPLATE_PASSWORD_RESET = 'password_reset'
+
+class NotificationService:
+    """
+    Notification business logic service
+    
+    Design Decision: Transactional outbox
+    - enqueue() is a single INSERT, so it can share the caller's
+      transaction and costs no network round-trip to a mail server
+    - A message exists if and only if the change that caused it committed
+    """
+
+    def enqueue(self, template: str, recipient: str, context: dict = None) -> OutboxMessage:
+        """Queue one email for delivery"""
+        return OutboxMessage.objects.create(
+            template=template,
+            recipient=recipient,
+            context=context or {}
+        )
+
+    def enqueue_many(self, messages: Iterable[tuple]) -> List[OutboxMessage]:
+        """Queue (template, recipient, context) tuples with one bulk INSERT"""
+        return OutboxMessage.objects.bulk_create([
+            OutboxMessage(template=template, recipient=recipient, context=context or {})
+            for template, recipient, context in messages
+        ])
+
+    def render(self, message: OutboxMessage, connection=None) -> EmailMessage:
+        """Build the email for an outbox message"""
+        prefix = f'notifications/email/{message.template}'
+        # Subjects must be a single line
+        subject = ' '.join(render_to_string(f'{prefix}_subject.txt', message.context).split())
+        body = render_to_string(f'{prefix}_body.txt', message.context)
+        return EmailMessage(
+            subject=subject,
+            body=body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[message.recipient],
+            connection=connection
+        )
\ No newline at end of file
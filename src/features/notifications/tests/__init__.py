@@ -0,0 +1 @@
+# Notifications tests package
\ No newline at end of file
@@ -0,0 +1,212 @@
+# Notification outbox tests
+# Decision: Deliver through Django's locmem backend and a local SMTP stand-in
+
+import socketserver
+from io import StringIO
+import threading
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import SkipTest
+from django.apps import apps
+from django.conf import settings
+from django.core import mail
+from django.core.mail.backends.smtp import EmailBackend
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from features.authentication.services import AuthenticationService
+
+# The app is only installed with ENABLE_NOTIFICATIONS=true, and its models
+# cannot be imported (or its tables created) without it
+if not apps.is_installed('features.notifications'):
+    raise SkipTest('features.notifications is not installed (ENABLE_NOTIFICATIONS=true)')
+
+from ..models import OutboxMessage
+from ..services import NotificationService, TEMPLATE_EMAIL_VERIFICATION
+from ..worker import OutboxWorker
+
+NOTIFICATIONS_ON = {**settings.ENABLED_FEATURES, 'notifications': True}
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Minimal SMTP server that records connections and messages"""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 stand-in ready')
+        for raw in self.rfile:
+            command = raw.decode().strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 stand-in')
+            elif command == 'DATA':
+                self.reply('354 end with <CRLF>.<CRLF>')
+                lines = []
+                for line in self.rfile:
+                    if line == b'.\r\n':
+                        break
+                    lines.append(line)
+                self.server.messages.append(b''.join(lines))
+                self.reply('250 queued')
+            elif command == 'QUIT':
+                self.reply('221 bye')
+                return
+            else:
+                self.reply('250 ok')
+
+
+class FailingConnection:
+    """Mail connection whose server is down"""
+
+    def open(self):
+        raise SMTPException('connection refused')
+
+    def close(self):
+        pass
+
+
+@override_settings(
+    ENABLED_FEATURES=NOTIFICATIONS_ON,
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    OUTBOX_MAX_ATTEMPTS=3
+)
+class OutboxTests(TestCase):
+    """
+    Test the transactional outbox
+    
+    Design Decision: Cover both sides of the queue
+    - Request path: registration and reset only insert rows
+    - Worker: delivery, connection reuse and retry with backoff
+    """
+
+    def setUp(self):
+        self.auth_service = AuthenticationService()
+
+    def test_registration_queues_instead_of_sending(self):
+        """Test registering a user only inserts an outbox row"""
+        user = self.auth_service.register_user(email='new@example.com', password='testpass123')
+        
+        self.assertEqual(len(mail.outbox), 0)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.recipient, user.email)
+        self.assertEqual(message.template, TEMPLATE_EMAIL_VERIFICATION)
+        self.assertIn('/verify-email/', message.context['verify_url'])
+
+    def test_bulk_registration_queues_in_one_insert(self):
+        """Test bulk registration queues every email with one INSERT"""
+        users = [
+            self.auth_service.build_user(f'user{i}@example.com') for i in range(3)
+        ]
+        for user in users:
+            user.save()
+        
+        with self.assertNumQueries(1):
+            self.auth_service._queue_verification_emails(users)
+        self.assertEqual(OutboxMessage.objects.count(), 3)
+
+    def test_password_reset_queues_email(self):
+        """Test password reset requests are queued"""
+        self.auth_service.register_user(email='reset@example.com', password='testpass123')
+        OutboxMessage.objects.all().delete()
+        
+        self.assertTrue(self.auth_service.send_password_reset('reset@example.com'))
+        
+        message = OutboxMessage.objects.get()
+        self.assertIn('/reset-password/', message.context['reset_url'])
+
+    @override_settings(ENABLED_FEATURES={**NOTIFICATIONS_ON, 'notifications': False})
+    def test_disabled_feature_queues_nothing(self):
+        """Test nothing is queued while notifications are disabled"""
+        self.auth_service.register_user(email='quiet@example.com', password='testpass123')
+        
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_worker_sends_due_messages(self):
+        """Test the worker renders and sends queued messages"""
+        self.auth_service.register_user(
+            email='ada@example.com', password='testpass123', first_name='Ada'
+        )
+        
+        result = OutboxWorker().run_batch()
+        
+        self.assertEqual(result['sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['ada@example.com'])
+        self.assertEqual(mail.outbox[0].subject, 'Verify your email address')
+        self.assertIn('Hello Ada', mail.outbox[0].body)
+        message = OutboxMessage.objects.get()
+        self.assertEqual(message.status, OutboxMessage.STATUS_SENT)
+        self.assertIsNotNone(message.sent_at)
+
+    def test_worker_skips_messages_not_yet_due(self):
+        """Test scheduled retries wait for available_at"""
+        message = NotificationService().enqueue(TEMPLATE_EMAIL_VERIFICATION, 'later@example.com')
+        OutboxMessage.objects.filter(id=message.id).update(
+            available_at=timezone.now() + timedelta(minutes=5)
+        )
+        
+        self.assertEqual(OutboxWorker().run_batch()['claimed'], 0)
+
+    def test_worker_retries_with_backoff_then_fails(self):
+        """Test failed sends are rescheduled and finally marked failed"""
+        message = NotificationService().enqueue(TEMPLATE_EMAIL_VERIFICATION, 'down@example.com')
+        worker = OutboxWorker(connection=FailingConnection())
+        
+        delays = []
+        for _ in range(3):
+            OutboxMessage.objects.filter(id=message.id).update(available_at=timezone.now())
+            started = timezone.now()
+            worker.run_batch()
+            message.refresh_from_db()
+            delays.append(message.available_at - started)
+        
+        self.assertEqual(message.attempts, 3)
+        self.assertEqual(message.status, OutboxMessage.STATUS_FAILED)
+        self.assertIn('connection refused', message.last_error)
+        self.assertGreater(delays[1], delays[0])
+
+    def test_worker_reuses_smtp_connection(self):
+        """Test a batch goes over one connection to a local SMTP server"""
+        server = SMTPStandIn()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        
+        NotificationService().enqueue_many(
+            (TEMPLATE_EMAIL_VERIFICATION, f'user{i}@example.com', {'verify_url': 'https://x/'})
+            for i in range(3)
+        )
+        connection = EmailBackend(host='127.0.0.1', port=server.server_address[1], timeout=5)
+        worker = OutboxWorker(batch_size=2, connection=connection)
+        
+        worker.run_batch()
+        worker.run_batch()
+        worker.close()
+        
+        self.assertEqual(server.connections, 1)
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(
+            OutboxMessage.objects.filter(status=OutboxMessage.STATUS_SENT).count(), 3
+        )
+
+    def test_run_outbox_command_drains_queue(self):
+        """Test `run_outbox --once` delivers everything due and exits"""
+        NotificationService().enqueue_many(
+            (TEMPLATE_EMAIL_VERIFICATION, f'user{i}@example.com', {}) for i in range(3)
+        )
+        
+        call_command('run_outbox', '--once', '--batch-size', '2', stdout=StringIO())
+        
+        self.assertEqual(len(mail.outbox), 3)
\ No newline at end of file
@@ -0,0 +1,88 @@
+# Outbox worker
+# Decision: Claim due messages with SELECT ... FOR UPDATE SKIP LOCKED so any
+# number of `run_outbox` processes can share the queue without coordination
+
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+from .models import OutboxMessage
+from .services import NotificationService
+
+def retry_delay(attempts: int) -> timedelta:
+    """
+    Exponential backoff with jitter
+    
+    OUTBOX_RETRY_BASE_DELAY doubles per failed attempt up to
+    OUTBOX_RETRY_MAX_DELAY; up to 25% jitter spreads out retries of
+    messages that failed together (e.g. during an SMTP outage).
+    """
+    delay = min(
+        settings.OUTBOX_RETRY_BASE_DELAY * 2 ** (attempts - 1),
+        settings.OUTBOX_RETRY_MAX_DELAY
+    )
+    return timedelta(seconds=delay * (1 + random.random() / 4))
+
+class OutboxWorker:
+    """
+    Deliver outbox messages in batches
+    
+    Design Decision: One SMTP connection for the worker's lifetime
+    - The connection is opened once and reused by every batch, instead of
+      one TCP/TLS handshake and login per email
+    - It is closed after a send error and reopened on the next attempt
+    - Rows stay locked while their batch is sent, so other workers skip them
+    """
+
+    def __init__(self, batch_size: int = None, connection=None):
+        self.batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        self.connection = connection or get_connection()
+        self.service = NotificationService()
+
+    def run_batch(self) -> dict:
+        """
+        Claim and deliver one batch of due messages
+        
+        Returns:
+            Counts of claimed, sent, retried and failed messages
+        """
+        result = {'claimed': 0, 'sent': 0, 'retried': 0, 'failed': 0}
+        with transaction.atomic():
+            messages = list(
+                OutboxMessage.objects.select_for_update(skip_locked=True).filter(
+                    status=OutboxMessage.STATUS_PENDING,
+                    available_at__lte=timezone.now()
+                ).order_by('available_at', 'id')[:self.batch_size]
+            )
+            for message in messages:
+                result[self._deliver(message)] += 1
+            OutboxMessage.objects.bulk_update(
+                messages, ['status', 'attempts', 'available_at', 'last_error', 'sent_at']
+            )
+        result['claimed'] = len(messages)
+        return result
+
+    def close(self):
+        self.connection.close()
+
+    def _deliver(self, message: OutboxMessage) -> str:
+        message.attempts += 1
+        try:
+            # open() is a no-op while the connection is already open
+            self.connection.open()
+            self.service.render(message, self.connection).send()
+        except Exception as exc:
+            self.connection.close()
+            message.last_error = f'{type(exc).__name__}: {exc}'
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                message.status = OutboxMessage.STATUS_FAILED
+                return 'failed'
+            message.available_at = timezone.now() + retry_delay(message.attempts)
+            return 'retried'
+        
+        message.status = OutboxMessage.STATUS_SENT
+        message.sent_at = timezone.now()
+        message.last_error = ''
+        return 'sent'
\ No newline at end of file
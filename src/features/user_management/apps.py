@@ -8,6 +8,12 @@ class UserManagementConfig(AppConfig):
     name = 'features.user_management'
     verbose_name = 'User Management'
 
+    def ready(self):
+        # Import signals when app is ready
+        # Decision: Lazy import to avoid circular imports
+        if self.is_enabled():
+            from . import signals
+
     def is_enabled(self):
         """Check if user management feature is enabled"""
         return settings.ENABLED_FEATURES.get('user_management', False)
\ No newline at end of file
@@ -0,0 +1,54 @@
+# Bulk user export
+# Decision: Encode rows one at a time so a streaming response never holds
+# more than one database chunk in memory
+
+import csv
+from typing import Iterable, Iterator, Sequence
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Columns included in exports (never the password hash)
+EXPORT_FIELDS = (
+    'id', 'email', 'first_name', 'last_name', 'phone',
+    'is_active', 'is_email_verified', 'date_joined', 'last_login',
+)
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+EXPORT_FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+CONTENT_TYPES = {
+    FORMAT_NDJSON: 'application/x-ndjson',
+    FORMAT_CSV: 'text/csv',
+}
+
+
+class _LineBuffer:
+    """File-like object that hands back what csv.writer writes"""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    """Encode each row dict as one JSON line"""
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(row) + '\n'
+
+
+def iter_csv(rows: Iterable[dict], fields: Sequence[str] = EXPORT_FIELDS) -> Iterator[str]:
+    """Encode rows as CSV lines, header first"""
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow([
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in (row[field] for field in fields)
+        ])
+
+
+def iter_export(rows: Iterable[dict], file_format: str) -> Iterator[str]:
+    if file_format == FORMAT_CSV:
+        return iter_csv(rows)
+    if file_format == FORMAT_NDJSON:
+        return iter_ndjson(rows)
+    raise ValueError(f'Unknown export format: {file_format}')
@@ -0,0 +1,174 @@
+# Bulk user import
+# Decision: Stream rows through validation and insertion in fixed-size chunks
+# so an institution-sized file never has to fit in memory at once
+
+import csv
+import json
+from typing import Iterable, Iterator, List
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from features.authentication.models import User
+from features.authentication.services import AuthenticationService
+
+# Same fields the registration endpoint accepts
+IMPORT_FIELDS = ('email', 'password', 'first_name', 'last_name', 'phone')
+PASSWORD_MIN_LENGTH = 8
+
+FORMAT_CSV = 'csv'
+FORMAT_NDJSON = 'ndjson'
+IMPORT_FORMATS = (FORMAT_CSV, FORMAT_NDJSON)
+
+
+def read_csv_rows(lines: Iterable[str]) -> Iterator[tuple]:
+    """Yield (row_number, row) pairs from CSV text lines with a header"""
+    for number, row in enumerate(csv.DictReader(lines), start=1):
+        yield number, row
+
+
+def read_ndjson_rows(lines: Iterable[str]) -> Iterator[tuple]:
+    """Yield (row_number, row) pairs from NDJSON; malformed rows yield None"""
+    number = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+def read_rows(lines: Iterable[str], file_format: str) -> Iterator[tuple]:
+    if file_format == FORMAT_CSV:
+        return read_csv_rows(lines)
+    if file_format == FORMAT_NDJSON:
+        return read_ndjson_rows(lines)
+    raise ValueError(f'Unknown import format: {file_format}')
+
+
+class UserImportService:
+    """
+    Bulk user import
+
+    Design Decision: Validate per chunk, register through AuthenticationService
+    - One duplicate-email query per chunk instead of one per row
+    - AuthenticationService.register_users keeps registration rules in one place
+    - Results are yielded as they happen so callers can stream them
+    """
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or settings.USER_IMPORT_CHUNK_SIZE
+        self.auth_service = AuthenticationService()
+
+    def import_rows(self, rows: Iterable[tuple]) -> Iterator[dict]:
+        """
+        Import (row_number, row) pairs
+
+        Yields:
+            {'row', 'email', 'errors'} for every rejected row and a final
+            {'summary': {'total', 'created', 'failed'}}
+        """
+        seen_emails = set()
+        totals = {'total': 0, 'created': 0, 'failed': 0}
+        chunk = []
+
+        for number, row in rows:
+            totals['total'] += 1
+            chunk.append((number, row))
+            if len(chunk) >= self.chunk_size:
+                yield from self._import_chunk(chunk, seen_emails, totals)
+                chunk = []
+
+        if chunk:
+            yield from self._import_chunk(chunk, seen_emails, totals)
+
+        yield {'summary': totals}
+
+    def _import_chunk(self, chunk: List[tuple], seen_emails: set, totals: dict) -> Iterator[dict]:
+        valid = []
+        for number, row in chunk:
+            registration, errors = self._clean_row(row)
+            if not errors:
+                email = registration['email'].lower()
+                if email in seen_emails:
+                    errors = {'email': ['Duplicate email in import.']}
+                else:
+                    seen_emails.add(email)
+            if errors:
+                totals['failed'] += 1
+                yield self._error(number, row, errors)
+            else:
+                valid.append((number, registration))
+
+        # One query to find emails that are already registered
+        existing = {
+            email.lower() for email in User.objects.with_emails(
+                [registration['email'] for _, registration in valid]
+            ).values_list('email', flat=True)
+        }
+        pending = []
+        for number, registration in valid:
+            if registration['email'].lower() in existing:
+                totals['failed'] += 1
+                yield self._error(
+                    number, registration, {'email': ['A user with this email already exists.']}
+                )
+            else:
+                pending.append((number, registration))
+
+        if not pending:
+            return
+
+        try:
+            created = self.auth_service.register_users(
+                [registration for _, registration in pending], batch_size=self.chunk_size
+            )
+            totals['created'] += len(created)
+        except IntegrityError:
+            # A concurrent registration took one of the emails; fall back to
+            # row-by-row inserts so only the conflicting rows fail
+            for number, registration in pending:
+                try:
+                    with transaction.atomic():
+                        self.auth_service.register_users([registration])
+                    totals['created'] += 1
+                except IntegrityError:
+                    totals['failed'] += 1
+                    yield self._error(
+                        number, registration, {'email': ['A user with this email already exists.']}
+                    )
+
+    def _clean_row(self, row) -> tuple:
+        """Validate a raw row against the User model fields"""
+        if row is None:
+            return None, {'row': ['Malformed row.']}
+
+        registration = {}
+        errors = {}
+        for name in IMPORT_FIELDS:
+            value = row.get(name)
+            if value is None:
+                value = ''
+            try:
+                if name == 'password':
+                    value = str(value)
+                    if len(value) < PASSWORD_MIN_LENGTH:
+                        raise ValidationError(
+                            f'Ensure this field has at least {PASSWORD_MIN_LENGTH} characters.'
+                        )
+                else:
+                    value = User._meta.get_field(name).clean(str(value).strip(), None)
+                    if name == 'email':
+                        value = User.objects.normalize_email(value)
+            except ValidationError as exc:
+                errors[name] = exc.messages
+            else:
+                registration[name] = value
+        return registration, errors
+
+    @staticmethod
+    def _error(number: int, row, errors: dict) -> dict:
+        email = row.get('email') if isinstance(row, dict) else None
+        return {'row': number, 'email': email, 'errors': errors}
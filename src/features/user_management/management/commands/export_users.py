@@ -0,0 +1,36 @@
+# Bulk user export command
+# Decision: Same streaming exporter as the API, for dumps from a shell
+
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from features.user_management.exports import iter_export, EXPORT_FORMATS
+from features.user_management.services import UserManagementService
+
+class Command(BaseCommand):
+    help = 'Export users as NDJSON or CSV (to stdout unless --output is given)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default=EXPORT_FORMATS[0])
+        parser.add_argument('--search', default='', help='Only export matching users')
+        parser.add_argument('--output', help='Output file (defaults to stdout)')
+        parser.add_argument('--chunk-size', type=int, help='Rows fetched per query')
+
+    def handle(self, *args, **options):
+        rows = UserManagementService().export_users(
+            search=options['search'], chunk_size=options['chunk_size']
+        )
+        
+        if options['output']:
+            try:
+                output = open(options['output'], 'w', encoding='utf-8', newline='')
+            except OSError as exc:
+                raise CommandError(str(exc))
+        else:
+            output = sys.stdout
+        
+        try:
+            for line in iter_export(rows, options['format']):
+                output.write(line)
+        finally:
+            if output is not sys.stdout:
+                output.close()
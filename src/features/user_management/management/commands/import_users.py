@@ -0,0 +1,55 @@
+# Bulk user import command
+# Decision: Same streaming importer as the API, for onboarding from a shell
+
+import codecs
+import json
+import sys
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from features.user_management.imports import (
+    UserImportService, read_rows, IMPORT_FORMATS, FORMAT_CSV, FORMAT_NDJSON
+)
+
+class Command(BaseCommand):
+    help = 'Import users from a CSV or NDJSON file (use - for stdin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Input file, or - to read from stdin')
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS,
+            help='Input format (defaults to the file extension)'
+        )
+        parser.add_argument('--chunk-size', type=int, help='Rows per transaction')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format']
+        if file_format is None:
+            suffix = Path(path).suffix.lower()
+            if suffix == '.csv':
+                file_format = FORMAT_CSV
+            elif suffix in ('.ndjson', '.jsonl'):
+                file_format = FORMAT_NDJSON
+            else:
+                raise CommandError('Cannot infer format from file name, pass --format')
+        
+        if path == '-':
+            stream = codecs.getreader('utf-8-sig')(sys.stdin.buffer)
+        else:
+            try:
+                stream = open(path, encoding='utf-8-sig', newline='')
+            except OSError as exc:
+                raise CommandError(str(exc))
+        
+        service = UserImportService(chunk_size=options['chunk_size'])
+        with stream:
+            for result in service.import_rows(read_rows(stream, file_format)):
+                if 'summary' in result:
+                    summary = result['summary']
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Imported {summary['created']} of {summary['total']} users "
+                        f"({summary['failed']} failed)"
+                    ))
+                else:
+                    self.stderr.write(json.dumps(result, cls=DjangoJSONEncoder))
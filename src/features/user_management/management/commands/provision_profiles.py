@@ -0,0 +1,28 @@
+# Profile provisioning command
+# Decision: Backfill profiles for users created before profile_management
+# was enabled, in batches so no single statement locks the whole table
+
+from django.core.management.base import BaseCommand
+from features.authentication.models import User
+from features.user_management.models import UserProfile
+
+class Command(BaseCommand):
+    help = 'Create default profiles for users that do not have one'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Users per INSERT ... SELECT')
+
+    def handle(self, *args, **options):
+        missing = User.objects.filter(profile__isnull=True).order_by('id').values_list('id', flat=True)
+        
+        created = 0
+        batch = []
+        for user_id in missing.iterator(chunk_size=options['batch_size']):
+            batch.append(user_id)
+            if len(batch) >= options['batch_size']:
+                created += UserProfile.objects.provision_missing(batch)
+                batch = []
+        if batch:
+            created += UserProfile.objects.provision_missing(batch)
+        
+        self.stdout.write(f'Created {created} profiles')
\ No newline at end of file
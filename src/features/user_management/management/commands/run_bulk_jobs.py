@@ -0,0 +1,29 @@
+# Bulk job runner command
+# Decision: Drain pending bulk jobs from cron or after a restart, since
+# jobs started on a request thread do not survive the process; running
+# jobs whose process died are reclaimed once they stop reporting progress
+
+from django.core.management.base import BaseCommand
+from features.user_management.services import UserManagementService
+
+class Command(BaseCommand):
+    help = 'Run pending bulk user operation jobs and reclaim abandoned ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, help='Maximum number of jobs to run')
+
+    def handle(self, *args, **options):
+        service = UserManagementService()
+        job_ids = service.claimable_bulk_jobs().order_by('created_at').values_list('id', flat=True)
+        if options['limit']:
+            job_ids = job_ids[:options['limit']]
+        
+        for job_id in list(job_ids):
+            job = service.run_bulk_job(job_id)
+            if job is None:
+                # Claimed by another worker in the meantime, or taken over mid-run
+                continue
+            self.stdout.write(
+                f'Job {job.id}: {job.status}, '
+                f"{job.result.get('success_count', 0)} of {job.total_requested} changed"
+            )
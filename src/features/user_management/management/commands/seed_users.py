@@ -0,0 +1,90 @@
+# Benchmark data seeding command
+# Decision: Hash the shared password once and insert users and profiles
+# in bulk, so seeding 100k users takes seconds instead of hours of PBKDF2
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from features.authentication.cache import user_versions
+from features.authentication.models import User
+from features.authentication.services import AuthenticationService
+from features.user_management.models import UserProfile
+
+# Seeded users and users registered by scripts/benchmarks/bench_api.py
+SEED_DOMAIN = 'loadtest.example.com'
+FIRST_NAMES = (
+    'James', 'Mary', 'Robert', 'Patricia', 'John', 'Jennifer', 'Michael', 'Linda',
+    'David', 'Elizabeth', 'William', 'Barbara', 'Richard', 'Susan', 'Joseph', 'Jessica',
+)
+LAST_NAMES = (
+    'Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis',
+    'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson', 'Anderson', 'Thomas',
+    'Taylor', 'Moore', 'Jackson', 'Martin', 'Lee', 'Perez', 'Thompson', 'White',
+)
+
+
+def seed_email(number: int) -> str:
+    return f'user{number}@{SEED_DOMAIN}'
+
+
+class Command(BaseCommand):
+    help = 'Create load-test users (user<n>@loadtest.example.com) with profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10000, help='Seeded users to have in total')
+        parser.add_argument('--password', default='loadtest-pass-123', help='Password of every seeded user')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users per INSERT')
+        parser.add_argument('--no-profiles', action='store_true', help='Skip profile provisioning')
+        parser.add_argument(
+            '--reset', action='store_true',
+            help=f'Delete every @{SEED_DOMAIN} user first, including ones registered by benchmarks'
+        )
+
+    def handle(self, *args, **options):
+        seeded = User.objects.filter(email__endswith=f'@{SEED_DOMAIN}')
+        if options['reset']:
+            deleted, _ = seeded.delete()
+            self.stdout.write(f'Deleted {deleted} rows')
+
+        existing = set(seeded.values_list('email', flat=True))
+        # Same hash for everyone: logins still pay the full PBKDF2 cost
+        password = make_password(options['password'])
+        service = AuthenticationService()
+
+        created = skipped = 0
+        batch = []
+        for number in range(1, options['users'] + 1):
+            email = seed_email(number)
+            if email in existing:
+                skipped += 1
+                continue
+            user = service.build_user(
+                email,
+                first_name=FIRST_NAMES[number % len(FIRST_NAMES)],
+                last_name=LAST_NAMES[number % len(LAST_NAMES)],
+            )
+            user.password = password
+            batch.append(user)
+            if len(batch) >= options['batch_size']:
+                created += self._insert(batch, options['no_profiles'])
+                batch = []
+        if batch:
+            created += self._insert(batch, options['no_profiles'])
+
+        if created:
+            # bulk_create skips post_save, so move the list version by hand
+            user_versions.bump()
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {created} users ({skipped} already present) on @{SEED_DOMAIN}'
+        ))
+
+    @staticmethod
+    def _insert(users, skip_profiles: bool) -> int:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            if not skip_profiles:
+                # PKs are not returned by every backend, so select them back
+                UserProfile.objects.provision_missing(
+                    User.objects.filter(email__in=[user.email for user in users]).values_list('id', flat=True)
+                )
+        return len(users)
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:04
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_jobs(apps, schema_editor):
+    BulkOperationJob = apps.get_model("user_management", "BulkOperationJob")
+    jobs = BulkOperationJob.objects.only("id", "user_ids")
+    for job in jobs.iterator(chunk_size=100):
+        BulkOperationJob.objects.filter(id=job.id).update(total_requested=len(job.user_ids))
+    # Running jobs keep their last progress save as their heartbeat
+    BulkOperationJob.objects.filter(status="running").update(claimed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user_management", "0002_bulkoperationjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="bulkoperationjob",
+            name="claimed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="bulkoperationjob",
+            name="total_requested",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_jobs, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,72 @@
 # User management models
 # Decision: Keep user management models separate from auth models for modularity
 
-from django.db import models
+from django.db import connections, models, router
 from django.conf import settings
+from django.utils import timezone
+
+class UserProfileManager(models.Manager):
+    """
+    User profile manager
+    
+    Design Decision: Provision profiles in bulk with INSERT ... SELECT
+    - One statement creates every missing profile, whether for one new
+      user or for a whole bulk import
+    - NOT EXISTS makes it idempotent, so no SELECT is needed first
+    """
+
+    def provision_missing(self, user_ids=None) -> int:
+        """
+        Create default profiles for users that have none
+        
+        Args:
+            user_ids: Restrict to these users (default: every user)
+            
+        Returns:
+            Number of profiles created
+        """
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            if not user_ids:
+                return 0
+        
+        using = router.db_for_write(self.model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+        user_model = self.model._meta.get_field('user').related_model
+        
+        # Every other column gets its model default, auto_now fields get now
+        now = timezone.now()
+        fields = [
+            field for field in self.model._meta.concrete_fields
+            if not field.primary_key and field.attname != 'user_id'
+        ]
+        values = [
+            now if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+            else field.get_default()
+            for field in fields
+        ]
+        params = [
+            field.get_db_prep_save(value, connection)
+            for field, value in zip(fields, values)
+        ]
+        
+        table = qn(self.model._meta.db_table)
+        columns = ', '.join(qn(field.column) for field in fields)
+        placeholders = ', '.join(['%s'] * len(fields))
+        sql = (
+            f'INSERT INTO {table} ({qn("user_id")}, {columns}) '
+            f'SELECT u.{qn("id")}, {placeholders} '
+            f'FROM {qn(user_model._meta.db_table)} u '
+            f'WHERE NOT EXISTS (SELECT 1 FROM {table} p WHERE p.{qn("user_id")} = u.{qn("id")})'
+        )
+        if user_ids is not None:
+            sql += f' AND u.{qn("id")} IN ({", ".join(["%s"] * len(user_ids))})'
+            params += user_ids
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
 
 class UserProfile(models.Model):
     """
@@ -31,8 +95,57 @@ class UserProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = UserProfileManager()
+
     def __str__(self):
         return f"Profile for {self.user.email}"
 
     class Meta:
-        db_table = 'user_profiles'
\ No newline at end of file
+        db_table = 'user_profiles'
+
+class BulkOperationJob(models.Model):
+    """
+    Background bulk operation over a large list of user IDs
+    
+    Design Decision: Persist jobs in the database
+    - Status survives worker restarts and can be polled from any worker
+    - Pending jobs can be picked up again by `manage.py run_bulk_jobs`
+    - total_requested is stored so status polls never load user_ids
+    - claimed_at is the runner's heartbeat, refreshed after every batch
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    operation = models.CharField(max_length=20)
+    user_ids = models.JSONField()
+    total_requested = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    processed_count = models.PositiveIntegerField(default=0)
+    result = models.JSONField(default=dict)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    def __str__(self):
+        return f"Bulk {self.operation} job {self.pk} ({self.status})"
+
+    class Meta:
+        db_table = 'user_bulk_jobs'
@@ -1,11 +1,93 @@
 # User management services
 # Decision: Service layer for user CRUD operations and business logic
 
-from typing import List, Optional
+import base64
+import hashlib
+import json
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import connections, router, transaction
 from django.db.models import Q
+from django.utils import timezone
+from core.db_routers import pin_to_primary, read_from_primary, replica_reads
+from features.authentication.cache import user_cache, user_versions
 from features.authentication.models import User
-from .models import UserProfile
+from .exports import EXPORT_FIELDS
+from .models import BulkOperationJob, UserProfile
+from .search import get_search_backend
+
+
+# Total count modes for list endpoints
+COUNT_EXACT = 'exact'
+COUNT_ESTIMATE = 'estimate'
+COUNT_NONE = 'none'
+COUNT_MODES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_NONE)
+COUNT_ESTIMATED = 'estimated'
+
+# Bulk operations and the is_active value each one sets
+BULK_OPERATIONS = {
+    'activate': True,
+    'deactivate': False,
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+class BulkJobClaimLost(Exception):
+    """Raised in a bulk job runner whose job was claimed by another runner"""
+
+
+def encode_cursor(date_joined: datetime, user_id: int, reverse: bool = False) -> str:
+    """
+    Encode a keyset position as an opaque cursor
+
+    Design Decision: Opaque base64 token instead of raw query parameters
+    - Clients cannot depend on the cursor format
+    - Lets us change the keyset columns without breaking the API
+    """
+    payload = {'d': date_joined.isoformat(), 'i': user_id}
+    if reverse:
+        payload['r'] = 1
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into (date_joined, user_id, reverse)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (
+            datetime.fromisoformat(payload['d']),
+            int(payload['i']),
+            bool(payload.get('r', False)),
+        )
+    except (ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor('Invalid cursor') from exc
+
+
+def _sort_key(user) -> tuple:
+    """(date_joined, id) of a user instance or a .values() row"""
+    if isinstance(user, dict):
+        return user['date_joined'], user['id']
+    return user.date_joined, user.id
+
+
+def _weak_etag(token: str) -> str:
+    """
+    Weak ETag: the same data may be rendered differently (JSON, browsable API)
+    """
+    return 'W/"%s"' % hashlib.sha1(token.encode()).hexdigest()
+
 
 class UserManagementService:
     """
@@ -17,27 +99,44 @@ class UserManagementService:
     - Better testability
     """
 
-    def get_user_list(self, search: str = None, page: int = 1, page_size: int = 20) -> dict:
+    @replica_reads
+    def get_user_list(self, search: str = None, page: int = 1, page_size: int = 20,
+                      cursor: str = None, count: str = None, values: tuple = None,
+                      only: tuple = None) -> dict:
         """
         Get paginated list of users with optional search
         
         Args:
             search: Search term for email, first_name, last_name
-            page: Page number
+            page: Page number (ignored in cursor mode)
             page_size: Items per page
+            cursor: Keyset cursor; pass '' for the first page in cursor mode
+            count: Total count mode ('exact', 'estimate' or 'none');
+                defaults to 'exact' for page mode and 'none' for cursor mode
+            values: Field names to fetch as plain dicts (read-only fast
+                path) instead of model instances with their profile
+            only: Columns to load on model instances (sparse fieldsets);
+                profile columns use the 'profile__' prefix
             
         Returns:
             Dictionary with users and pagination info
         """
-        queryset = User.objects.select_related('profile').order_by('-date_joined')
+        count = self._resolve_count_mode(cursor, count)
+        queryset = self._get_user_list_queryset(search, values, only)
         
-        # Apply search filter
-        if search:
-            queryset = queryset.filter(
-                Q(email__icontains=search) |
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search)
+        if cursor is not None:
+            result = self._get_user_page_by_cursor(queryset, cursor, page_size)
+            result['total_count'], result['count_type'] = self._count_users(
+                queryset, search, count
             )
+            return result
+        
+        # Outside cursor mode, searches are ordered by relevance first
+        if search:
+            queryset = queryset.order_by('-search_rank', '-date_joined', '-id')
+        
+        if count != COUNT_EXACT:
+            return self._get_user_page_without_count(queryset, search, page, page_size, count)
         
         # Paginate results
         paginator = Paginator(queryset, page_size)
@@ -46,19 +145,417 @@ class UserManagementService:
         return {
             'users': list(page_obj),
             'total_count': paginator.count,
+            'count_type': COUNT_EXACT,
             'page_count': paginator.num_pages,
             'current_page': page,
             'has_next': page_obj.has_next(),
             'has_previous': page_obj.has_previous(),
         }
 
-    def get_user_by_id(self, user_id: int) -> Optional[User]:
-        """Get user by ID with profile"""
+    @replica_reads
+    async def aget_user_list(self, search: str = None, page: int = 1, page_size: int = 20,
+                             cursor: str = None, count: str = None, values: tuple = None,
+                             only: tuple = None) -> dict:
+        """
+        Async variant of get_user_list for the ASGI views
+        
+        Design Decision: Same querysets, evaluated with the async ORM
+        - Results and pagination rules match get_user_list exactly
+        - The event loop serves other requests while the database works
+        """
+        count = self._resolve_count_mode(cursor, count)
+        queryset = self._get_user_list_queryset(search, values, only)
+        
+        if cursor is not None:
+            page_queryset, reverse = self._apply_cursor(queryset, cursor)
+            users = [user async for user in page_queryset[:page_size + 1]]
+            result = self._build_cursor_page(users, cursor, reverse, page_size)
+            result['total_count'], result['count_type'] = await self._acount_users(
+                queryset, search, count
+            )
+            return result
+        
+        if search:
+            queryset = queryset.order_by('-search_rank', '-date_joined', '-id')
+        
+        if count != COUNT_EXACT:
+            page = max(page, 1)
+            offset = (page - 1) * page_size
+            users = [user async for user in queryset[offset:offset + page_size + 1]]
+            total_count, count_type = await self._acount_users(queryset, search, count)
+            return self._build_page_without_count(
+                users, total_count, count_type, page, page_size
+            )
+        
+        # Mirrors Paginator.get_page(): out of range pages fall back to the last page
+        total_count = await queryset.acount()
+        page_count = max(math.ceil(total_count / page_size), 1)
+        number = page if 1 <= page <= page_count else page_count
+        offset = (number - 1) * page_size
+        users = [user async for user in queryset[offset:offset + page_size]]
+        
+        return {
+            'users': users,
+            'total_count': total_count,
+            'count_type': COUNT_EXACT,
+            'page_count': page_count,
+            'current_page': page,
+            'has_next': number < page_count,
+            'has_previous': number > 1,
+        }
+
+    def _resolve_count_mode(self, cursor: Optional[str], count: Optional[str]) -> str:
+        if count is None:
+            count = COUNT_NONE if cursor is not None else COUNT_EXACT
+        if count not in COUNT_MODES:
+            raise ValueError(f'Unknown count mode: {count}')
+        return count
+
+    def _get_user_list_queryset(self, search: Optional[str], values: tuple = None,
+                                only: tuple = None):
+        queryset = User.objects.order_by('-date_joined', '-id')
+        if values is None:
+            queryset = queryset.select_related('profile')
+            if only is not None:
+                queryset = queryset.only(*dict.fromkeys((*only, 'date_joined', 'id')))
+        
+        # Apply search filter
+        if search:
+            queryset = get_search_backend(queryset.db).search(queryset, search)
+        
+        if values is not None:
+            # Cursors are built from the sort key, so always fetch it
+            queryset = queryset.values(*dict.fromkeys((*values, 'date_joined', 'id')))
+        return queryset
+
+    def _get_user_page_without_count(self, queryset, search: str, page: int,
+                                     page_size: int, count: str) -> dict:
+        """
+        Offset pagination that does not run an exact COUNT(*)
+        
+        Design Decision: Fetch one extra row to detect the next page
+        - Paginator needs the exact count to validate page numbers
+        - Out of range pages simply come back empty instead
+        """
+        page = max(page, 1)
+        offset = (page - 1) * page_size
+        users = list(queryset[offset:offset + page_size + 1])
+        total_count, count_type = self._count_users(queryset, search, count)
+        return self._build_page_without_count(users, total_count, count_type, page, page_size)
+
+    def _build_page_without_count(self, users: list, total_count: Optional[int],
+                                  count_type: Optional[str], page: int, page_size: int) -> dict:
+        has_next = len(users) > page_size
+        page_count = None
+        if total_count is not None:
+            page_count = max(math.ceil(total_count / page_size), 1)
+        
+        return {
+            'users': users[:page_size],
+            'total_count': total_count,
+            'count_type': count_type,
+            'page_count': page_count,
+            'current_page': page,
+            'has_next': has_next,
+            'has_previous': page > 1,
+        }
+
+    def _count_users(self, queryset, search: str, count: str) -> tuple:
+        """
+        Count users according to the requested mode
+        
+        Returns:
+            Tuple of (total_count, count_type); both None when skipped
+        """
+        if count == COUNT_NONE:
+            return None, None
+        if count == COUNT_EXACT:
+            return queryset.count(), COUNT_EXACT
+        
+        if not search:
+            estimate = self._estimate_user_rows(queryset.db)
+            if estimate is not None:
+                return estimate, COUNT_ESTIMATED
+        
+        # Filtered lists (or backends without planner statistics) share a
+        # cached exact count that is allowed to go stale for a short TTL
+        total = cache.get_or_set(
+            self._count_cache_key(search), queryset.count, settings.USER_LIST_COUNT_CACHE_TIMEOUT
+        )
+        return total, COUNT_ESTIMATED
+
+    async def _acount_users(self, queryset, search: str, count: str) -> tuple:
+        """Async variant of _count_users"""
+        if count == COUNT_NONE:
+            return None, None
+        if count == COUNT_EXACT:
+            return await queryset.acount(), COUNT_EXACT
+        
+        if not search:
+            estimate = await sync_to_async(self._estimate_user_rows)(queryset.db)
+            if estimate is not None:
+                return estimate, COUNT_ESTIMATED
+        
+        key = self._count_cache_key(search)
+        total = await cache.aget(key)
+        if total is None:
+            total = await queryset.acount()
+            await cache.aset(key, total, settings.USER_LIST_COUNT_CACHE_TIMEOUT)
+        return total, COUNT_ESTIMATED
+
+    def _count_cache_key(self, search: Optional[str]) -> str:
+        return 'user_list:count:' + hashlib.sha1((search or '').lower().encode()).hexdigest()
+
+    def _estimate_user_rows(self, using: str) -> Optional[int]:
+        """
+        Read the planner's row estimate for the user table
+        
+        Design Decision: Use pg_class.reltuples on PostgreSQL
+        - Maintained by autovacuum/ANALYZE, read in constant time
+        - Returns None when unavailable so callers can fall back
+        """
+        connection = connections[using]
+        if connection.vendor != 'postgresql':
+            return None
+        
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [User._meta.db_table]
+            )
+            row = cursor.fetchone()
+        
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        if not row or row[0] < 0:
+            return None
+        return row[0]
+
+    def _get_user_page_by_cursor(self, queryset, cursor: str, page_size: int) -> dict:
+        """
+        Keyset pagination over (date_joined, id)
+        
+        Design Decision: Seek on the sort key instead of OFFSET
+        - Each page is a range scan starting at the cursor position
+        - Page cost stays constant no matter how deep the client goes
+        - No COUNT(*) is needed to know whether more rows exist
+        """
+        queryset, reverse = self._apply_cursor(queryset, cursor)
+        
+        # Fetch one extra row to find out whether another page exists
+        users = list(queryset[:page_size + 1])
+        return self._build_cursor_page(users, cursor, reverse, page_size)
+
+    def _apply_cursor(self, queryset, cursor: str) -> tuple:
+        """Filter queryset to the rows after the cursor position"""
+        reverse = False
+        if cursor:
+            date_joined, user_id, reverse = decode_cursor(cursor)
+            if reverse:
+                queryset = queryset.filter(
+                    Q(date_joined__gt=date_joined) |
+                    Q(date_joined=date_joined, id__gt=user_id)
+                ).order_by('date_joined', 'id')
+            else:
+                queryset = queryset.filter(
+                    Q(date_joined__lt=date_joined) |
+                    Q(date_joined=date_joined, id__lt=user_id)
+                )
+        return queryset, reverse
+
+    def _build_cursor_page(self, users: list, cursor: str, reverse: bool, page_size: int) -> dict:
+        has_more = len(users) > page_size
+        users = users[:page_size]
+        
+        if reverse:
+            users.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, bool(cursor)
+        
+        next_cursor = previous_cursor = None
+        if users and has_next:
+            next_cursor = encode_cursor(*_sort_key(users[-1]))
+        if users and has_previous:
+            previous_cursor = encode_cursor(*_sort_key(users[0]), reverse=True)
+        
+        return {
+            'users': users,
+            'next_cursor': next_cursor,
+            'previous_cursor': previous_cursor,
+            'has_next': has_next,
+            'has_previous': has_previous,
+        }
+
+    def export_users(self, search: str = None, chunk_size: int = None) -> Iterator[dict]:
+        """
+        Iterate over all users matching the search as plain dicts
+        
+        Design Decision: values() + iterator() instead of model instances
+        - No model instantiation or profile join per row
+        - Rows are fetched chunk_size at a time (a server-side cursor on
+          PostgreSQL), so memory stays flat for any number of users
+        """
+        queryset = User.objects.order_by('id')
+        if search:
+            queryset = get_search_backend(queryset.db).search(queryset, search)
+        
+        return queryset.values(*EXPORT_FIELDS).iterator(
+            chunk_size=chunk_size or settings.USER_EXPORT_CHUNK_SIZE
+        )
+
+    @replica_reads
+    def get_user_by_id(self, user_id: int, only: tuple = None,
+                       with_profile: bool = True) -> Optional[User]:
+        """
+        Get user by ID, with profile unless with_profile is False
+        
+        Args:
+            only: Columns to load (sparse fieldsets); profile columns use
+                the 'profile__' prefix
+        """
+        try:
+            return self._get_user_queryset(only, with_profile).get(id=user_id)
+        except User.DoesNotExist:
+            return None
+
+    @replica_reads
+    async def aget_user_by_id(self, user_id: int, only: tuple = None,
+                              with_profile: bool = True) -> Optional[User]:
+        """Async variant of get_user_by_id"""
         try:
-            return User.objects.select_related('profile').get(id=user_id)
+            return await self._get_user_queryset(only, with_profile).aget(id=user_id)
         except User.DoesNotExist:
             return None
 
+    @replica_reads
+    def get_users_in_batch(self, user_ids: List[int] = (), emails: List[str] = (),
+                           only: tuple = None, with_profile: bool = True) -> dict:
+        """
+        Get many users by ID and/or email
+        
+        Design Decision: One query for the whole batch
+        - Same queryset as get_user_by_id, filtered with id__in (and
+          User.objects.with_emails) instead of one lookup per user
+        - Emails match ignoring case, like login and duplicate checks
+        - Results keep the request order, so callers can zip them back
+        
+        Returns:
+            Dictionary with users, missing_ids and missing_emails
+        """
+        user_ids = list(dict.fromkeys(user_ids))
+        emails = list(dict.fromkeys(User.objects.normalize_email(email) for email in emails))
+        
+        if only is not None:
+            only = (*only, 'email')
+        queryset = self._get_user_queryset(only, with_profile)
+        users = list(queryset.filter(id__in=user_ids) | queryset.with_emails(emails))
+        
+        by_id = {user.id: user for user in users}
+        by_email = {user.email.lower(): user for user in users}
+        ordered = [by_id[user_id] for user_id in user_ids if user_id in by_id]
+        ordered += [by_email[email.lower()] for email in emails if email.lower() in by_email]
+        
+        return {
+            'users': list(dict.fromkeys(ordered)),
+            'missing_ids': [user_id for user_id in user_ids if user_id not in by_id],
+            'missing_emails': [email for email in emails if email.lower() not in by_email],
+        }
+
+    def _get_user_queryset(self, only: Optional[tuple], with_profile: bool):
+        queryset = User.objects.all()
+        if with_profile:
+            queryset = queryset.select_related('profile')
+        if only is not None:
+            queryset = queryset.only(*only)
+        return queryset
+
+    @replica_reads
+    def get_user_validators(self, user_id: int, with_profile: bool = True,
+                            variant: str = '') -> Optional[tuple]:
+        """
+        Conditional request validators for one user
+        
+        Design Decision: Read only the timestamps
+        - One narrow query decides whether a full response is needed
+        - The ETag covers the user row and, when it is part of the
+          representation, its profile
+        - `variant` names the representation (e.g. a sparse fieldset) so
+          two representations never share an ETag
+        
+        Returns:
+            Tuple of (etag, last_modified datetime) or None if not found
+        """
+        row = User.objects.filter(id=user_id).values_list(
+            *self._validator_columns(with_profile)
+        ).first()
+        return self._build_user_validators(user_id, row, variant)
+
+    @replica_reads
+    async def aget_user_validators(self, user_id: int, with_profile: bool = True,
+                                   variant: str = '') -> Optional[tuple]:
+        """Async variant of get_user_validators"""
+        row = await User.objects.filter(id=user_id).values_list(
+            *self._validator_columns(with_profile)
+        ).afirst()
+        return self._build_user_validators(user_id, row, variant)
+
+    def get_validators_for_user(self, user: User, with_profile: bool = True,
+                                variant: str = '') -> tuple:
+        """Validators for a loaded user (profile selected with select_related)"""
+        row = (user.updated_at,)
+        if with_profile:
+            profile = getattr(user, 'profile', None)
+            row += (profile.updated_at if profile else None,)
+        return self._build_user_validators(user.id, row, variant)
+
+    @staticmethod
+    def _validator_columns(with_profile: bool) -> tuple:
+        return ('updated_at', 'profile__updated_at') if with_profile else ('updated_at',)
+
+    def _build_user_validators(self, user_id: int, row: Optional[tuple],
+                               variant: str = '') -> Optional[tuple]:
+        if row is None:
+            return None
+        stamps = [stamp for stamp in row if stamp is not None]
+        token = ':'.join([str(user_id)] + [stamp.isoformat() for stamp in stamps])
+        if variant:
+            token = f'{token}:{variant}'
+        return _weak_etag(token), max(stamps)
+
+    def get_user_list_validators(self, params: dict) -> Optional[tuple]:
+        """
+        Conditional request validators for a user list query
+        
+        Design Decision: Collection version instead of scanning rows
+        - Every user write bumps one shared version (see user_versions)
+        - Validating a list costs one cache read, no database query
+        - ETag only: Last-Modified has one-second resolution, so a write
+          in the same second as an earlier response would still match
+        
+        Returns:
+            Tuple of (etag, None), or None when the version cache is
+            process-local and other workers would not see bumps
+        """
+        if not user_versions.available:
+            return None
+        return self._build_list_validators(user_versions.get(), params)
+
+    async def aget_user_list_validators(self, params: dict) -> Optional[tuple]:
+        """Async variant of get_user_list_validators"""
+        if not user_versions.available:
+            return None
+        return self._build_list_validators(await user_versions.aget(), params)
+
+    def _build_list_validators(self, version: int, params: dict) -> tuple:
+        # The version is the time of the last write. Until replicas have
+        # had REPLICA_PIN_SECONDS to catch up, a replica could return the
+        # old rows under the new ETag, and 304s would keep them until the
+        # next write, so the list is read from the primary instead
+        if settings.DATABASE_REPLICAS and time.time_ns() - version < settings.REPLICA_PIN_SECONDS * 10 ** 9:
+            read_from_primary()
+        query = json.dumps(params, sort_keys=True, default=str)
+        return _weak_etag(f'{version}:{query}'), None
+
     def update_user(self, user_id: int, **update_data) -> Optional[User]:
         """
         Update user information
@@ -70,17 +567,34 @@ class UserManagementService:
         Returns:
             Updated user instance or None if not found
         """
+        # Read the row being updated from the primary, not a lagging replica
+        pin_to_primary()
         user = self.get_user_by_id(user_id)
         if not user:
             return None
         
-        # Update allowed fields
+        return self.apply_user_update(user, **update_data)
+
+    def apply_user_update(self, user: User, **update_data) -> User:
+        """
+        Update an already loaded user
+        
+        Design Decision: Callers that fetched the user reuse it
+        - Views that load the user to validate input save it without a
+          second lookup
+        - Only the changed columns are written, so a concurrent change to
+          another column (e.g. the password) is not overwritten
+        """
         allowed_fields = ['first_name', 'last_name', 'email', 'is_active']
-        for field, value in update_data.items():
-            if field in allowed_fields and hasattr(user, field):
-                setattr(user, field, value)
+        changed = [
+            field for field, value in update_data.items()
+            if field in allowed_fields and getattr(user, field) != value
+        ]
+        for field in changed:
+            setattr(user, field, update_data[field])
         
-        user.save()
+        if changed:
+            user.save(update_fields=[*changed, 'updated_at'])
         return user
 
     def deactivate_user(self, user_id: int) -> bool:
@@ -92,33 +606,235 @@ class UserManagementService:
         - Allows for account recovery
         - Maintains audit trail
         """
+        pin_to_primary()
         user = self.get_user_by_id(user_id)
         if user and user.is_active:
             user.is_active = False
-            user.save()
+            user.save(update_fields=['is_active', 'updated_at'])
             return True
         return False
 
-    def bulk_operation(self, user_ids: List[int], operation: str) -> dict:
+    def bulk_operation(self, user_ids: List[int], operation: str,
+                       batch_size: int = None, progress=None) -> dict:
         """
         Perform bulk operations on users
         
+        Design Decision: One short transaction per batch
+        - Row locks are held for one batch instead of the whole request
+        - Each batch reports exactly which IDs it changed
+        
         Args:
             user_ids: List of user IDs
             operation: Operation type ('deactivate', 'activate')
+            batch_size: IDs per transaction (default USER_BULK_BATCH_SIZE)
+            progress: Optional callable receiving the partial result after each batch
             
         Returns:
             Dictionary with operation results
         """
-        users = User.objects.filter(id__in=user_ids)
-        success_count = 0
+        if operation not in BULK_OPERATIONS:
+            raise ValueError(f'Unknown bulk operation: {operation}')
         
-        if operation == 'deactivate':
-            success_count = users.update(is_active=False)
-        elif operation == 'activate':
-            success_count = users.update(is_active=True)
+        is_active = BULK_OPERATIONS[operation]
+        batch_size = batch_size or settings.USER_BULK_BATCH_SIZE
+        ids = list(dict.fromkeys(user_ids))
+        result = {
+            'success_count': 0,
+            'total_requested': len(user_ids),
+            'processed_count': 0,
+            'changed_ids': [],
+            'unchanged_ids': [],
+            'missing_ids': [],
+        }
         
-        return {
-            'success_count': success_count,
-            'total_requested': len(user_ids)
-        }
\ No newline at end of file
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            changed, unchanged, missing = self._apply_bulk_batch(batch, is_active)
+            
+            # QuerySet.update() and raw UPDATEs skip post_save, so drop
+            # cached users and move the list version explicitly
+            user_cache.invalidate(changed)
+            if changed:
+                user_versions.bump()
+            
+            result['changed_ids'].extend(changed)
+            result['unchanged_ids'].extend(unchanged)
+            result['missing_ids'].extend(missing)
+            result['success_count'] += len(changed)
+            result['processed_count'] += len(batch)
+            if progress is not None:
+                progress(result)
+        
+        return result
+
+    def _apply_bulk_batch(self, user_ids: List[int], is_active: bool) -> tuple:
+        """Update one batch and split its IDs into changed, unchanged and missing"""
+        using = router.db_for_write(User)
+        with transaction.atomic(using=using):
+            connection = connections[using]
+            if supports_update_returning(connection):
+                changed = self._update_returning(connection, user_ids, is_active)
+            else:
+                candidates = User.objects.using(using).filter(id__in=user_ids).exclude(is_active=is_active)
+                changed = list(candidates.select_for_update().values_list('id', flat=True))
+                User.objects.using(using).filter(id__in=changed).update(
+                    is_active=is_active, updated_at=timezone.now()
+                )
+            existing = set(
+                User.objects.using(using).filter(id__in=user_ids).values_list('id', flat=True)
+            )
+        
+        changed_set = set(changed)
+        changed = [user_id for user_id in user_ids if user_id in changed_set]
+        unchanged = [user_id for user_id in user_ids if user_id in existing and user_id not in changed_set]
+        missing = [user_id for user_id in user_ids if user_id not in existing]
+        return changed, unchanged, missing
+
+    def _update_returning(self, connection, user_ids: List[int], is_active: bool) -> List[int]:
+        """
+        UPDATE ... RETURNING id in a single statement
+        
+        Rows already in the target state are excluded by the WHERE clause,
+        so the returned IDs are exactly the rows that changed.
+        """
+        qn = connection.ops.quote_name
+        placeholders = ', '.join(['%s'] * len(user_ids))
+        sql = (
+            f'UPDATE {qn(User._meta.db_table)} '
+            f'SET {qn("is_active")} = %s, {qn("updated_at")} = %s '
+            f'WHERE {qn("id")} IN ({placeholders}) AND {qn("is_active")} <> %s '
+            f'RETURNING {qn("id")}'
+        )
+        params = [
+            is_active,
+            connection.ops.adapt_datetimefield_value(timezone.now()),
+            *user_ids,
+            is_active,
+        ]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    def create_bulk_job(self, user_ids: List[int], operation: str,
+                        created_by: User = None) -> BulkOperationJob:
+        """Record a bulk operation to be run in the background"""
+        if operation not in BULK_OPERATIONS:
+            raise ValueError(f'Unknown bulk operation: {operation}')
+        user_ids = list(user_ids)
+        return BulkOperationJob.objects.create(
+            operation=operation,
+            user_ids=user_ids,
+            total_requested=len(user_ids),
+            created_by=created_by
+        )
+
+    def get_bulk_job(self, job_id: int) -> Optional[BulkOperationJob]:
+        """Job for status polls; user_ids (up to USER_BULK_MAX_IDS) is not loaded"""
+        try:
+            return BulkOperationJob.objects.defer('user_ids').get(id=job_id)
+        except BulkOperationJob.DoesNotExist:
+            return None
+
+    def run_bulk_job(self, job_id: int) -> Optional[BulkOperationJob]:
+        """
+        Run a pending (or abandoned running) bulk job to completion
+        
+        Design Decision: Claim the job with a conditional UPDATE
+        - Only one worker (thread or run_bulk_jobs command) can move a job
+          to running, so a job is never run twice at the same time
+        - The runner refreshes claimed_at after every batch; a job whose
+          claim is older than USER_BULK_JOB_STALE_AFTER seconds lost its
+          process and may be claimed again. Operations are idempotent, so
+          it reruns from the start; IDs changed by the lost run then show
+          as unchanged
+        - Every write is conditional on still holding the claim, so a
+          runner that was taken over stops instead of overwriting the job
+        - Progress saves only the counters, and the ID lists are written
+          once at the end, so each batch writes a row of constant size
+        
+        Returns:
+            The finished job, or None if it could not be claimed or its
+            claim was taken over
+        """
+        claim = timezone.now()
+        claimed = self.claimable_bulk_jobs().filter(id=job_id).update(
+            status=BulkOperationJob.STATUS_RUNNING, processed_count=0, result={},
+            claimed_at=claim, updated_at=claim
+        )
+        if not claimed:
+            return None
+        
+        job = BulkOperationJob.objects.get(id=job_id)
+        
+        def save(**fields):
+            nonlocal claim
+            now = timezone.now()
+            if not BulkOperationJob.objects.filter(id=job_id, claimed_at=claim).update(
+                claimed_at=now, updated_at=now, **fields
+            ):
+                raise BulkJobClaimLost(job_id)
+            claim = now
+            for name, value in fields.items():
+                setattr(job, name, value)
+            job.claimed_at = job.updated_at = now
+        
+        def save_progress(result):
+            save(
+                processed_count=result['processed_count'],
+                result={key: value for key, value in result.items() if not key.endswith('_ids')}
+            )
+        
+        try:
+            outcome = {
+                'status': BulkOperationJob.STATUS_COMPLETED,
+                'result': self.bulk_operation(job.user_ids, job.operation, progress=save_progress),
+            }
+        except BulkJobClaimLost:
+            # The runner that took over reports the outcome
+            return None
+        except Exception as exc:
+            outcome = {'status': BulkOperationJob.STATUS_FAILED, 'error': str(exc)}
+        try:
+            save(finished_at=timezone.now(), **outcome)
+        except BulkJobClaimLost:
+            return None
+        return job
+
+    @staticmethod
+    def claimable_bulk_jobs():
+        """Pending jobs plus running jobs whose runner stopped checking in"""
+        stale_before = timezone.now() - timedelta(seconds=settings.USER_BULK_JOB_STALE_AFTER)
+        return BulkOperationJob.objects.filter(
+            Q(status=BulkOperationJob.STATUS_PENDING)
+            | Q(status=BulkOperationJob.STATUS_RUNNING, claimed_at__lt=stale_before)
+        )
+
+
+def supports_update_returning(connection) -> bool:
+    """
+    Whether the backend runs UPDATE ... RETURNING
+
+    Checked by vendor: MariaDB returns rows from INSERT and DELETE but
+    not from UPDATE, so the INSERT feature flags are no guide.
+    """
+    if connection.vendor == 'postgresql':
+        return True
+    if connection.vendor == 'sqlite':
+        return connection.Database.sqlite_version_info >= (3, 35)
+    return False
+
+
+def start_bulk_job(job_id: int):
+    """
+    Run a bulk job on a background thread
+    
+    Jobs left pending or running by a restart are picked up by
+    `manage.py run_bulk_jobs`.
+    """
+    def run():
+        try:
+            UserManagementService().run_bulk_job(job_id)
+        finally:
+            connections.close_all()
+    
+    threading.Thread(target=run, name=f'bulk-job-{job_id}', daemon=True).start()
\ No newline at end of file
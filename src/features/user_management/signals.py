@@ -0,0 +1,19 @@
+# User management signals
+# Decision: Profiles are part of the user list (?expand=profile), so a
+# profile change starts a new list version like a user change does
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from features.authentication.cache import user_versions
+from .models import UserProfile
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def bump_user_list_version(sender, instance, **kwargs):
+    """
+    Start a new user list version whenever a profile changes
+    
+    Design Decision: Same version as user writes
+    - List ETags cover profile fields without a second version lookup
+    """
+    user_versions.bump()
@@ -1,10 +1,18 @@
 # User management API tests
 
-from django.test import TestCase
+import json
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from rest_framework_simplejwt.tokens import RefreshToken
+from api.v1.users.serializers import UserListSerializer, user_list_rows
+from core.testing import QueryBudgetMixin, shared_cache
+from features.user_management.models import UserProfile
 
 User = get_user_model()
 
@@ -73,6 +81,96 @@ class UserManagementAPITests(TestCase):
         self.assertEqual(len(response.data['users']), 1)
         self.assertGreater(response.data['pagination']['page_count'], 1)
 
+    def test_user_list_with_cursor(self):
+        """Test user list in cursor mode returns next cursor"""
+        response = self.client.get('/api/v1/users/?cursor=&page_size=1')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['users']), 1)
+        self.assertTrue(response.data['pagination']['has_next'])
+        
+        next_cursor = response.data['pagination']['next']
+        response = self.client.get(f'/api/v1/users/?cursor={next_cursor}&page_size=1')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['users']), 1)
+        self.assertFalse(response.data['pagination']['has_next'])
+
+    def test_user_list_with_invalid_cursor(self):
+        """Test user list rejects malformed cursor"""
+        response = self.client.get('/api/v1/users/?cursor=garbage')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('error', response.data)
+
+    def test_user_list_skip_count(self):
+        """Test user list can skip the total count"""
+        response = self.client.get('/api/v1/users/?count=none')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data['pagination']['total_count'])
+        self.assertIsNone(response.data['pagination']['count_type'])
+
+    def test_user_list_invalid_count(self):
+        """Test user list rejects unknown count modes"""
+        response = self.client.get('/api/v1/users/?count=bogus')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_list_invalid_page_size(self):
+        """Test user list rejects page sizes below one in both pagination modes"""
+        for params in ({'page_size': 0}, {'page_size': -5}, {'page_size': 'ten'},
+                       {'page_size': 0, 'cursor': ''}):
+            response = self.client.get('/api/v1/users/', params)
+            
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertEqual(response.data['error'], 'page_size must be a positive integer')
+
+    def test_user_list_sparse_fields(self):
+        """Test fields= limits both the output and the selected columns"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/users/?fields=email,id&count=none')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['users'][0]), ['id', 'email'])
+        sql = queries.captured_queries[-1]['sql']
+        self.assertNotIn('first_name', sql)
+        self.assertNotIn('user_profiles', sql)
+
+    def test_user_list_expand_profile(self):
+        """Test expand=profile nests the profile and joins it only then"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/users/?fields=id&expand=profile&count=none')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(response.data['users'][0]), ['id', 'profile'])
+        sql = queries.captured_queries[-1]['sql']
+        self.assertIn('user_profiles', sql)
+        self.assertNotIn('password', sql)
+
+    def test_user_list_unknown_field(self):
+        """Test unknown fields and expansions are rejected"""
+        for query in ('fields=password', 'expand=groups'):
+            response = self.client.get(f'/api/v1/users/?{query}')
+            
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('error', response.data)
+
+    def test_user_detail_sparse_fields(self):
+        """Test detail drops the profile join unless it is expanded"""
+        url = f'/api/v1/users/{self.user1.id}/'
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'fields': 'id,email'})
+        self.assertEqual(response.data, {'id': self.user1.id, 'email': 'user1@example.com'})
+        self.assertNotIn('user_profiles', queries.captured_queries[-1]['sql'])
+        
+        response = self.client.get(url, {'fields': 'email', 'expand': 'profile'})
+        self.assertEqual(list(response.data), ['email', 'profile'])
+        
+        # Each representation has its own ETag
+        self.assertNotEqual(response['ETag'], self.client.get(url)['ETag'])
+
     def test_user_detail_success(self):
         """Test user detail endpoint"""
         response = self.client.get(f'/api/v1/users/{self.user1.id}/')
@@ -88,6 +186,40 @@ class UserManagementAPITests(TestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         self.assertIn('error', response.data)
 
+    def test_user_batch_lookup(self):
+        """Test batch lookup returns users in request order from one query"""
+        data = {'ids': [self.user1.id, 99999, self.admin_user.id], 'emails': ['nobody@example.com']}
+        self.client.post('/api/v1/users/batch/', data, format='json')  # warm the auth cache
+        
+        with self.assertNumQueries(1):
+            response = self.client.post('/api/v1/users/batch/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [user['id'] for user in response.data['users']],
+            [self.user1.id, self.admin_user.id]
+        )
+        self.assertEqual(response.data['users'][0], self.client.get(f'/api/v1/users/{self.user1.id}/').data)
+        self.assertEqual(response.data['missing_ids'], [99999])
+        self.assertEqual(response.data['missing_emails'], ['nobody@example.com'])
+
+    def test_user_batch_lookup_by_email_with_fields(self):
+        """Test batch lookup by email honours sparse fieldsets"""
+        response = self.client.post(
+            '/api/v1/users/batch/?fields=id', {'emails': ['user1@example.com']}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['users'], [{'id': self.user1.id}])
+
+    @override_settings(USER_BATCH_LOOKUP_MAX=2)
+    def test_user_batch_lookup_limits(self):
+        """Test batch lookup rejects empty and oversized batches"""
+        for data in ({}, {'ids': [1, 2], 'emails': ['a@example.com']}):
+            response = self.client.post('/api/v1/users/batch/', data, format='json')
+            
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_user_update_success(self):
         """Test successful user update"""
         data = {
@@ -101,6 +233,17 @@ class UserManagementAPITests(TestCase):
         self.assertEqual(response.data['first_name'], 'Updated')
         self.assertEqual(response.data['last_name'], 'Name')
 
+    def test_user_update_rejects_email_in_other_case(self):
+        """Test another user's email in a different letter case is a duplicate"""
+        response = self.client.patch(f'/api/v1/users/{self.user1.id}/update/', {'email': 'ADMIN@example.com'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('email', response.data)
+        
+        # Changing the case of one's own email is allowed
+        response = self.client.patch(f'/api/v1/users/{self.user1.id}/update/', {'email': 'User1@example.com'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_user_update_not_found(self):
         """Test updating non-existent user"""
         data = {'first_name': 'Test'}
@@ -126,6 +269,117 @@ class UserManagementAPITests(TestCase):
         
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
+    def test_user_export_ndjson(self):
+        """Test export streams one JSON line per user"""
+        response = self.client.get('/api/v1/users/export/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual({row['email'] for row in rows}, {'admin@example.com', 'user1@example.com'})
+
+    def test_user_export_csv_with_search(self):
+        """Test CSV export applies search and writes a header"""
+        response = self.client.get('/api/v1/users/export/?export_format=csv&search=john')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertTrue(lines[0].startswith('id,email,'))
+        self.assertEqual(len(lines), 2)
+        self.assertIn('user1@example.com', lines[1])
+
+    def test_user_export_invalid_format(self):
+        """Test export rejects unknown formats"""
+        response = self.client.get('/api/v1/users/export/?export_format=xml')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_detail_conditional_get(self):
+        """Test user detail answers 304 until the user changes"""
+        url = f'/api/v1/users/{self.user1.id}/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        
+        with self.assertNumQueries(1):  # timestamp query only
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        
+        self.user1.first_name = 'Johnny'
+        self.user1.save()
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_list_conditional_get(self):
+        """Test user list answers 304 until any user is written"""
+        with shared_cache('AUTH_USER_CACHE_ALIAS'):
+            response = self.client.get('/api/v1/users/', {'page_size': 5})
+            etag = response['ETag']
+            # Second resolution would hide writes made in the same second
+            self.assertNotIn('Last-Modified', response)
+            
+            with self.assertNumQueries(0):
+                response = self.client.get('/api/v1/users/', {'page_size': 5}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            
+            # Other queries have their own validators
+            response = self.client.get('/api/v1/users/', {'page_size': 6}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            
+            self.client.post('/api/v1/users/bulk/', {
+                'user_ids': [self.user1.id],
+                'operation': 'deactivate'
+            }, format='json')
+            
+            response = self.client.get('/api/v1/users/', {'page_size': 5}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_list_conditional_get_sees_profile_writes(self):
+        """Test expanded lists answer 200 with a new ETag after a profile changes"""
+        profile, _ = UserProfile.objects.get_or_create(user=self.user1)
+        params = {'page_size': 5, 'expand': 'profile'}
+        with shared_cache('AUTH_USER_CACHE_ALIAS'):
+            etag = self.client.get('/api/v1/users/', params)['ETag']
+            
+            profile.bio = 'Updated bio'
+            profile.save()
+            
+            response = self.client.get('/api/v1/users/', params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+            etag = response['ETag']
+            
+            profile.delete()
+            
+            response = self.client.get('/api/v1/users/', params, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_user_list_without_shared_cache_has_no_validators(self):
+        """Test lists are not validated from a version other workers cannot see"""
+        response = self.client.get('/api/v1/users/', {'page_size': 5})
+        
+        self.assertNotIn('ETag', response)
+        response = self.client.get(
+            '/api/v1/users/', {'page_size': 5}, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_rows_match_model_serializer(self):
+        """Test the fast list path renders exactly like UserListSerializer"""
+        users = User.objects.order_by('id')
+        rows = users.values(*user_list_rows.get_fields())
+        
+        for zone in ('UTC', 'Europe/Paris'):
+            with timezone.override(zone):
+                expected = UserListSerializer(users, many=True).data
+                self.assertEqual(
+                    json.dumps(user_list_rows.serialize(rows)),
+                    json.dumps(expected)
+                )
+
     def test_bulk_operations_success(self):
         """Test bulk operations endpoint"""
         data = {
@@ -139,6 +393,44 @@ class UserManagementAPITests(TestCase):
         self.assertIn('message', response.data)
         self.assertEqual(response.data['affected_users'], 1)
 
+    def test_bulk_operations_reports_missing_ids(self):
+        """Test bulk operations list missing and unchanged IDs"""
+        data = {
+            'user_ids': [self.user1.id, 999999],
+            'operation': 'activate'
+        }
+        
+        response = self.client.post('/api/v1/users/bulk/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['affected_users'], 0)
+        self.assertEqual(response.data['unchanged_ids'], [self.user1.id])
+        self.assertEqual(response.data['missing_ids'], [999999])
+
+    def test_bulk_operations_async_job(self):
+        """Test async bulk operations return a job with a status endpoint"""
+        data = {
+            'user_ids': [self.user1.id],
+            'operation': 'deactivate',
+            'run_async': True
+        }
+        
+        response = self.client.post('/api/v1/users/bulk/', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['job']['status'], 'pending')
+        
+        response = self.client.get(response.data['status_url'])
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_requested'], 1)
+
+    def test_bulk_job_not_found(self):
+        """Test bulk job status for an unknown job"""
+        response = self.client.get('/api/v1/users/bulk/jobs/999999/')
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_bulk_operations_invalid_data(self):
         """Test bulk operations with invalid data"""
         data = {
@@ -148,4 +440,75 @@ class UserManagementAPITests(TestCase):
         
         response = self.client.post('/api/v1/users/bulk/', data)
         
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class UserEndpointQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """
+    Test every user endpoint against its @query_budget
+    
+    Design Decision: Cold cache, so authentication queries are counted
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123'
+        )
+        self.user1 = User.objects.create_user(
+            email='user1@example.com',
+            username='user1@example.com',
+            password='testpass123'
+        )
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_read_endpoints_within_budget(self):
+        requests = [
+            lambda: self.client.get('/api/v1/users/'),
+            lambda: self.client.get('/api/v1/users/?search=user1&page_size=1'),
+            lambda: self.client.get(f'/api/v1/users/{self.user1.id}/'),
+            lambda: self.client.post(
+                '/api/v1/users/batch/', {'ids': [self.user1.id], 'emails': ['admin@example.com']},
+                format='json'
+            ),
+        ]
+        for request in requests:
+            cache.clear()
+            response = request()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertWithinQueryBudget(response)
+    
+    def test_update_within_budget(self):
+        response = self.client.patch(
+            f'/api/v1/users/{self.user1.id}/update/', {'email': 'new@example.com'}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertWithinQueryBudget(response)
+    
+    def test_update_with_unchanged_email_skips_uniqueness_query(self):
+        self.client.get('/api/v1/users/')  # warm the authenticated user cache
+        
+        response = self.client.patch(
+            f'/api/v1/users/{self.user1.id}/update/',
+            {'first_name': 'Ada', 'email': 'user1@example.com'}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # One lookup and one UPDATE of the changed column
+        self.assertWithinQueryBudget(response, budget=2)
+    
+    def test_write_endpoints_within_budget(self):
+        responses = [
+            self.client.delete(f'/api/v1/users/{self.user1.id}/deactivate/'),
+            self.client.post(
+                '/api/v1/users/bulk/', {'user_ids': [self.user1.id], 'operation': 'activate'},
+                format='json'
+            ),
+        ]
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertWithinQueryBudget(response)
\ No newline at end of file
@@ -0,0 +1,131 @@
+# Async user management API tests
+
+import json
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.v1.users import async_views
+from core.testing import shared_cache
+
+User = get_user_model()
+
+class AsyncUserManagementAPITests(TestCase):
+    """
+    Test the async read views used under ASGI
+    
+    Design Decision: Compare against the sync views
+    - Both deployment modes must serve the same response bodies
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.client = APIClient()
+        
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123'
+        )
+        
+        self.user1 = User.objects.create_user(
+            email='user1@example.com',
+            username='user1@example.com',
+            password='testpass123',
+            first_name='John',
+            last_name='Doe'
+        )
+        
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.auth_header = f'Bearer {refresh.access_token}'
+        self.client.credentials(HTTP_AUTHORIZATION=self.auth_header)
+
+    def get(self, view, path, data=None, **kwargs):
+        request = self.factory.get(path, data or {}, HTTP_AUTHORIZATION=self.auth_header)
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_user_list_matches_sync_view(self):
+        """Test async list responses match the sync view for each mode"""
+        for params in ({'page_size': 1, 'page': 2}, {'cursor': ''}, {'search': 'john', 'count': 'estimate'}):
+            response = self.get(async_views.user_list, '/api/v1/users/', params)
+            expected = self.client.get('/api/v1/users/', params)
+            
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content), expected.json())
+
+    def test_sparse_fieldsets_match_sync_view(self):
+        """Test async list and detail honour fields/expand like the sync views"""
+        params = {'fields': 'email,id', 'expand': 'profile'}
+        for view, path, kwargs in (
+            (async_views.user_list, '/api/v1/users/', {}),
+            (async_views.user_detail, f'/api/v1/users/{self.user1.id}/', {'user_id': self.user1.id}),
+        ):
+            response = self.get(view, path, params, **kwargs)
+            expected = self.client.get(path, params)
+            
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(response.content), expected.json())
+
+    def test_user_list_invalid_cursor(self):
+        """Test async list rejects malformed cursors"""
+        response = self.get(async_views.user_list, '/api/v1/users/', {'cursor': 'garbage'})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_list_invalid_page_size(self):
+        """Test async list rejects page sizes below one"""
+        response = self.get(async_views.user_list, '/api/v1/users/', {'page_size': 0, 'cursor': ''})
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_user_detail(self):
+        """Test async detail response matches the sync view"""
+        path = f'/api/v1/users/{self.user1.id}/'
+        response = self.get(async_views.user_detail, path, user_id=self.user1.id)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(json.loads(response.content), self.client.get(path).json())
+
+    def test_user_detail_not_found(self):
+        """Test async detail for a missing user"""
+        response = self.get(async_views.user_detail, '/api/v1/users/99999/', user_id=99999)
+        
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_user_detail_conditional_get(self):
+        """Test async detail honours the sync view's ETag"""
+        path = f'/api/v1/users/{self.user1.id}/'
+        etag = self.client.get(path)['ETag']
+        
+        request = self.factory.get(path, HTTP_AUTHORIZATION=self.auth_header, HTTP_IF_NONE_MATCH=etag)
+        response = async_to_sync(async_views.user_detail)(request, user_id=self.user1.id)
+        
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_user_list_conditional_get(self):
+        """Test async list honours the sync view's ETag"""
+        with shared_cache('AUTH_USER_CACHE_ALIAS'):
+            etag = self.client.get('/api/v1/users/')['ETag']
+            
+            request = self.factory.get('/api/v1/users/', HTTP_AUTHORIZATION=self.auth_header, HTTP_IF_NONE_MATCH=etag)
+            response = async_to_sync(async_views.user_list)(request)
+        
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_unauthenticated_access_denied(self):
+        """Test async views require a valid token"""
+        request = self.factory.get('/api/v1/users/')
+        response = async_to_sync(async_views.user_list)(request)
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('WWW-Authenticate', response)
+
+    def test_method_not_allowed(self):
+        """Test async views only serve GET"""
+        request = self.factory.post('/api/v1/users/', HTTP_AUTHORIZATION=self.auth_header)
+        response = async_to_sync(async_views.user_list)(request)
+        
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
\ No newline at end of file
@@ -0,0 +1,113 @@
+# Bulk user import tests
+
+import json
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from ..imports import UserImportService, read_rows
+from ..models import UserProfile
+
+User = get_user_model()
+
+CSV_BODY = (
+    'email,password,first_name,last_name\n'
+    'ada@example.com,testpass123,Ada,Lovelace\n'
+    'not-an-email,testpass123,Bad,Email\n'
+    'alan@example.com,short,Alan,Turing\n'
+    'ADA@example.com,testpass123,Ada,Again\n'
+    'grace@example.com,testpass123,Grace,Hopper\n'
+)
+
+class UserImportServiceTests(TestCase):
+    """
+    Test the streaming importer
+    
+    Design Decision: Small chunk size to exercise chunk boundaries
+    """
+
+    def setUp(self):
+        self.service = UserImportService(chunk_size=2)
+
+    def test_import_csv_reports_row_errors(self):
+        """Test valid rows are created and invalid rows are reported"""
+        results = list(self.service.import_rows(read_rows(CSV_BODY.splitlines(True), 'csv')))
+        
+        errors = {result['row']: result['errors'] for result in results if 'row' in result}
+        self.assertEqual(set(errors), {2, 3, 4})
+        self.assertIn('email', errors[2])
+        self.assertIn('password', errors[3])
+        self.assertIn('email', errors[4])
+        self.assertEqual(results[-1], {'summary': {'total': 5, 'created': 2, 'failed': 3}})
+        
+        user = User.objects.get(email='ada@example.com')
+        self.assertEqual(user.username, 'ada@example.com')
+        self.assertEqual(user.first_name, 'Ada')
+        self.assertTrue(user.check_password('testpass123'))
+
+    def test_import_ndjson_skips_existing_users(self):
+        """Test emails already registered are rejected"""
+        User.objects.create_user(
+            email='taken@example.com',
+            username='taken@example.com',
+            password='testpass123'
+        )
+        lines = [
+            json.dumps({'email': 'taken@example.com', 'password': 'testpass123'}),
+            '{not json',
+            json.dumps({'email': 'fresh@example.com', 'password': 'testpass123'}),
+        ]
+        
+        results = list(self.service.import_rows(read_rows(lines, 'ndjson')))
+        
+        self.assertEqual(results[-1]['summary'], {'total': 3, 'created': 1, 'failed': 2})
+        self.assertTrue(User.objects.filter(email='fresh@example.com').exists())
+
+    def test_import_skips_existing_users_in_other_case(self):
+        """Test the existing-email check ignores letter case"""
+        User.objects.create_user(email='taken@example.com', password='testpass123')
+        lines = [json.dumps({'email': 'Taken@EXAMPLE.com', 'password': 'testpass123'})]
+        
+        results = list(self.service.import_rows(read_rows(lines, 'ndjson')))
+        
+        self.assertEqual(results[0]['errors'], {'email': ['A user with this email already exists.']})
+        self.assertEqual(results[-1]['summary'], {'total': 1, 'created': 0, 'failed': 1})
+
+    @override_settings(ENABLED_FEATURES={'profile_management': True})
+    def test_import_provisions_profiles(self):
+        """Test bulk-created users get profiles without the per-row signal"""
+        lines = [json.dumps({'email': f'p{i}@example.com', 'password': 'testpass123'}) for i in range(3)]
+        
+        list(self.service.import_rows(read_rows(lines, 'ndjson')))
+        
+        self.assertEqual(UserProfile.objects.filter(user__email__startswith='p').count(), 3)
+
+class UserImportAPITests(TestCase):
+    """Test the streaming import endpoint"""
+
+    def setUp(self):
+        self.client = APIClient()
+        admin = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123'
+        )
+        refresh = RefreshToken.for_user(admin)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_import_streams_results(self):
+        """Test CSV import streams row errors and a summary"""
+        response = self.client.post('/api/v1/users/import/', CSV_BODY, content_type='text/csv')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(lines[-1]['summary']['created'], 2)
+        self.assertEqual(len(lines), 4)
+
+    def test_import_rejects_unknown_content_type(self):
+        """Test unsupported bodies are refused"""
+        response = self.client.post('/api/v1/users/import/', {'email': 'x'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
@@ -0,0 +1,97 @@
+# User management model tests
+
+from io import StringIO
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from ..models import UserProfile
+
+User = get_user_model()
+
+class UserProfileProvisioningTests(TestCase):
+    """
+    Test bulk profile provisioning
+    
+    Design Decision: Cover the signal, bulk and backfill paths
+    - All three go through UserProfile.objects.provision_missing
+    """
+
+    def setUp(self):
+        self.users = User.objects.bulk_create([
+            User(email=f'user{i}@example.com', username=f'user{i}@example.com')
+            for i in range(3)
+        ])
+
+    def test_provision_missing_creates_default_profiles(self):
+        """Test missing profiles are created with model defaults"""
+        created = UserProfile.objects.provision_missing()
+        
+        self.assertEqual(created, 3)
+        profile = UserProfile.objects.get(user=self.users[0])
+        self.assertTrue(profile.is_public)
+        self.assertFalse(profile.show_email)
+        self.assertEqual(profile.bio, '')
+        self.assertIsNotNone(profile.created_at)
+
+    def test_provision_missing_is_idempotent(self):
+        """Test existing profiles are left alone"""
+        UserProfile.objects.create(user=self.users[0], bio='Keep me')
+        
+        self.assertEqual(UserProfile.objects.provision_missing(), 2)
+        self.assertEqual(UserProfile.objects.provision_missing(), 0)
+        self.assertEqual(UserProfile.objects.get(user=self.users[0]).bio, 'Keep me')
+
+    def test_provision_missing_for_selected_users(self):
+        """Test provisioning can be limited to given users in one query"""
+        with self.assertNumQueries(1):
+            created = UserProfile.objects.provision_missing([self.users[1].pk])
+        
+        self.assertEqual(created, 1)
+        self.assertEqual(UserProfile.objects.get().user_id, self.users[1].pk)
+        self.assertEqual(UserProfile.objects.provision_missing([]), 0)
+
+    @override_settings(ENABLED_FEATURES={'profile_management': True})
+    def test_create_user_inserts_profile_in_one_query(self):
+        """Test registration creates the profile without a SELECT first"""
+        with self.assertNumQueries(2):  # user INSERT + profile INSERT ... SELECT
+            user = User.objects.create_user(email='new@example.com', username='new@example.com')
+        
+        self.assertTrue(UserProfile.objects.filter(user=user).exists())
+
+    def test_provision_profiles_command(self):
+        """Test the backfill command creates every missing profile"""
+        out = StringIO()
+        call_command('provision_profiles', '--batch-size', '2', stdout=out)
+        
+        self.assertEqual(UserProfile.objects.count(), 3)
+        self.assertIn('Created 3 profiles', out.getvalue())
+
+class SeedUsersCommandTests(TestCase):
+    """
+    Test load-test data seeding
+    """
+
+    def test_seed_users_creates_users_and_profiles(self):
+        """Test seeded users can log in and each has a profile"""
+        out = StringIO()
+        call_command('seed_users', '--users', '5', '--batch-size', '2', '--password', 'seedpass123', stdout=out)
+        
+        seeded = User.objects.filter(email__endswith='@loadtest.example.com')
+        self.assertEqual(seeded.count(), 5)
+        self.assertEqual(UserProfile.objects.filter(user__in=seeded).count(), 5)
+        user = seeded.get(email='user1@loadtest.example.com')
+        self.assertEqual(user.username, user.email)
+        self.assertTrue(user.check_password('seedpass123'))
+        self.assertIn('Created 5 users', out.getvalue())
+    
+    def test_seed_users_tops_up_and_resets(self):
+        """Test re-running only adds missing users and --reset starts over"""
+        call_command('seed_users', '--users', '3', '--no-profiles', stdout=StringIO())
+        User.objects.create_user(email='reg-1@loadtest.example.com', username='reg-1@loadtest.example.com')
+        
+        out = StringIO()
+        call_command('seed_users', '--users', '4', '--no-profiles', stdout=out)
+        self.assertIn('Created 1 users (3 already present)', out.getvalue())
+        
+        call_command('seed_users', '--users', '2', '--reset', '--no-profiles', stdout=StringIO())
+        self.assertEqual(User.objects.filter(email__endswith='@loadtest.example.com').count(), 2)
\ No newline at end of file
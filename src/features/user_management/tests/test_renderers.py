@@ -0,0 +1,125 @@
+# orjson renderer and parser tests
+
+import datetime
+import decimal
+import io
+import json
+import uuid
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.parsers import ORJSONParser
+from api.renderers import ORJSONRenderer
+
+User = get_user_model()
+
+ORJSON_REST_FRAMEWORK = {
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['api.renderers.ORJSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['api.parsers.ORJSONParser'],
+}
+
+class ORJSONRendererTests(TestCase):
+    """
+    Test ORJSONRenderer against DRF's JSONRenderer
+    
+    Design Decision: Compare bytes, not parsed values
+    - Clients and ETags see the raw body, so "equivalent JSON" is not enough
+    """
+
+    def assertSameBytes(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def test_matches_json_renderer(self):
+        """Test special types and characters render exactly like JSONRenderer"""
+        self.assertSameBytes({
+            'aware': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(8, 15, 30, 250000),
+            'duration': datetime.timedelta(days=1, seconds=5),
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'decimal': decimal.Decimal('10.50'),
+            'lazy': gettext_lazy('Not found.'),
+            'text': 'Zoë \u2028\u2029 "quoted" </script>',
+            'numbers': [0, -1, 1.5, 2 ** 63 - 1],
+            'nested': {1: 'int key', 'tuple': (1, 2)},
+            'empty': None,
+        })
+
+    def test_falls_back_for_indent_and_big_integers(self):
+        """Test cases orjson cannot reproduce still render like JSONRenderer"""
+        self.assertSameBytes({'a': [1, 2]}, 'application/json; indent=2')
+        self.assertSameBytes({'big': 2 ** 70})
+
+    def test_falls_back_for_floats_orjson_formats_differently(self):
+        """Test exponent floats match and non-finite floats raise like JSONRenderer"""
+        for value in (1e16, -1.5e300, 1e-05, 5e-324, 0.0001, 9999999999999998.0, -0.0):
+            self.assertSameBytes({'value': value, 'nested': [[value]]})
+        self.assertSameBytes({'decimal': decimal.Decimal('1E+20')})
+        
+        for value in (float('nan'), float('inf'), decimal.Decimal('Infinity')):
+            with self.assertRaises(ValueError):
+                ORJSONRenderer().render({'value': value})
+
+    def test_none_renders_empty_body(self):
+        """Test None renders as an empty body like JSONRenderer"""
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+class ORJSONParserTests(TestCase):
+    """Test ORJSONParser against DRF's JSONParser"""
+
+    def test_parses_like_json_parser(self):
+        """Test UTF-8 bodies parse to the same data"""
+        body = json.dumps({'email': 'zoë@example.com', 'ids': [1, 2], 'ok': True}).encode()
+        
+        self.assertEqual(
+            ORJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+    def test_invalid_json_raises_parse_error(self):
+        """Test malformed and non-strict bodies raise ParseError"""
+        for body in (b'{not json', b'{"a": NaN}'):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+@override_settings(REST_FRAMEWORK=ORJSON_REST_FRAMEWORK)
+class ORJSONAPITests(TestCase):
+    """Test the API end to end with the orjson renderer and parser enabled"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin_user = User.objects.create_user(
+            email='admin@example.com',
+            username='admin@example.com',
+            password='adminpass123',
+            first_name='Zoë'
+        )
+        refresh = RefreshToken.for_user(self.admin_user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {refresh.access_token}')
+
+    def test_user_list_body_matches_json_renderer(self):
+        """Test the user list body is byte-identical to JSONRenderer output"""
+        response = self.client.get('/api/v1/users/')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_update_parses_json_body(self):
+        """Test JSON request bodies go through ORJSONParser"""
+        response = self.client.patch(
+            f'/api/v1/users/{self.admin_user.id}/update/', {'last_name': 'Ñúñez'}, format='json'
+        )
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['last_name'], 'Ñúñez')
\ No newline at end of file
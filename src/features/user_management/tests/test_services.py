@@ -1,8 +1,14 @@
 # User management service tests
 
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from ..services import UserManagementService
+from django.utils import timezone
+from ..models import BulkOperationJob
+from ..services import UserManagementService, InvalidCursor, supports_update_returning
 
 User = get_user_model()
 
@@ -74,6 +80,28 @@ class UserManagementServiceTests(TestCase):
         
         self.assertIsNone(user)
 
+    def test_get_users_in_batch(self):
+        """Test batch lookup dedupes users matched by both ID and email"""
+        result = self.service.get_users_in_batch(
+            user_ids=[self.user1.id, self.user1.id, 99999],
+            emails=['user1@EXAMPLE.com', 'missing@example.com']
+        )
+        
+        self.assertEqual(result['users'], [self.user1])
+        self.assertEqual(result['missing_ids'], [99999])
+        self.assertEqual(result['missing_emails'], ['missing@example.com'])
+
+    def test_get_users_in_batch_ignores_email_case(self):
+        """Test emails match stored addresses in any case, like login"""
+        mixed = User.objects.create_user(email='Mixed.Case@example.com', password='testpass123')
+        
+        result = self.service.get_users_in_batch(
+            emails=['USER2@example.com', 'mixed.case@example.com'], only=('id',)
+        )
+        
+        self.assertEqual(result['users'], [self.user2, mixed])
+        self.assertEqual(result['missing_emails'], [])
+
     def test_update_user_success(self):
         """Test successful user update"""
         updated_user = self.service.update_user(
@@ -139,4 +167,261 @@ class UserManagementServiceTests(TestCase):
         
         # Verify user is activated
         user = User.objects.get(id=self.user1.id)
-        self.assertTrue(user.is_active)
\ No newline at end of file
+        self.assertTrue(user.is_active)
+
+    def test_get_user_list_cursor_walks_all_pages(self):
+        """Test keyset pagination returns every user exactly once"""
+        User.objects.create_user(
+            email='user3@example.com',
+            username='user3@example.com',
+            password='testpass123'
+        )
+        
+        seen = []
+        result = self.service.get_user_list(page_size=2, cursor='')
+        seen.extend(user.id for user in result['users'])
+        self.assertFalse(result['has_previous'])
+        self.assertTrue(result['has_next'])
+        
+        result = self.service.get_user_list(page_size=2, cursor=result['next_cursor'])
+        seen.extend(user.id for user in result['users'])
+        self.assertFalse(result['has_next'])
+        self.assertIsNone(result['next_cursor'])
+        
+        self.assertEqual(len(seen), 3)
+        self.assertEqual(len(set(seen)), 3)
+
+    def test_get_user_list_cursor_previous_page(self):
+        """Test previous cursor returns the preceding page"""
+        first = self.service.get_user_list(page_size=1, cursor='')
+        second = self.service.get_user_list(page_size=1, cursor=first['next_cursor'])
+        
+        back = self.service.get_user_list(page_size=1, cursor=second['previous_cursor'])
+        
+        self.assertEqual(back['users'][0].id, first['users'][0].id)
+        self.assertFalse(back['has_previous'])
+        self.assertTrue(back['has_next'])
+
+    def test_get_user_list_invalid_cursor(self):
+        """Test malformed cursor raises InvalidCursor"""
+        with self.assertRaises(InvalidCursor):
+            self.service.get_user_list(cursor='not-a-cursor')
+
+    def test_get_user_list_without_count(self):
+        """Test skipping the count still reports next/previous pages"""
+        result = self.service.get_user_list(page=1, page_size=1, count='none')
+        
+        self.assertEqual(len(result['users']), 1)
+        self.assertIsNone(result['total_count'])
+        self.assertIsNone(result['count_type'])
+        self.assertIsNone(result['page_count'])
+        self.assertTrue(result['has_next'])
+        self.assertFalse(result['has_previous'])
+
+    def test_get_user_list_estimated_count_is_cached(self):
+        """Test estimated count for filtered lists comes from the cache"""
+        cache.clear()
+        result = self.service.get_user_list(search='john', count='estimate')
+        
+        self.assertEqual(result['total_count'], 1)
+        self.assertEqual(result['count_type'], 'estimated')
+        
+        # A new match is not visible until the cached count expires
+        User.objects.create_user(
+            email='johnny@example.com',
+            username='johnny@example.com',
+            password='testpass123'
+        )
+        with self.assertNumQueries(1):
+            result = self.service.get_user_list(search='john', count='estimate')
+        self.assertEqual(result['total_count'], 1)
+        self.assertEqual(len(result['users']), 2)
+
+    def test_get_user_list_exact_count_type(self):
+        """Test default page mode reports an exact count"""
+        result = self.service.get_user_list()
+        
+        self.assertEqual(result['count_type'], 'exact')
+
+    def test_get_user_list_invalid_count_mode(self):
+        """Test unknown count mode is rejected"""
+        with self.assertRaises(ValueError):
+            self.service.get_user_list(count='approximate')
+
+    def test_get_user_list_search_ranks_best_match_first(self):
+        """Test search results are ordered by relevance"""
+        User.objects.create_user(
+            email='ann@example.com',
+            username='ann@example.com',
+            password='testpass123',
+            last_name='Johnson'
+        )
+        
+        result = self.service.get_user_list(search='user1@example.com')
+        self.assertEqual(result['users'][0].id, self.user1.id)
+        
+        result = self.service.get_user_list(search='jo')
+        self.assertEqual(
+            {user.email for user in result['users']},
+            {'user1@example.com', 'ann@example.com'}
+        )
+
+    def test_get_user_list_search_matches_substring(self):
+        """Test search still matches inside email addresses"""
+        result = self.service.get_user_list(search='ser2@exa')
+        
+        self.assertEqual(result['total_count'], 1)
+        self.assertEqual(result['users'][0].id, self.user2.id)
+
+    def test_bulk_operation_reports_per_id_results(self):
+        """Test bulk results split IDs into changed, unchanged and missing"""
+        self.user2.is_active = False
+        self.user2.save()
+        
+        result = self.service.bulk_operation(
+            user_ids=[self.user1.id, self.user2.id, 999999],
+            operation='deactivate',
+            batch_size=1
+        )
+        
+        self.assertEqual(result['success_count'], 1)
+        self.assertEqual(result['total_requested'], 3)
+        self.assertEqual(result['changed_ids'], [self.user1.id])
+        self.assertEqual(result['unchanged_ids'], [self.user2.id])
+        self.assertEqual(result['missing_ids'], [999999])
+        self.assertFalse(User.objects.get(id=self.user1.id).is_active)
+
+    def test_bulk_operation_commits_per_batch(self):
+        """Test each batch runs in its own transaction"""
+        ids = [self.user1.id, self.user2.id]
+        
+        # One UPDATE and one SELECT per batch, plus savepoint handling
+        with self.assertNumQueries(8):
+            self.service.bulk_operation(ids, 'deactivate', batch_size=1)
+
+    def test_run_bulk_job(self):
+        """Test a background job records its results and runs only once"""
+        job = self.service.create_bulk_job([self.user1.id, 999999], 'deactivate')
+        
+        finished = self.service.run_bulk_job(job.id)
+        
+        self.assertEqual(finished.status, 'completed')
+        self.assertEqual(finished.processed_count, 2)
+        self.assertEqual(finished.result['changed_ids'], [self.user1.id])
+        self.assertEqual(finished.result['missing_ids'], [999999])
+        self.assertIsNotNone(finished.finished_at)
+        self.assertIsNone(self.service.run_bulk_job(job.id))
+
+    def run_observed_job(self, job_id, after_batch=None):
+        """Run a job one user per batch, reading its row back after every progress save"""
+        rows = []
+        bulk_operation = self.service.bulk_operation
+        
+        def observed(user_ids, operation, progress=None, **kwargs):
+            def report(result):
+                progress(result)
+                rows.append(BulkOperationJob.objects.values('processed_count', 'result', 'claimed_at').get(id=job_id))
+                if after_batch is not None:
+                    after_batch()
+            return bulk_operation(user_ids, operation, progress=report, **kwargs)
+        
+        with mock.patch.object(self.service, 'bulk_operation', observed), \
+                override_settings(USER_BULK_BATCH_SIZE=1):
+            return self.service.run_bulk_job(job_id), rows
+
+    def test_run_bulk_job_saves_counters_per_batch(self):
+        """Test progress writes stay small and the ID lists are saved once at the end"""
+        job = self.service.create_bulk_job([self.user1.id, self.user2.id], 'deactivate')
+        
+        finished, rows = self.run_observed_job(job.id)
+        
+        self.assertEqual([row['processed_count'] for row in rows], [1, 2])
+        for row in rows:
+            self.assertFalse([key for key in row['result'] if key.endswith('_ids')])
+        self.assertEqual(finished.result['changed_ids'], [self.user1.id, self.user2.id])
+
+    def test_run_bulk_job_refreshes_its_claim_after_every_batch(self):
+        """Test a live job checks in after each batch, so it never looks abandoned"""
+        job = self.service.create_bulk_job([self.user1.id, self.user2.id], 'deactivate')
+        start = timezone.now()
+        clock = iter(start + timedelta(seconds=second) for second in range(100))
+        
+        with mock.patch('features.user_management.services.timezone.now', lambda: next(clock)):
+            finished, rows = self.run_observed_job(job.id)
+        
+        # Claimed at start + 0s, each later write checks in with a newer time
+        self.assertEqual(finished.status, 'completed')
+        self.assertLess(start, rows[0]['claimed_at'])
+        self.assertLess(rows[0]['claimed_at'], rows[1]['claimed_at'])
+        self.assertLess(rows[1]['claimed_at'], BulkOperationJob.objects.get(id=job.id).claimed_at)
+
+    def test_run_bulk_job_stops_when_taken_over(self):
+        """Test a runner whose job was reclaimed stops without writing to it"""
+        user3 = User.objects.create_user(email='user3@example.com', password='testpass123')
+        job = self.service.create_bulk_job([self.user1.id, self.user2.id, user3.id], 'deactivate')
+        other_claim = timezone.now() + timedelta(hours=1)
+        
+        def taken_over():
+            BulkOperationJob.objects.filter(id=job.id).update(claimed_at=other_claim, processed_count=0)
+        
+        finished, rows = self.run_observed_job(job.id, after_batch=taken_over)
+        
+        self.assertIsNone(finished)
+        self.assertEqual(len(rows), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed_count, job.claimed_at), ('running', 0, other_claim))
+        # The batch in flight at the takeover completes; no further batch runs
+        self.assertTrue(User.objects.get(id=user3.id).is_active)
+
+    def test_bulk_job_polls_do_not_load_user_ids(self):
+        """Test the stored total_requested answers status polls"""
+        from api.v1.users.serializers import BulkOperationJobSerializer
+        
+        job = self.service.create_bulk_job([self.user1.id, self.user2.id, self.user1.id], 'deactivate')
+        polled = self.service.get_bulk_job(job.id)
+        
+        self.assertIn('user_ids', polled.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(BulkOperationJobSerializer(polled).data['total_requested'], 3)
+
+    def test_stale_running_job_is_reclaimed(self):
+        """Test a job whose process died mid-run is run again"""
+        job = self.service.create_bulk_job([self.user1.id], 'deactivate')
+        BulkOperationJob.objects.filter(id=job.id).update(
+            status='running', claimed_at=timezone.now() - timedelta(seconds=settings.USER_BULK_JOB_STALE_AFTER + 1)
+        )
+        
+        finished = self.service.run_bulk_job(job.id)
+        
+        self.assertEqual(finished.status, 'completed')
+        self.assertEqual(finished.result['changed_ids'], [self.user1.id])
+
+    def test_active_running_job_is_not_claimed_again(self):
+        """Test a job still reporting progress is left to its runner"""
+        job = self.service.create_bulk_job([self.user1.id], 'deactivate')
+        BulkOperationJob.objects.filter(id=job.id).update(status='running', claimed_at=timezone.now())
+        
+        self.assertIsNone(self.service.run_bulk_job(job.id))
+        self.assertTrue(User.objects.get(id=self.user1.id).is_active)
+
+    def test_update_returning_is_decided_by_vendor(self):
+        """Test MariaDB, which returns rows from INSERT but not UPDATE, takes the SELECT path"""
+        mariadb = mock.Mock(vendor='mysql')
+        mariadb.features.can_return_columns_from_insert = True
+        
+        self.assertFalse(supports_update_returning(mariadb))
+        self.assertTrue(supports_update_returning(mock.Mock(vendor='postgresql')))
+
+    def test_export_users_streams_plain_rows(self):
+        """Test export yields dicts without the password hash"""
+        rows = list(self.service.export_users(chunk_size=1))
+        
+        self.assertEqual([row['email'] for row in rows], ['user1@example.com', 'user2@example.com'])
+        self.assertNotIn('password', rows[0])
+
+    def test_export_users_applies_search(self):
+        """Test export honours the search filter"""
+        rows = list(self.service.export_users(search='jane'))
+        
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]['id'], self.user2.id)
\ No newline at end of file
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+"""
+Container startup steps for VLE User Management System
+Decision: Do the cheap checks without booting Django and only run
+migrate/collectstatic when their inputs changed since the last run
+
+Usage:
+    python startup.py                       # wait-db, migrate, collectstatic
+    python startup.py wait-db migrate       # selected steps only
+
+Environment:
+    DATABASE_URL or DB_NAME/DB_USER/DB_PASSWORD/DB_HOST/DB_PORT (as in settings)
+    DB_WAIT_TIMEOUT    seconds to wait for the database (default 60)
+    FORCE_MIGRATE      run migrate even if the stamp matches
+    FORCE_COLLECTSTATIC
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+SRC = ROOT / 'src'
+STATIC_ROOT = SRC / 'staticfiles'
+STATIC_STAMP = STATIC_ROOT / '.collectstatic-hash'
+MANAGE = [sys.executable, str(SRC / 'manage.py')]
+
+# Any key works as long as every container uses the same one
+MIGRATE_LOCK_ID = 7_120_418
+STAMP_TABLE = 'deploy_state'
+
+
+def log(message):
+    print(f'[startup] {message}', flush=True)
+
+
+def timed(name, fn):
+    started = time.perf_counter()
+    result = fn()
+    log(f'{name}: {result} ({time.perf_counter() - started:.2f}s)')
+
+
+def database_dsn():
+    """libpq connection string from the same variables the settings read"""
+    url = os.environ.get('DATABASE_URL')
+    if url:
+        return url if url.startswith(('postgres://', 'postgresql://')) else None
+    params = {
+        'dbname': os.environ.get('DB_NAME', 'userdb'),
+        'user': os.environ.get('DB_USER', 'postgres'),
+        'password': os.environ.get('DB_PASSWORD', ''),
+        'host': os.environ.get('DB_HOST', 'localhost'),
+        'port': os.environ.get('DB_PORT', '5432'),
+    }
+    return ' '.join(
+        "{}='{}'".format(key, value.replace('\\', '\\\\').replace("'", "\\'"))
+        for key, value in params.items()
+    )
+
+
+def connect(dsn, timeout=3):
+    import psycopg2
+    connection = psycopg2.connect(dsn, connect_timeout=timeout)
+    connection.autocommit = True
+    return connection
+
+
+def fingerprint(paths, extra=()):
+    """
+    Hash of file contents plus installed package versions
+
+    Package versions cover migrations and static files shipped by
+    Django and third-party apps without importing them.
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        digest.update(str(path.relative_to(ROOT)).encode())
+        digest.update(path.read_bytes())
+    for dist in sorted(f"{d.metadata['Name']}=={d.version}" for d in metadata.distributions()):
+        digest.update(dist.encode())
+    for item in extra:
+        digest.update(item.encode())
+    return digest.hexdigest()
+
+
+def settings_files():
+    return list((SRC / 'config' / 'settings').glob('*.py'))
+
+
+def migrations_fingerprint():
+    migrations = [
+        path for path in SRC.rglob('migrations/*.py')
+        if 'tests' not in path.parts
+    ]
+    # Feature flags decide which apps are installed
+    flags = sorted(f'{key}={value}' for key, value in os.environ.items() if key.startswith('ENABLE_'))
+    return fingerprint(migrations + settings_files(), flags)
+
+
+def static_fingerprint():
+    sources = [
+        path for path in SRC.rglob('*')
+        if path.is_file() and 'static' in path.relative_to(SRC).parts
+    ]
+    return fingerprint(sources + settings_files())
+
+
+def wait_for_database():
+    """Poll with a plain libpq connection instead of booting Django"""
+    dsn = database_dsn()
+    if dsn is None:
+        return 'skipped (not PostgreSQL)'
+
+    import psycopg2
+    deadline = time.monotonic() + float(os.environ.get('DB_WAIT_TIMEOUT', 60))
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            connect(dsn).close()
+            return f'ready after {attempts} attempt(s)'
+        except psycopg2.OperationalError as exc:
+            if time.monotonic() >= deadline:
+                raise SystemExit(f'[startup] database unavailable: {exc}'.strip())
+            log('database is unavailable - sleeping')
+            time.sleep(1)
+
+
+def migrate():
+    """
+    Run migrate unless the database already has this build's migrations
+
+    Design Decision: Stamp stored in the database, not the image
+    - A fresh or restored database has no stamp, so it is always migrated
+    - An advisory lock makes concurrent containers migrate one at a time;
+      the others find the new stamp and skip
+    """
+    dsn = database_dsn()
+    if dsn is None:
+        subprocess.run(MANAGE + ['migrate', '--noinput'], check=True)
+        return 'applied (no stamp outside PostgreSQL)'
+
+    stamp = migrations_fingerprint()
+    force = bool(os.environ.get('FORCE_MIGRATE'))
+    connection = connect(dsn)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_lock(%s)', [MIGRATE_LOCK_ID])
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {STAMP_TABLE} ('
+                'name varchar(64) PRIMARY KEY, value varchar(128) NOT NULL, '
+                'updated_at timestamptz NOT NULL DEFAULT now())'
+            )
+            cursor.execute(f"SELECT value FROM {STAMP_TABLE} WHERE name = 'migrations'")
+            row = cursor.fetchone()
+            if row and row[0] == stamp and not force:
+                return 'skipped (unchanged)'
+
+            subprocess.run(MANAGE + ['migrate', '--noinput'], check=True)
+            cursor.execute(
+                f"INSERT INTO {STAMP_TABLE} (name, value) VALUES ('migrations', %s) "
+                'ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value, updated_at = now()',
+                [stamp]
+            )
+            return 'applied'
+    finally:
+        connection.close()
+
+
+def collectstatic():
+    """
+    Run collectstatic unless STATIC_ROOT was built from the same inputs
+
+    The Docker image collects static files at build time, so containers
+    normally find a matching stamp and skip this step.
+    """
+    stamp = static_fingerprint()
+    if STATIC_STAMP.exists() and STATIC_STAMP.read_text() == stamp and not os.environ.get('FORCE_COLLECTSTATIC'):
+        return 'skipped (unchanged)'
+
+    subprocess.run(MANAGE + ['collectstatic', '--noinput'], check=True, stdout=subprocess.DEVNULL)
+    STATIC_STAMP.write_text(stamp)
+    return 'collected'
+
+
+STEPS = {
+    'wait-db': wait_for_database,
+    'migrate': migrate,
+    'collectstatic': collectstatic,
+}
+
+
+def main(argv):
+    names = argv or list(STEPS)
+    unknown = [name for name in names if name not in STEPS]
+    if unknown:
+        raise SystemExit(f"Unknown step(s): {', '.join(unknown)}. Choose from: {', '.join(STEPS)}")
+
+    started = time.perf_counter()
+    for name in names:
+        timed(name, STEPS[name])
+    log(f'total {time.perf_counter() - started:.2f}s')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])